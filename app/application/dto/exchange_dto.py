@@ -2,10 +2,13 @@ from __future__ import annotations
 
 from collections.abc import Mapping
 from pathlib import Path
-from typing import NotRequired, Protocol, TypedDict
+from typing import TYPE_CHECKING, NotRequired, Protocol, TypedDict
 
 from app.application.dto.form100_v2_dto import Form100V2Filters
 
+if TYPE_CHECKING:
+    from app.application.services.exchange_progress import ExchangeProgress
+
 
 class ExchangeManifestFileEntry(TypedDict):
     name: str
@@ -13,12 +16,21 @@ class ExchangeManifestFileEntry(TypedDict):
     size: int
 
 
+class ExchangeDeltaInfo(TypedDict):
+    since_package_id: int
+    since_change_seq: int
+    change_seq: int
+    # Ключи строк, удалённых после базового пакета, по таблицам.
+    deleted: NotRequired[dict[str, list[str]]]
+
+
 class ExchangeManifest(TypedDict):
     schema_version: str
     exported_at: str
     exported_by: str | None
     files: list[ExchangeManifestFileEntry]
     notes: NotRequired[dict[str, str]]
+    delta: NotRequired[ExchangeDeltaInfo]
 
 
 class ExchangeImportErrorEntry(TypedDict):
@@ -49,6 +61,13 @@ class ExchangeImportSummary(TypedDict):
     errors: int
 
 
+class ExchangeProgressEvent(TypedDict):
+    table: str | None
+    table_rows: dict[str, int]
+    bytes_done: int
+    bytes_total: int | None
+
+
 class ExcelExportResult(TypedDict):
     path: str
     counts: dict[str, int]
@@ -58,6 +77,13 @@ class ZipExportResult(ExcelExportResult):
     sha256: str
 
 
+class DeltaExportResult(ZipExportResult):
+    package_id: int
+    since_package_id: int
+    change_seq: int
+    deleted: dict[str, int]
+
+
 class ExcelImportResult(TypedDict):
     path: str
     counts: dict[str, int]
@@ -66,6 +92,7 @@ class ExcelImportResult(TypedDict):
     error_count: int
     summary: ExchangeImportSummary
     error_log_path: NotRequired[str | None]
+    deleted: NotRequired[dict[str, int]]
 
 
 class ZipImportResult(TypedDict):
@@ -77,6 +104,7 @@ class ZipImportResult(TypedDict):
     error_log_path: str | None
     summary: ExchangeImportSummary
     sha256: str
+    deleted: NotRequired[dict[str, int]]
 
 
 class CsvExportResult(TypedDict):
@@ -119,6 +147,8 @@ class Form100ExchangeService(Protocol):
         card_id: str | None = None,
         filters: Form100V2Filters | None = None,
         exported_by: str | None = None,
+        progress: ExchangeProgress | None = None,
+        workers: int = 1,
     ) -> Mapping[str, object]: ...
 
     def import_package_zip(
@@ -128,4 +158,5 @@ class Form100ExchangeService(Protocol):
         actor_id: int | None,
         mode: str = "merge",
         system: bool = False,
+        progress: ExchangeProgress | None = None,
     ) -> Mapping[str, object]: ...
@@ -78,6 +78,13 @@ class Form100V2Filters(BaseModel):
     created_to: date | None = None
 
 
+class Form100V2ListCursor(BaseModel):
+    """Ключ последней карточки страницы для keyset-пагинации списка."""
+
+    updated_at: datetime
+    id: str
+
+
 class Form100CardV2ListItemDto(BaseModel):
     id: str
     status: str
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -56,3 +56,22 @@ class LabSampleResponse(BaseModel):
     qc_status: str | None = None
     microorganism_id: int | None = None
     microorganism_free: str | None = None
+
+
+class LabSampleListFilters(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    lab_no: str | None = None
+    growth_flag: int | None = None
+    material_type_id: int | None = None
+    taken_from: date | None = None
+    taken_to: date | None = None
+
+
+class LabSampleListPage(BaseModel):
+    items: list[LabSampleResponse]
+    filtered_total: int
+    total: int
+    positive: int = 0
+    negative: int = 0
+    pending: int = 0
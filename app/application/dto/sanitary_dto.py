@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -48,3 +48,39 @@ class SanitarySampleResponse(BaseModel):
     growth_flag: int | None
     microorganism_id: int | None = None
     microorganism_free: str | None = None
+
+
+class SanitaryDepartmentOverview(BaseModel):
+    department_id: int
+    total_count: int
+    positive_count: int
+    negative_count: int
+    pending_count: int
+    last_sample: SanitarySampleResponse | None = None
+
+
+class SanitarySampleListFilters(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    lab_no: str | None = None
+    growth_flag: int | None = None
+    sampling_point: str | None = None
+    microorganism_id: int | None = None
+    taken_from: date | None = None
+    taken_to: date | None = None
+
+
+class SanitarySampleListCursor(BaseModel):
+    """Ключ последней пробы страницы для keyset-пагинации истории отделения."""
+
+    taken_at: datetime | None
+    id: int
+
+
+class SanitarySampleListPage(BaseModel):
+    items: list[SanitarySampleResponse]
+    filtered_total: int
+    total: int
+    positive: int = 0
+    last_taken_at: datetime | None = None
+    next_cursor: SanitarySampleListCursor | None = None
@@ -17,3 +17,7 @@ class AuthenticationError(AppError):
 
 class PermissionError(AppError):  # noqa: A001
     """Недостаточно прав."""
+
+
+class OperationCancelledError(AppError):
+    """Операция отменена пользователем; изменения откатываются."""
@@ -69,11 +69,15 @@ class EmzService:
         user_repo: UserRepository | None = None,
         audit_repo: AuditLogRepository | None = None,
         session_factory: Callable = session_scope,
+        patient_service: PatientService | None = None,
     ) -> None:
         self.emr_repo = emz_repo or EmzRepository()
         self.patient_repo = patient_repo or PatientRepository()
         self.user_repo = user_repo or UserRepository()
-        self.patient_service = PatientService(patient_repo=self.patient_repo, session_factory=session_factory)
+        # Общий с контейнером PatientService, чтобы индекс ФИО видел пациентов из ЭМЗ.
+        self.patient_service = patient_service or PatientService(
+            patient_repo=self.patient_repo, session_factory=session_factory
+        )
         self.audit_repo = audit_repo or AuditLogRepository()
         self.session_factory = session_factory
 
@@ -243,82 +247,119 @@ class EmzService:
             if not data:
                 raise ValueError("Госпитализация ЭМЗ не найдена")
             case, version, diagnoses, interventions, abx, ismp = data
-            case_id = cast(int, case.id)
-            patient_id = cast(int, case.patient_id)
-            case_no = cast(str, case.hospital_case_no)
-            department_id = cast(int | None, case.department_id)
-            version_no = cast(int, version.version_no)
-            admission_date = cast(datetime | None, version.admission_date)
-            injury_date = cast(datetime | None, version.injury_date)
-            outcome_date = cast(datetime | None, version.outcome_date)
-            outcome_type = cast(str | None, version.outcome_type)
-            severity = cast(str | None, version.severity)
-            sofa_score = cast(int | None, version.sofa_score)
-            vph_p_or_score = cast(int | None, version.vph_p_or_score)
-            patient_obj = self.patient_repo.get_by_id(session, patient_id)
-            patient_name = cast(str, patient_obj.full_name) if patient_obj else ""
-            patient_dob = cast(date | None, patient_obj.dob) if patient_obj else None
-            patient_sex = cast(str, patient_obj.sex) if patient_obj else "U"
-            patient_category = cast(str | None, patient_obj.category) if patient_obj else None
-            patient_military_unit = cast(str | None, patient_obj.military_unit) if patient_obj else None
-            patient_military_district = cast(str | None, patient_obj.military_district) if patient_obj else None
-            return EmzCaseDetail(
-                id=case_id,
-                patient_id=patient_id,
-                patient_full_name=patient_name,
-                patient_dob=patient_dob,
-                patient_sex=patient_sex,
-                patient_category=patient_category,
-                patient_military_unit=patient_military_unit,
-                patient_military_district=patient_military_district,
-                hospital_case_no=case_no,
-                department_id=department_id,
-                version_no=version_no,
-                admission_date=admission_date,
-                injury_date=injury_date,
-                outcome_date=outcome_date,
-                outcome_type=outcome_type,
-                severity=severity,
-                sofa_score=sofa_score,
-                vph_p_or_score=vph_p_or_score,
-                diagnoses=[
-                    EmzDiagnosisDto(
-                        kind=(cast(str | None, d.kind) or ""),
-                        icd10_code=cast(str | None, d.icd10_code),
-                        free_text=cast(str | None, d.free_text),
-                    )
-                    for d in diagnoses
-                ],
-                interventions=[
-                    EmzInterventionDto(
-                        type=(cast(str | None, i.type) or ""),
-                        start_dt=cast(datetime | None, i.start_dt),
-                        end_dt=cast(datetime | None, i.end_dt),
-                        duration_minutes=cast(int | None, i.duration_minutes),
-                        performed_by=cast(str | None, i.performed_by),
-                        notes=cast(str | None, i.notes),
-                    )
-                    for i in interventions
-                ],
-                antibiotic_courses=[
-                    EmzAntibioticCourseDto(
-                        start_dt=cast(datetime | None, a.start_dt),
-                        end_dt=cast(datetime | None, a.end_dt),
-                        antibiotic_id=cast(int | None, a.antibiotic_id),
-                        drug_name_free=cast(str | None, a.drug_name_free),
-                        route=cast(str | None, a.route),
-                        dose=cast(str | None, a.dose),
-                    )
-                    for a in abx
-                ],
-                ismp_cases=[
-                    EmzIsmpDto(
-                        ismp_type=cast(str, i.ismp_type),
-                        start_date=cast(date, i.start_date),
-                    )
-                    for i in ismp
-                ],
-            )
+            patient_obj = self.patient_repo.get_by_id(session, cast(int, case.patient_id))
+            return self._to_case_detail(case, version, patient_obj, diagnoses, interventions, abx, ismp)
+
+    def list_case_details_by_patient(
+        self, patient_id: int
+    ) -> list[tuple[EmzCaseDetail, EmzCaseResponse]]:
+        """Все госпитализации пациента с текущими версиями — фиксированным числом запросов.
+
+        Возвращает пары ``(get_current(id), list_cases_by_patient(...)[i])`` в том же
+        порядке, что и ``list_cases_by_patient``.
+        """
+        with self.session_factory() as session:
+            rows = self.emr_repo.fetch_case_details_by_patient(session, patient_id)
+            return [
+                (
+                    self._to_case_detail(case, version, patient_obj, diagnoses, interventions, abx, ismp),
+                    self._to_case_response(case, version),
+                )
+                for case, version, patient_obj, diagnoses, interventions, abx, ismp in rows
+            ]
+
+    @staticmethod
+    def _to_case_response(case, version) -> EmzCaseResponse:
+        return EmzCaseResponse(
+            id=cast(int, case.id),
+            version_id=cast(int, version.id),
+            version_no=cast(int, version.version_no),
+            is_current=cast(bool, version.is_current),
+            valid_from=cast(datetime, version.valid_from),
+            valid_to=cast(datetime | None, version.valid_to),
+            days_to_admission=cast(int | None, version.days_to_admission),
+            length_of_stay_days=cast(int | None, version.length_of_stay_days),
+        )
+
+    @staticmethod
+    def _to_case_detail(
+        case, version, patient_obj, diagnoses, interventions, abx, ismp
+    ) -> EmzCaseDetail:
+        case_id = cast(int, case.id)
+        patient_id = cast(int, case.patient_id)
+        case_no = cast(str, case.hospital_case_no)
+        department_id = cast(int | None, case.department_id)
+        version_no = cast(int, version.version_no)
+        admission_date = cast(datetime | None, version.admission_date)
+        injury_date = cast(datetime | None, version.injury_date)
+        outcome_date = cast(datetime | None, version.outcome_date)
+        outcome_type = cast(str | None, version.outcome_type)
+        severity = cast(str | None, version.severity)
+        sofa_score = cast(int | None, version.sofa_score)
+        vph_p_or_score = cast(int | None, version.vph_p_or_score)
+        patient_name = cast(str, patient_obj.full_name) if patient_obj else ""
+        patient_dob = cast(date | None, patient_obj.dob) if patient_obj else None
+        patient_sex = cast(str, patient_obj.sex) if patient_obj else "U"
+        patient_category = cast(str | None, patient_obj.category) if patient_obj else None
+        patient_military_unit = cast(str | None, patient_obj.military_unit) if patient_obj else None
+        patient_military_district = cast(str | None, patient_obj.military_district) if patient_obj else None
+        return EmzCaseDetail(
+            id=case_id,
+            patient_id=patient_id,
+            patient_full_name=patient_name,
+            patient_dob=patient_dob,
+            patient_sex=patient_sex,
+            patient_category=patient_category,
+            patient_military_unit=patient_military_unit,
+            patient_military_district=patient_military_district,
+            hospital_case_no=case_no,
+            department_id=department_id,
+            version_no=version_no,
+            admission_date=admission_date,
+            injury_date=injury_date,
+            outcome_date=outcome_date,
+            outcome_type=outcome_type,
+            severity=severity,
+            sofa_score=sofa_score,
+            vph_p_or_score=vph_p_or_score,
+            diagnoses=[
+                EmzDiagnosisDto(
+                    kind=(cast(str | None, d.kind) or ""),
+                    icd10_code=cast(str | None, d.icd10_code),
+                    free_text=cast(str | None, d.free_text),
+                )
+                for d in diagnoses
+            ],
+            interventions=[
+                EmzInterventionDto(
+                    type=(cast(str | None, i.type) or ""),
+                    start_dt=cast(datetime | None, i.start_dt),
+                    end_dt=cast(datetime | None, i.end_dt),
+                    duration_minutes=cast(int | None, i.duration_minutes),
+                    performed_by=cast(str | None, i.performed_by),
+                    notes=cast(str | None, i.notes),
+                )
+                for i in interventions
+            ],
+            antibiotic_courses=[
+                EmzAntibioticCourseDto(
+                    start_dt=cast(datetime | None, a.start_dt),
+                    end_dt=cast(datetime | None, a.end_dt),
+                    antibiotic_id=cast(int | None, a.antibiotic_id),
+                    drug_name_free=cast(str | None, a.drug_name_free),
+                    route=cast(str | None, a.route),
+                    dose=cast(str | None, a.dose),
+                )
+                for a in abx
+            ],
+            ismp_cases=[
+                EmzIsmpDto(
+                    ismp_type=cast(str, i.ismp_type),
+                    start_date=cast(date, i.start_date),
+                )
+                for i in ismp
+            ],
+        )
 
     def update_case_meta(
         self,
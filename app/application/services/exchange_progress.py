@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import io
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any, BinaryIO, TypeVar, cast
+
+from app.application.dto.exchange_dto import ExchangeProgressEvent
+from app.application.exceptions import OperationCancelledError
+
+T = TypeVar("T")
+
+ProgressCallback = Callable[[ExchangeProgressEvent], None]
+
+_DEFAULT_MIN_INTERVAL = 0.2
+_ROWS_STEP = 200
+_READ_BUFFER_SIZE = 1024 * 1024
+
+
+class ExchangeProgress:
+    """Прогресс и кооперативная отмена одной операции обмена.
+
+    Вызывающий создаёт объект, передаёт его в метод сервиса параметром
+    ``progress`` и может вызвать ``cancel`` из любого потока. Сервис отмечает
+    обработанные строки таблиц (``add_rows``/``track_rows``) и байты
+    (``add_bytes``/``reader``). Отмена проверяется только на границах строк:
+    ``add_rows`` бросает ``OperationCancelledError``, транзакция откатывается,
+    а недописанный файл удаляется. Счёт байтов отмену не проверяет — он идёт
+    и изнутри записи ZIP, где исключение оставило бы архив в неопределённом
+    состоянии.
+
+    ``callback`` вызывается в потоке операции не чаще раза в ``min_interval``
+    секунд, а также при переходе к новой таблице и в ``finish``.
+    """
+
+    def __init__(self, callback: ProgressCallback | None = None, *, min_interval: float = _DEFAULT_MIN_INTERVAL) -> None:
+        self._callback = callback
+        self._min_interval = min_interval
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._table: str | None = None
+        self._table_rows: dict[str, int] = {}
+        self._bytes_done = 0
+        self._bytes_total: int | None = None
+        self._last_emit = 0.0
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def check_cancelled(self) -> None:
+        if self._cancelled.is_set():
+            raise OperationCancelledError("Операция отменена пользователем")
+
+    def set_bytes_total(self, total: int | None) -> None:
+        with self._lock:
+            self._bytes_total = total
+
+    def add_rows(self, table: str, count: int = 1) -> None:
+        with self._lock:
+            self._table_rows[table] = self._table_rows.get(table, 0) + count
+            switched = table != self._table
+            self._table = table
+        self._emit(force=switched)
+        self.check_cancelled()
+
+    def track_rows(self, table: str, rows: Iterable[T], *, step: int = _ROWS_STEP) -> Iterator[T]:
+        """Пропустить строки таблицы, отмечая их пачками по ``step``."""
+        self.add_rows(table, 0)
+        pending = 0
+        for row in rows:
+            yield row
+            pending += 1
+            if pending >= step:
+                self.add_rows(table, pending)
+                pending = 0
+        if pending:
+            self.add_rows(table, pending)
+
+    def add_bytes(self, count: int) -> None:
+        with self._lock:
+            self._bytes_done += count
+        self._emit()
+
+    def reader(self, source: BinaryIO) -> BinaryIO:
+        """Обернуть поток чтения так, чтобы прочитанные байты шли в ``add_bytes``."""
+        return cast(BinaryIO, io.BufferedReader(_CountingReader(source, self.add_bytes), _READ_BUFFER_SIZE))
+
+    def finish(self) -> None:
+        self._emit(force=True)
+
+    def snapshot(self) -> ExchangeProgressEvent:
+        with self._lock:
+            return {
+                "table": self._table,
+                "table_rows": dict(self._table_rows),
+                "bytes_done": self._bytes_done,
+                "bytes_total": self._bytes_total,
+            }
+
+    def _emit(self, *, force: bool = False) -> None:
+        if self._callback is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_emit < self._min_interval:
+                return
+            self._last_emit = now
+        self._callback(self.snapshot())
+
+
+class _CountingReader(io.RawIOBase):
+    def __init__(self, source: BinaryIO, on_read: Callable[[int], None]) -> None:
+        super().__init__()
+        self._source = source
+        self._on_read = on_read
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        data = self._source.read(len(buffer))
+        size = len(data)
+        buffer[:size] = data
+        if size:
+            self._on_read(size)
+        return size
@@ -1,39 +1,57 @@
 from __future__ import annotations
 
 import csv
+import io
 import json
 import os
 import shutil
 import tempfile
 import zipfile
-from collections.abc import Callable, Iterator
+from collections.abc import Callable, Iterable, Iterator
 from contextlib import contextmanager, suppress
 from datetime import UTC, date, datetime
+from functools import lru_cache
+from itertools import chain, islice
 from pathlib import Path, PurePosixPath
-from typing import Literal, cast
+from typing import BinaryIO, Literal, cast
 from uuid import uuid4
 
 from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Alignment
 from openpyxl.utils import get_column_letter
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4, landscape
 from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 from reportlab.lib.units import mm
-from reportlab.platypus import Paragraph, SimpleDocTemplate, Table, TableStyle
-from sqlalchemy import Boolean, Date, DateTime
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+from sqlalchemy import (
+    Boolean,
+    Date,
+    DateTime,
+    Table as DbTable,
+    cast as sql_cast,
+    delete,
+    func,
+    select,
+    text,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import CursorResult
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from app.application.dto.exchange_dto import (
     CsvExportResult,
     CsvImportResult,
+    DeltaExportResult,
     ExcelExportResult,
     ExcelImportResult,
+    ExchangeDeltaInfo,
     ExchangeImportErrorEntry,
     ExchangeImportSummary,
     ExchangeManifest,
-    ExchangeManifestFileEntry,
     ExchangeTableStats,
     Form100ExchangeService,
     LegacyJsonExportResult,
@@ -41,18 +59,28 @@ from app.application.dto.exchange_dto import (
     ZipExportResult,
     ZipImportResult,
 )
+from app.application.exceptions import OperationCancelledError
 from app.application.reporting.formatters import to_iso_utc
 from app.application.reporting.id_resolver import IdResolver
 from app.application.security.role_matrix import Role, has_permission
+from app.application.services.exchange_progress import ExchangeProgress
+from app.application.services.patient_service import PatientService
 from app.config import DATA_DIR
 from app.domain.types import JSONDict, JSONValue
 from app.infrastructure.db import models_sqlalchemy as models
 from app.infrastructure.db.repositories.audit_repo import AuditLogRepository
 from app.infrastructure.db.repositories.user_repo import UserRepository
 from app.infrastructure.db.session import session_scope
+from app.infrastructure.db.sqlite_snapshot import (
+    attached_snapshot,
+    snapshot_columns,
+    sqlite_database_path,
+    write_snapshot,
+)
+from app.infrastructure.export.package_zip import HashingReader, PackageZipWriter
 from app.infrastructure.reporting.pdf_determinism import build_invariant_pdf
 from app.infrastructure.reporting.pdf_fonts import get_pdf_unicode_font_name
-from app.infrastructure.security.sha256 import sha256_file
+from app.infrastructure.security.sha256 import sha256_file_cached
 
 TABLE_MODELS: dict[str, type[models.Base]] = {
     "departments": models.Department,
@@ -334,6 +362,24 @@ _HANDLED_IMPORT_ERRORS = (
 )
 
 _EXPORT_BATCH_SIZE = 500
+_SQLITE_SNAPSHOT_NAME = "snapshot.sqlite3"
+_JSONL_SUFFIX = ".jsonl"
+_ZIP_COPY_CHUNK_SIZE = 1024 * 1024
+# Книга Excel из пакета держится в памяти до этого размера, дальше — во временном файле.
+_EXCEL_SPOOL_SIZE = 64 * 1024 * 1024
+# Число процессов, формирующих PDF пакета Формы 100.
+DEFAULT_EXPORT_WORKERS = max(1, min(4, os.cpu_count() or 1))
+_IMPORT_BATCH_SIZE = 2000
+# Строк в одном flowable таблицы PDF: ReportLab перевёрстывает остаток таблицы при
+# каждом переносе страницы, поэтому большие таблицы режутся на куски.
+_PDF_ROWS_PER_TABLE = 200
+# Внутренний отступ рамки SimpleDocTemplate (Frame по умолчанию), пункты.
+_PDF_FRAME_PADDING = 6
+_EXCEL_MIN_COLUMN_WIDTH = 12
+_EXCEL_MAX_COLUMN_WIDTH = 56
+# Сколько первых строк листа (включая заголовок) учитывается при подборе ширины
+# колонок в потоковом режиме: остальные строки к этому моменту ещё не прочитаны.
+_EXCEL_WIDTH_SAMPLE_ROWS = 200
 _FORM100_PDF_EXPORT_NOTE = "PDF-артефакты карточек Формы 100 экспортируются отдельно через Form100 ZIP"
 _FULL_EXPORT_NOTES: dict[str, str] = {"form100_pdf": _FORM100_PDF_EXPORT_NOTE}
 _JSON_LIST_COLUMNS = frozenset(
@@ -726,9 +772,20 @@ def _parse_value(value: object, column: object) -> object:
     return value
 
 
+def _excel_meta_rows(exported_by: str | None) -> list[list[object]]:
+    return [
+        ["schema_version", "1.0"],
+        ["exported_at", datetime.now(UTC).isoformat()],
+        ["exported_by", exported_by or ""],
+        ["note_form100_pdf", _FORM100_PDF_EXPORT_NOTE],
+    ]
+
+
+def _excel_column_width(max_length: int) -> int:
+    return max(_EXCEL_MIN_COLUMN_WIDTH, min(max_length + 4, _EXCEL_MAX_COLUMN_WIDTH))
+
+
 def _format_excel_worksheet(worksheet) -> None:
-    min_width = 12
-    max_width = 56
     for row in worksheet.iter_rows():
         for cell in row:
             cell.alignment = Alignment(vertical="top", wrap_text=True)
@@ -743,8 +800,50 @@ def _format_excel_worksheet(worksheet) -> None:
             value_length = len(str(cell.value))
             if value_length > max_length:
                 max_length = value_length
-        width = max(min_width, min(max_length + 4, max_width))
-        worksheet.column_dimensions[get_column_letter(column_cells[0].column)].width = width
+        worksheet.column_dimensions[get_column_letter(column_cells[0].column)].width = _excel_column_width(
+            max_length
+        )
+
+
+def _append_streaming_rows(worksheet, rows: Iterable[list[object]]) -> int:
+    """Записать строки в лист write-only книги, не держа лист в памяти.
+
+    Ширина колонок подбирается по первым ``_EXCEL_WIDTH_SAMPLE_ROWS`` строкам
+    (в write-only режиме её нужно задать до первой записи), оформление ячеек
+    совпадает с ``_format_excel_worksheet``. Возвращает число записанных строк.
+    """
+    row_iter = iter(rows)
+    sample = list(islice(row_iter, _EXCEL_WIDTH_SAMPLE_ROWS))
+    max_lengths: dict[int, int] = {}
+    for values in sample:
+        for index, value in enumerate(values, start=1):
+            if value is not None:
+                max_lengths[index] = max(max_lengths.get(index, 0), len(str(value)))
+    for index, max_length in max_lengths.items():
+        worksheet.column_dimensions[get_column_letter(index)].width = _excel_column_width(max_length)
+
+    alignment = Alignment(vertical="top", wrap_text=True)
+    written = 0
+    for values in chain(sample, row_iter):
+        cells = []
+        for value in values:
+            cell = WriteOnlyCell(worksheet, value=value)
+            cell.alignment = alignment
+            cells.append(cell)
+        worksheet.append(cells)
+        written += 1
+    return written
+
+
+def _close_streaming_worksheets(workbook: Workbook) -> None:
+    """Закрыть листы write-only книги, брошенной из-за ошибки или отмены.
+
+    Иначе незакрытый генератор строк листа дописывает хвост XML уже при сборке
+    мусора — в закрытый к тому времени временный файл.
+    """
+    for worksheet in workbook.worksheets:
+        with suppress(Exception):
+            worksheet.close()
 
 
 def _finalize_excel_workbook(workbook: Workbook) -> None:
@@ -768,20 +867,153 @@ def _dict_to_model(model_cls: type[models.Base], data: dict[str, object]) -> mod
     return obj
 
 
-def _iter_model_rows(session: Session, model_cls: type[models.Base]) -> Iterator[models.Base]:
-    for row in session.query(model_cls).yield_per(_EXPORT_BATCH_SIZE):
+def _iter_model_rows(
+    session: Session, model_cls: type[models.Base], *, changed_since: int | None = None
+) -> Iterator[models.Base]:
+    query = session.query(model_cls)
+    if changed_since is not None:
+        pk_column = next(iter(model_cls.__mapper__.primary_key))
+        change_log = models.DataChangeLog.__table__.c
+        changed_keys = select(sql_cast(change_log.row_key, pk_column.type)).where(
+            change_log.table_name == model_cls.__tablename__,
+            change_log.seq > changed_since,
+        )
+        query = query.filter(pk_column.in_(changed_keys)).order_by(pk_column)
+    for row in query.yield_per(_EXPORT_BATCH_SIZE):
         yield cast(models.Base, row)
 
 
-def _safe_extract_zip(zip_file: zipfile.ZipFile, destination: Path) -> list[Path]:
+@lru_cache(maxsize=4)
+def _pdf_cell_style(font_name: str) -> ParagraphStyle:
+    return ParagraphStyle(
+        "PdfCell",
+        parent=getSampleStyleSheet()["Normal"],
+        fontName=font_name,
+        fontSize=6,
+        leading=7,
+        wordWrap="CJK",
+    )
+
+
+def _pdf_table_style(font_name: str, *, header: bool = False) -> TableStyle:
+    commands: list[tuple[object, ...]] = [
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ("FONTNAME", (0, 0), (-1, -1), font_name),
+        ("FONTSIZE", (0, 0), (-1, -1), 6),
+        ("LEFTPADDING", (0, 0), (-1, -1), 1 * mm),
+        ("RIGHTPADDING", (0, 0), (-1, -1), 1 * mm),
+        ("TOPPADDING", (0, 0), (-1, -1), 1 * mm),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 1 * mm),
+    ]
+    if header:
+        commands.insert(0, ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey))
+    return TableStyle(commands)
+
+
+def _pdf_rows_table(rows: list[list[Paragraph]], col_widths: list[float], font_name: str) -> Table:
+    table = Table(rows, colWidths=col_widths)
+    table.setStyle(_pdf_table_style(font_name))
+    return table
+
+
+def _iter_json_rows(session: Session, _name: str, model_cls: type[models.Base]) -> Iterator[JSONDict]:
+    for row in _iter_model_rows(session, model_cls):
+        yield _model_to_dict(row, nested_json=True, portable_paths=True, machine_json=True)
+
+
+def _write_jsonl(stream: BinaryIO, rows: Iterable[JSONDict]) -> int:
+    count = 0
+    for row in rows:
+        stream.write(json.dumps(row, ensure_ascii=False).encode("utf-8") + b"\n")
+        count += 1
+    return count
+
+
+def _iter_jsonl(lines: Iterable[str]) -> Iterator[tuple[int, object]]:
+    """Читать JSON Lines построчно; битая строка отдаётся как ``ValueError`` с её номером."""
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield line_no, ValueError(f"Некорректная строка JSON: {exc.msg}")
+
+
+def _current_change_seq(session: Session) -> int:
+    return int(session.execute(select(func.coalesce(func.max(models.DataChangeLog.seq), 0))).scalar_one())
+
+
+def _deleted_row_keys(session: Session, since_seq: int) -> dict[str, list[str]]:
+    """Ключи строк таблиц обмена, удалённых после правки ``since_seq``, в порядке ``TABLE_MODELS``."""
+    change_log = models.DataChangeLog.__table__.c
+    rows = session.execute(
+        select(change_log.table_name, change_log.row_key)
+        .where(change_log.deleted.is_(True), change_log.seq > since_seq)
+        .order_by(change_log.seq)
+    )
+    keys: dict[str, list[str]] = {}
+    for table_name, row_key in rows:
+        keys.setdefault(str(table_name), []).append(str(row_key))
+    return {name: keys[name] for name in TABLE_MODELS if name in keys}
+
+
+def _manifest_tombstones(manifest: ExchangeManifest) -> dict[str, list[str]] | None:
+    delta = manifest.get("delta")
+    if delta is None:
+        return None
+    deleted = delta.get("deleted", {})
+    unknown = sorted(set(deleted) - set(TABLE_MODELS))
+    if unknown:
+        raise ValueError(f"Неизвестные таблицы в списке удалений: {', '.join(unknown)}")
+    return deleted
+
+
+def _apply_tombstones(session: Session, tombstones: dict[str, list[str]]) -> dict[str, int]:
+    """Удалить строки по надгробиям дельта-пакета; уже удалённые строки пропускаются.
+
+    Таблицы обходятся в обратном порядке ``TABLE_MODELS`` — дочерние раньше родительских.
+    """
+    deleted: dict[str, int] = {}
+    for name in reversed(TABLE_MODELS):
+        keys = tombstones.get(name)
+        if not keys:
+            continue
+        table = cast(DbTable, TABLE_MODELS[name].__table__)
+        pk_column = next(iter(table.primary_key.columns))
+        python_type = pk_column.type.python_type
+        count = 0
+        key_iter = iter(keys)
+        while batch := [python_type(key) for key in islice(key_iter, _IMPORT_BATCH_SIZE)]:
+            result = cast(CursorResult, session.execute(delete(table).where(pk_column.in_(batch))))
+            count += result.rowcount
+        deleted[name] = count
+    return deleted
+
+
+def _iter_excel_rows(
+    session: Session,
+    table_name: str,
+    model_cls: type[models.Base],
+    columns: list[str],
+    *,
+    changed_since: int | None = None,
+) -> Iterator[list[object]]:
+    yield list(_get_excel_headers(table_name, columns))
+    for row in _iter_model_rows(session, model_cls, changed_since=changed_since):
+        data = _model_to_dict(row)
+        yield [data.get(col) for col in columns]
+
+
+def _zip_members(zip_file: zipfile.ZipFile) -> dict[str, zipfile.ZipInfo]:
     """
-    Safely extract ZIP archive contents into destination.
+    Validate ZIP member names and map normalized names to their entries.
 
     Protects against path traversal (Zip Slip) by rejecting entries that try to
     escape destination via absolute paths, drive prefixes, or '..' components.
     """
-    destination = destination.resolve()
-    extracted: list[Path] = []
+    members: dict[str, zipfile.ZipInfo] = {}
     for member in zip_file.infolist():
         if member.is_dir():
             continue
@@ -796,22 +1028,45 @@ def _safe_extract_zip(zip_file: zipfile.ZipFile, destination: Path) -> list[Path
             raise ValueError(f"Недопустимый путь в архиве (path traversal): {member.filename}")
         if pure_path.parts and ":" in pure_path.parts[0]:
             raise ValueError(f"Недопустимый путь в архиве (префикс диска): {member.filename}")
+        members[pure_path.as_posix()] = member
+    return members
 
-        target_path = (destination / Path(*pure_path.parts)).resolve()
-        try:
-            target_path.relative_to(destination)
-        except ValueError as exc:
-            raise ValueError(f"Недопустимый путь в архиве (выход за каталог): {member.filename}") from exc
 
-        target_path.parent.mkdir(parents=True, exist_ok=True)
-        with zip_file.open(member, "r") as src, target_path.open("wb") as dst:
-            while True:
-                chunk = src.read(1024 * 1024)
-                if not chunk:
-                    break
-                dst.write(chunk)
-        extracted.append(target_path)
-    return extracted
+class _ZipPackageReader:
+    """Чтение членов ZIP-пакета без распаковки со сверкой SHA-256 из manifest.
+
+    Хэш считается тем же чтением, которым член импортируется, и проверяется по
+    его окончании; непрочитанный остаток дочитывается.
+    """
+
+    def __init__(
+        self,
+        zip_file: zipfile.ZipFile,
+        members: dict[str, zipfile.ZipInfo],
+        expected: dict[str, str | None],
+        progress: ExchangeProgress | None = None,
+    ) -> None:
+        self._zip_file = zip_file
+        self._members = members
+        self.expected = expected
+        self._progress = progress or ExchangeProgress()
+
+    @contextmanager
+    def open(self, name: str) -> Iterator[BinaryIO]:
+        with self._zip_file.open(self._members[name], "r") as raw:
+            reader = HashingReader(self._progress.reader(cast(BinaryIO, raw)))
+            yield cast(BinaryIO, reader.buffered())
+            digest = reader.finish()
+        if digest != self.expected.get(name):
+            raise ValueError(f"Хэш не совпадает: {name}")
+
+    def verify_other(self, consumed: Iterable[str]) -> None:
+        """Сверить хэши членов manifest, которые импорт читать не будет."""
+        skip = set(consumed)
+        for name in self.expected:
+            if name not in skip:
+                with self.open(name):
+                    pass
 
 
 def _get_pk_identity(model_cls: type[models.Base], data: dict[str, object]) -> object | None:
@@ -824,6 +1079,142 @@ def _get_pk_identity(model_cls: type[models.Base], data: dict[str, object]) -> o
     return _parse_value(data[pk_name], pk_cols[0])
 
 
+def _upsert_statement(table: DbTable, keys: tuple[str, ...]):
+    stmt = sqlite_insert(table)
+    pk_names = [column.name for column in table.primary_key.columns]
+    if not all(name in keys for name in pk_names):
+        return stmt
+    update_names = [name for name in keys if name not in pk_names]
+    if not update_names:
+        return stmt.on_conflict_do_nothing(index_elements=pk_names)
+    return stmt.on_conflict_do_update(
+        index_elements=pk_names,
+        set_={name: stmt.excluded[name] for name in update_names},
+    )
+
+
+class _BulkTableImporter:
+    """Пакетная запись строк импорта в одну таблицу вместо ``get`` + ``merge`` на строку.
+
+    Строки накапливаются до ``_IMPORT_BATCH_SIZE``; для пакета существующие ключи
+    читаются одним запросом ``IN``, а запись идёт через ``INSERT … ON CONFLICT DO
+    UPDATE`` (executemany). Обновляются только переданные колонки — как у
+    ``session.merge``. Каждый пакет пишется в своей точке сохранения; если он не
+    записался, пакет делится пополам до отдельных строк, чтобы ошибка попала
+    в отчёт с номером своей строки.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        model_cls: type[models.Base],
+        *,
+        mode: str,
+        on_error: Callable[[int, Exception], None],
+    ) -> None:
+        self._session = session
+        self._table = cast(DbTable, model_cls.__table__)
+        pk_columns = list(self._table.primary_key.columns)
+        self._pk_column = pk_columns[0] if len(pk_columns) == 1 else None
+        self._mode = mode
+        self._on_error = on_error
+        self._pending: list[tuple[int, object | None, dict[str, object]]] = []
+        self.added = 0
+        self.updated = 0
+        self.skipped = 0
+
+    def add(self, row_no: int, data: dict[str, object]) -> None:
+        try:
+            values = self._row_values(data)
+        except _HANDLED_IMPORT_ERRORS as exc:
+            self._on_error(row_no, exc)
+            return
+        identity = values.get(self._pk_column.name) if self._pk_column is not None else None
+        self._pending.append((row_no, identity, values))
+        if len(self._pending) >= _IMPORT_BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        known = self._existing_identities({identity for _, identity, _ in pending if identity is not None})
+        rows: list[tuple[int, dict[str, object], bool]] = []
+        for row_no, identity, values in pending:
+            exists = identity is not None and identity in known
+            if exists and self._mode == "append":
+                self.skipped += 1
+                continue
+            if identity is not None:
+                known.add(identity)
+            if not exists:
+                values = self._insert_values(values)
+            rows.append((row_no, values, exists))
+        failed = self._write(rows)
+        for row_no, _values, exists in rows:
+            if row_no in failed:
+                continue
+            if exists:
+                self.updated += 1
+            else:
+                self.added += 1
+
+    def _row_values(self, data: dict[str, object]) -> dict[str, object]:
+        values: dict[str, object] = {}
+        for column in self._table.columns:
+            if column.name not in data:
+                continue
+            value = _prepare_import_value(data[column.name], column)
+            if column is self._pk_column:
+                if value is None:
+                    continue
+                value = column.type.python_type(value)
+            values[column.name] = value
+        return values
+
+    def _insert_values(self, values: dict[str, object]) -> dict[str, object]:
+        # Как и ORM при INSERT, не передаём NULL в колонки со значением по умолчанию.
+        return {
+            name: value
+            for name, value in values.items()
+            if value is not None
+            or (self._table.c[name].default is None and self._table.c[name].server_default is None)
+        }
+
+    def _existing_identities(self, identities: set[object]) -> set[object]:
+        if self._pk_column is None or not identities:
+            return set()
+        stmt = select(self._pk_column).where(self._pk_column.in_(identities))
+        return set(self._session.execute(stmt).scalars())
+
+    def _write(self, rows: list[tuple[int, dict[str, object], bool]]) -> set[int]:
+        if not rows:
+            return set()
+        try:
+            with self._session.begin_nested():
+                self._execute([values for _, values, _ in rows])
+            return set()
+        except SQLAlchemyError as exc:
+            if len(rows) == 1:
+                self._on_error(rows[0][0], exc)
+                return {rows[0][0]}
+        # Делим пакет пополам, пока не останутся одиночные ошибочные строки:
+        # k плохих строк стоят O(k·log n) повторов вместо n.
+        middle = len(rows) // 2
+        return self._write(rows[:middle]) | self._write(rows[middle:])
+
+    def _execute(self, rows: list[dict[str, object]]) -> None:
+        # executemany требует одинакового набора колонок — режем на непрерывные участки.
+        start = 0
+        while start < len(rows):
+            keys = tuple(rows[start])
+            end = start + 1
+            while end < len(rows) and tuple(rows[end]) == keys:
+                end += 1
+            self._session.execute(_upsert_statement(self._table, keys), rows[start:end])
+            start = end
+
+
 def _format_import_error(exc: Exception) -> str:
     message = str(exc).strip()
     return message or exc.__class__.__name__
@@ -850,7 +1241,7 @@ def _write_import_error_log(
         "started_at": (started_at or created_at).isoformat(),
         "finished_at": created_at.isoformat(),
         "source_file": source_file.name,
-        "source_sha256": sha256_file(source_file),
+        "source_sha256": sha256_file_cached(source_file),
     }
     payload = {
         "created_at": created_at.isoformat(),
@@ -978,11 +1369,14 @@ class ExchangeService:
         form100_v2_service: Form100ExchangeService | None = None,
         user_repo: UserRepository | None = None,
         audit_repo: AuditLogRepository | None = None,
+        patient_service: PatientService | None = None,
     ) -> None:
         self.session_factory = session_factory
         self.form100_v2_service = form100_v2_service
         self.user_repo = user_repo or UserRepository()
         self.audit_repo = audit_repo or AuditLogRepository()
+        # Импорт пишет пациентов в обход PatientService — после него индекс ФИО сбрасывается.
+        self.patient_service = patient_service
 
     def _prepare_output_dir(self, path: Path) -> None:
         path.mkdir(parents=True, exist_ok=True)
@@ -990,6 +1384,19 @@ class ExchangeService:
         with suppress(OSError):
             os.chmod(path, 0o700)
 
+    def _iter_table_rows(
+        self,
+        build_rows: Callable[[Session, str, type[models.Base]], Iterable[object]],
+    ) -> Iterator[tuple[str, Iterable[object]]]:
+        """Отдать строки таблиц ``TABLE_MODELS`` в их порядке на одном соединении."""
+        with self.session_factory() as session:
+            for name, model_cls in TABLE_MODELS.items():
+                yield name, build_rows(session, name, model_cls)
+
+    def _after_import(self, tables: Iterable[str]) -> None:
+        if self.patient_service is not None and "patients" in tables:
+            self.patient_service.invalidate_name_index()
+
     def _require_permission(self, actor_id: int, permission: Literal["manage_exchange"]) -> None:
         with self.session_factory() as session:
             actor = self.user_repo.get_by_id(session, actor_id)
@@ -1012,7 +1419,8 @@ class ExchangeService:
         rows_affected: int = 0,
         errors_count: int = 0,
         first_error_code: str | None = None,
-    ) -> None:
+        change_seq: int | None = None,
+    ) -> int:
         audit_payload = _build_exchange_audit_payload(
             direction=direction,
             package_format=package_format,
@@ -1023,15 +1431,15 @@ class ExchangeService:
             first_error_code=first_error_code,
         )
         with self.session_factory() as session:
-            session.add(
-                models.DataExchangePackage(
-                    direction=direction,
-                    package_format=package_format,
-                    file_path=str(file_path),
-                    sha256=sha256,
-                    created_by=created_by,
-                )
+            package = models.DataExchangePackage(
+                direction=direction,
+                package_format=package_format,
+                file_path=str(file_path),
+                sha256=sha256,
+                created_by=created_by,
+                change_seq=change_seq,
             )
+            session.add(package)
             self.audit_repo.add_event(
                 session,
                 user_id=created_by,
@@ -1040,6 +1448,8 @@ class ExchangeService:
                 action=str(audit_payload["action"]),
                 payload_json=json.dumps(audit_payload, ensure_ascii=False),
             )
+            session.flush()
+            return int(package.id)
 
     def _record_package(
         self,
@@ -1051,8 +1461,9 @@ class ExchangeService:
         scope_tables: list[str] | None = None,
         rows_affected: int = 0,
         errors: list[ExchangeImportErrorEntry] | None = None,
+        change_seq: int | None = None,
     ) -> str:
-        package_hash = sha256_file(file_path)
+        package_hash = sha256_file_cached(file_path)
         errors_count = len(errors or [])
         self._log_package(
             direction,
@@ -1064,6 +1475,7 @@ class ExchangeService:
             rows_affected=rows_affected,
             errors_count=errors_count,
             first_error_code=_first_error_code(errors),
+            change_seq=change_seq,
         )
         return package_hash
 
@@ -1084,19 +1496,55 @@ class ExchangeService:
         exported_by: str | None = None,
         actor_id: int,
         log_package: bool = True,
+        write_only: bool = False,
+        progress: ExchangeProgress | None = None,
     ) -> ExcelExportResult:
+        """Выгрузить все таблицы ``TABLE_MODELS`` в XLSX.
+
+        ``write_only=True`` включает потоковый режим: строки пишутся в файл по мере
+        чтения из БД, и пиковая память не зависит от объёма базы. Ширина колонок
+        в этом режиме подбирается по первым строкам листа, а не по всем.
+        ``progress`` получает выгруженные строки по таблицам и размер файла; при
+        отмене недописанный файл удаляется.
+        """
         self._require_permission(actor_id, "manage_exchange")
+        progress = progress or ExchangeProgress()
         file_path = Path(file_path)
+        meta_rows = _excel_meta_rows(exported_by)
+        change_seq = self._current_change_seq()
+        # TODO SECURITY: добавить шифрование бэкапов/экспортов (AES-GCM)
+        self._prepare_output_dir(file_path.parent)
+        try:
+            if write_only:
+                counts = self._export_excel_streaming(file_path, meta_rows, progress=progress)
+            else:
+                counts = self._export_excel_in_memory(file_path, meta_rows, progress=progress)
+        except OperationCancelledError:
+            file_path.unlink(missing_ok=True)
+            raise
+        progress.add_bytes(file_path.stat().st_size)
+        progress.finish()
+        if log_package:
+            self._record_package("export", "excel", file_path, actor_id, scope_tables=list(TABLE_MODELS), rows_affected=sum(counts.values()), change_seq=change_seq)
+        return {"path": str(file_path), "counts": counts}
+
+    def _current_change_seq(self) -> int:
+        # Номер правки берётся до чтения таблиц: строки, изменённые во время выгрузки,
+        # попадут и в следующую дельту — повторное применение безопасно.
+        with self.session_factory() as session:
+            return _current_change_seq(session)
+
+    def _export_excel_in_memory(
+        self, file_path: Path, meta_rows: list[list[object]], *, progress: ExchangeProgress
+    ) -> dict[str, int]:
         wb = Workbook()
         meta = wb.active
         if meta is None:
             raise RuntimeError("Не удалось создать лист meta для экспорта")
         meta.title = "meta"
         meta.sheet_state = "hidden"
-        meta.append(["schema_version", "1.0"])
-        meta.append(["exported_at", datetime.now(UTC).isoformat()])
-        meta.append(["exported_by", exported_by or ""])
-        meta.append(["note_form100_pdf", _FORM100_PDF_EXPORT_NOTE])
+        for meta_row in meta_rows:
+            meta.append(meta_row)
 
         counts: dict[str, int] = {}
         with self.session_factory() as session:
@@ -1105,7 +1553,7 @@ class ExchangeService:
                 columns = [c.name for c in model_cls.__table__.columns]
                 ws.append(_get_excel_headers(name, columns))
                 row_count = 0
-                for row in _iter_model_rows(session, model_cls):
+                for row in progress.track_rows(name, _iter_model_rows(session, model_cls)):
                     data = _model_to_dict(row)
                     ws.append([data.get(col) for col in columns])
                     row_count += 1
@@ -1113,53 +1561,220 @@ class ExchangeService:
         if len(wb.worksheets) > 1:
             wb.active = 1
         _finalize_excel_workbook(wb)
+        wb.save(file_path)
+        return counts
 
-        # TODO SECURITY: добавить шифрование бэкапов/экспортов (AES-GCM)
-        self._prepare_output_dir(file_path.parent)
+    def _export_excel_streaming(
+        self,
+        file_path: Path | BinaryIO,
+        meta_rows: list[list[object]],
+        *,
+        changed_since: int | None = None,
+        progress: ExchangeProgress | None = None,
+    ) -> dict[str, int]:
+        tracker = progress or ExchangeProgress()
+        wb = Workbook(write_only=True)
+        meta = wb.create_sheet(title="meta")
+        meta.sheet_state = "hidden"
+        _append_streaming_rows(meta, meta_rows)
+
+        def _build_rows(session: Session, name: str, model_cls: type[models.Base]) -> Iterator[list[object]]:
+            columns = [c.name for c in model_cls.__table__.columns]
+            rows = _iter_excel_rows(session, name, model_cls, columns, changed_since=changed_since)
+            header = next(rows)
+            return chain([header], tracker.track_rows(name, rows))
+
+        counts: dict[str, int] = {}
+        try:
+            for name, rows in self._iter_table_rows(_build_rows):
+                ws = wb.create_sheet(title=_get_excel_sheet_title(name))
+                # Первая строка — заголовок, в счётчик таблицы не входит.
+                counts[name] = _append_streaming_rows(ws, cast(Iterable[list[object]], rows)) - 1
+        except BaseException:
+            _close_streaming_worksheets(wb)
+            raise
+        wb.active = 1
         wb.save(file_path)
-        if log_package:
-            self._record_package("export", "excel", file_path, actor_id, scope_tables=list(TABLE_MODELS), rows_affected=sum(counts.values()))
-        return {"path": str(file_path), "counts": counts}
+        return counts
+
+    def export_zip(
+        self,
+        file_path: str | Path,
+        *,
+        exported_by: str | None = None,
+        actor_id: int,
+        progress: ExchangeProgress | None = None,
+    ) -> ZipExportResult:
+        """Выгрузить книгу Excel в ZIP-пакет с manifest.
 
-    def export_zip(self, file_path: str | Path, *, exported_by: str | None = None, actor_id: int) -> ZipExportResult:
+        ``progress`` получает строки по таблицам и байты, записанные в архив; при
+        отмене недописанный пакет удаляется.
+        """
         self._require_permission(actor_id, "manage_exchange")
+        progress = progress or ExchangeProgress()
         file_path = Path(file_path)
-        with _working_temp_dir() as tmp_dir_path:
-            excel_path = tmp_dir_path / "export.xlsx"
-            result = self.export_excel(
-                excel_path,
-                exported_by=exported_by,
-                actor_id=actor_id,
-                log_package=False,
+        change_seq = self._current_change_seq()
+        counts, package_hash = self._write_excel_zip(file_path, exported_by=exported_by, progress=progress)
+        progress.finish()
+        self._log_package("export", "zip+excel", file_path, package_hash, actor_id, scope_tables=list(TABLE_MODELS), rows_affected=sum(counts.values()), change_seq=change_seq)
+        return {"path": str(file_path), "counts": counts, "sha256": package_hash}
+
+    def export_delta(
+        self,
+        file_path: str | Path,
+        *,
+        since_package_id: int,
+        exported_by: str | None = None,
+        actor_id: int,
+    ) -> DeltaExportResult:
+        """Выгрузить ZIP-пакет только со строками, изменёнными после пакета ``since_package_id``.
+
+        Базой служит номер правки, сохранённый в ``DataExchangePackage`` при выгрузке
+        (полной или дельты); новый пакет сам становится базой для следующей дельты.
+        Ключи удалённых строк (надгробия ``data_change_log``) попадают в
+        ``manifest["delta"]["deleted"]``. Пакет импортируется обычным ``import_zip``
+        в режиме merge: строки применяются upsert'ом по первичному ключу, удаления —
+        по ключу, поэтому повтор безопасен.
+        """
+        self._require_permission(actor_id, "manage_exchange")
+        file_path = Path(file_path)
+        with self.session_factory() as session:
+            base = session.get(models.DataExchangePackage, since_package_id)
+            if base is None or base.direction != "export":
+                raise ValueError("Базовый пакет выгрузки не найден")
+            if base.change_seq is None:
+                raise ValueError("Базовый пакет создан до учёта изменений — выполните полную выгрузку")
+            since_seq = int(base.change_seq)
+            change_seq = _current_change_seq(session)
+            tombstones = _deleted_row_keys(session, since_seq)
+        delta: ExchangeDeltaInfo = {
+            "since_package_id": since_package_id,
+            "since_change_seq": since_seq,
+            "change_seq": change_seq,
+            "deleted": tombstones,
+        }
+        deleted = {name: len(keys) for name, keys in tombstones.items()}
+        counts, package_hash = self._write_excel_zip(file_path, exported_by=exported_by, delta=delta)
+        package_id = self._log_package(
+            "export",
+            "zip+delta",
+            file_path,
+            package_hash,
+            actor_id,
+            scope_tables=[name for name, count in counts.items() if count or name in deleted],
+            rows_affected=sum(counts.values()) + sum(deleted.values()),
+            change_seq=change_seq,
+        )
+        return {
+            "path": str(file_path),
+            "counts": counts,
+            "sha256": package_hash,
+            "package_id": package_id,
+            "since_package_id": since_package_id,
+            "change_seq": change_seq,
+            "deleted": deleted,
+        }
+
+    def _write_excel_zip(
+        self,
+        file_path: Path,
+        *,
+        exported_by: str | None,
+        delta: ExchangeDeltaInfo | None = None,
+        progress: ExchangeProgress | None = None,
+    ) -> tuple[dict[str, int], str]:
+        with (
+            self._open_package_zip(file_path, exported_by=exported_by, delta=delta, progress=progress) as writer,
+            writer.open_member("export.xlsx") as excel_stream,
+        ):
+            counts = self._export_excel_streaming(
+                excel_stream,
+                _excel_meta_rows(exported_by),
+                changed_since=delta["since_change_seq"] if delta is not None else None,
+                progress=progress,
             )
-            files: list[Path] = [excel_path]
-            manifest_files: list[ExchangeManifestFileEntry] = []
+        return counts, cast(str, writer.sha256)
+
+    def export_sqlite(
+        self, file_path: str | Path, *, exported_by: str | None = None, actor_id: int
+    ) -> ZipExportResult:
+        """Выгрузить таблицы обмена снимком SQLite в обычном ZIP-пакете с manifest.
+
+        Снимок копируется средствами SQLite без преобразования значений и
+        импортируется ``import_zip`` через ``ATTACH`` и ``INSERT … SELECT``.
+        """
+        self._require_permission(actor_id, "manage_exchange")
+        file_path = Path(file_path)
+        change_seq = self._current_change_seq()
+        with self.session_factory() as session:
+            source_path = sqlite_database_path(session)
+        with _working_temp_dir() as tmp_dir_path:
+            snapshot_path = tmp_dir_path / _SQLITE_SNAPSHOT_NAME
+            tables = [cast(DbTable, model_cls.__table__) for model_cls in TABLE_MODELS.values()]
+            table_counts = write_snapshot(source_path, snapshot_path, tables)
+            counts = {name: table_counts[table.name] for name, table in zip(TABLE_MODELS, tables, strict=True)}
+            with self._open_package_zip(file_path, exported_by=exported_by) as writer:
+                writer.add_file(snapshot_path)
+        package_hash = cast(str, writer.sha256)
+        self._log_package("export", "zip+sqlite", file_path, package_hash, actor_id, scope_tables=list(TABLE_MODELS), rows_affected=sum(counts.values()), change_seq=change_seq)
+        return {"path": str(file_path), "counts": counts, "sha256": package_hash}
+
+    def export_jsonl(
+        self,
+        file_path: str | Path,
+        *,
+        exported_by: str | None = None,
+        actor_id: int,
+    ) -> ZipExportResult:
+        """Выгрузить таблицы обмена в ZIP-пакет с файлом JSON Lines на таблицу.
+
+        Каждая строка таблицы кодируется и пишется сразу, поэтому память не
+        зависит от размера базы. Пакет импортируется ``import_zip`` пакетами.
+        """
+        self._require_permission(actor_id, "manage_exchange")
+        file_path = Path(file_path)
+        change_seq = self._current_change_seq()
+        counts: dict[str, int] = {}
+        with self._open_package_zip(file_path, exported_by=exported_by) as writer:
+            for name, rows in self._iter_table_rows(_iter_json_rows):
+                with writer.open_member(f"{name}{_JSONL_SUFFIX}") as member:
+                    counts[name] = _write_jsonl(member, cast(Iterable[JSONDict], rows))
+        package_hash = cast(str, writer.sha256)
+        self._log_package("export", "zip+jsonl", file_path, package_hash, actor_id, scope_tables=list(TABLE_MODELS), rows_affected=sum(counts.values()), change_seq=change_seq)
+        return {"path": str(file_path), "counts": counts, "sha256": package_hash}
+
+    @contextmanager
+    def _open_package_zip(
+        self,
+        file_path: Path,
+        *,
+        exported_by: str | None,
+        delta: ExchangeDeltaInfo | None = None,
+        progress: ExchangeProgress | None = None,
+    ) -> Iterator[PackageZipWriter]:
+        """Открыть ZIP-пакет на запись; ``manifest.json`` дописывается последним.
+
+        Хэши и размеры членов считаются при записи, поэтому пакет не собирается
+        во временном каталоге и не перечитывается; хэш всего архива — в
+        ``writer.sha256`` после выхода из блока.
+        """
+        self._prepare_output_dir(file_path.parent)
+        on_write = progress.add_bytes if progress is not None else None
+        with PackageZipWriter(file_path, on_write=on_write) as writer:
+            yield writer
             manifest: ExchangeManifest = {
                 "schema_version": "1.0",
                 "exported_at": cast(str, to_iso_utc(datetime.now(UTC))),
                 "exported_by": exported_by,
-                "files": manifest_files,
+                "files": [
+                    {"name": member.name, "sha256": member.sha256, "size": member.size}
+                    for member in writer.members
+                ],
                 "notes": dict(_FULL_EXPORT_NOTES),
             }
-            for f in files:
-                manifest_files.append(
-                    {
-                        "name": f.name,
-                        "sha256": sha256_file(f),
-                        "size": f.stat().st_size,
-                    }
-                )
-            manifest_path = tmp_dir_path / "manifest.json"
-            manifest_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
-
-            self._prepare_output_dir(file_path.parent)
-            with zipfile.ZipFile(file_path, "w", zipfile.ZIP_DEFLATED) as zf:
-                zf.write(excel_path, arcname=excel_path.name)
-                zf.write(manifest_path, arcname=manifest_path.name)
-
-        package_hash = sha256_file(file_path)
-        self._log_package("export", "zip+excel", file_path, package_hash, actor_id, scope_tables=list(TABLE_MODELS), rows_affected=sum(result["counts"].values()))
-        return {"path": str(file_path), "counts": result["counts"], "sha256": package_hash}
+            if delta is not None:
+                manifest["delta"] = delta
+            writer.add_bytes("manifest.json", json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"))
 
     def import_excel(
         self,
@@ -1169,10 +1784,42 @@ class ExchangeService:
         mode: str = "merge",
         write_error_log: bool = True,
         log_package: bool = True,
+        progress: ExchangeProgress | None = None,
     ) -> ExcelImportResult:
+        """Импорт книги Excel; ``progress`` — как у ``import_csv``.
+
+        openpyxl читает книгу с произвольным доступом, поэтому байты книги
+        отмечаются целиком по окончании импорта.
+        """
         self._require_permission(actor_id, "manage_exchange")
+        progress = progress or ExchangeProgress()
         file_path = Path(file_path)
-        wb = load_workbook(file_path, read_only=True, data_only=True)
+        file_size = file_path.stat().st_size
+        progress.set_bytes_total(file_size)
+        result = self._import_excel_workbook(file_path, mode=mode, path=str(file_path), progress=progress)
+        self._after_import(result["details"])
+        progress.add_bytes(file_size)
+        progress.finish()
+        errors = result["errors"]
+        if write_error_log:
+            result["error_log_path"] = _write_import_error_log(file_path, errors)
+        if log_package:
+            self._record_package("import", "excel", file_path, actor_id, scope_tables=list(result["details"]), rows_affected=int(result["summary"]["imported"]), errors=errors)
+        return result
+
+    def _import_excel_workbook(
+        self,
+        source: Path | BinaryIO,
+        *,
+        mode: str,
+        path: str,
+        progress: ExchangeProgress | None = None,
+        tombstones: dict[str, list[str]] | None = None,
+    ) -> ExcelImportResult:
+        """Импорт листов книги в одной транзакции; ``tombstones`` — удаления дельта-пакета."""
+        progress = progress or ExchangeProgress()
+        wb = load_workbook(source, read_only=True, data_only=True)
+        deleted: dict[str, int] | None = None
         counts: dict[str, int] = {}
         details: dict[str, ExchangeTableStats] = {}
         errors: list[ExchangeImportErrorEntry] = []
@@ -1198,108 +1845,137 @@ class ExchangeService:
                     counts[table_name] = 0
                     details[table_name] = {"rows": 0, "added": 0, "updated": 0, "skipped": 0, "errors": 0}
                     continue
+                sheet_errors: list[ExchangeImportErrorEntry] = []
+
+                def _on_error(
+                    row_no: int,
+                    exc: Exception,
+                    scope: str = table_name,
+                    sink: list[ExchangeImportErrorEntry] = sheet_errors,
+                ) -> None:
+                    sink.append({"scope": scope, "row": row_no, "message": _format_import_error(exc)})
+
+                importer = _BulkTableImporter(session, model_cls, mode=mode, on_error=_on_error)
                 rows_total = 0
-                added = 0
-                updated = 0
-                skipped = 0
-                sheet_errors = 0
-                for row_idx, row in enumerate(row_iter, start=2):
+                for row_idx, row in progress.track_rows(table_name, enumerate(row_iter, start=2)):
                     rows_total += 1
-                    try:
-                        data = {
-                            header: row[idx] if row is not None and idx < len(row) else None
-                            for idx, header in header_positions
-                        }
-                        identity = _get_pk_identity(model_cls, data)
-                        existing = session.get(model_cls, identity) if identity is not None else None
-                        if mode == "append" and existing is not None:
-                            skipped += 1
-                            continue
-                        obj = _dict_to_model(model_cls, data)
-                        if existing is not None:
-                            updated += 1
-                        else:
-                            added += 1
-                        session.merge(obj)
-                    except _HANDLED_IMPORT_ERRORS as exc:
-                        sheet_errors += 1
-                        errors.append(
-                            {
-                                "scope": table_name,
-                                "row": row_idx,
-                                "message": _format_import_error(exc),
-                            }
-                        )
+                    data = {
+                        header: row[idx] if row is not None and idx < len(row) else None
+                        for idx, header in header_positions
+                    }
+                    importer.add(row_idx, data)
+                importer.flush()
+                sheet_errors.sort(key=lambda item: item["row"])
+                errors.extend(sheet_errors)
                 counts[table_name] = rows_total
                 details[table_name] = {
                     "rows": rows_total,
-                    "added": added,
-                    "updated": updated,
-                    "skipped": skipped,
-                    "errors": sheet_errors,
+                    "added": importer.added,
+                    "updated": importer.updated,
+                    "skipped": importer.skipped,
+                    "errors": len(sheet_errors),
                 }
+            if tombstones is not None:
+                deleted = _apply_tombstones(session, tombstones)
         summary = _build_import_summary(details, errors_count=len(errors))
         result: ExcelImportResult = {
-            "path": str(file_path),
+            "path": path,
             "counts": counts,
             "details": details,
             "errors": errors,
             "error_count": len(errors),
             "summary": summary,
         }
-        if write_error_log:
-            result["error_log_path"] = _write_import_error_log(file_path, errors)
-        if log_package:
-            self._record_package("import", "excel", file_path, actor_id, scope_tables=list(details), rows_affected=int(summary["imported"]), errors=errors)
+        if deleted is not None:
+            result["deleted"] = deleted
         return result
 
-    def import_zip(self, file_path: str | Path, *, actor_id: int, mode: str = "merge") -> ZipImportResult:
+    def import_zip(
+        self,
+        file_path: str | Path,
+        *,
+        actor_id: int,
+        mode: str = "merge",
+        progress: ExchangeProgress | None = None,
+    ) -> ZipImportResult:
+        """Импорт ZIP-пакета обмена.
+
+        ``progress`` получает строки по таблицам и прочитанные байты членов
+        архива (без сжатия); при отмене транзакция импорта откатывается.
+        """
         self._require_permission(actor_id, "manage_exchange")
+        progress = progress or ExchangeProgress()
         file_path = Path(file_path)
-        with _working_temp_dir() as tmp_dir_path:
-            with zipfile.ZipFile(file_path, "r") as zf:
-                try:
-                    _safe_extract_zip(zf, tmp_dir_path)
-                except ValueError as exc:
-                    raise ValueError(f"Небезопасный ZIP-архив: {exc}") from exc
-
-            manifest_path = tmp_dir_path / "manifest.json"
-            if not manifest_path.exists():
+        with zipfile.ZipFile(file_path, "r") as zf:
+            try:
+                members = _zip_members(zf)
+            except ValueError as exc:
+                raise ValueError(f"Небезопасный ZIP-архив: {exc}") from exc
+            if "manifest.json" not in members:
                 raise ValueError("В архиве отсутствует manifest.json")
-            manifest = cast(ExchangeManifest, json.loads(manifest_path.read_text(encoding="utf-8")))
-            manifest_files = manifest.get("files", [])
-            for entry in manifest_files:
-                f = tmp_dir_path / entry["name"]
-                if not f.exists():
+            manifest = cast(ExchangeManifest, json.loads(zf.read(members["manifest.json"])))
+            expected: dict[str, str | None] = {}
+            for entry in manifest.get("files", []):
+                if entry["name"] not in members:
                     raise ValueError(f"Файл отсутствует: {entry['name']}")
-                if sha256_file(f) != entry.get("sha256"):
-                    raise ValueError(f"Хэш не совпадает: {entry['name']}")
-
-            excel_path = tmp_dir_path / "export.xlsx"
-            if not excel_path.exists():
+                expected[entry["name"]] = entry.get("sha256")
+            is_delta = "delta" in manifest
+            if is_delta and mode != "merge":
+                raise ValueError("Пакет изменений импортируется только в режиме merge")
+            tombstones = _manifest_tombstones(manifest)
+
+            progress.set_bytes_total(sum(members[name].file_size for name in expected))
+            package = _ZipPackageReader(zf, members, expected, progress)
+            if _SQLITE_SNAPSHOT_NAME in expected:
+                package_format = "zip+sqlite"
+                package.verify_other([_SQLITE_SNAPSHOT_NAME])
+                with _working_temp_dir() as tmp_dir_path:
+                    # ATTACH работает только с файлом — снимок единственный член, который пишется на диск.
+                    snapshot_path = tmp_dir_path / _SQLITE_SNAPSHOT_NAME
+                    with package.open(_SQLITE_SNAPSHOT_NAME) as src, snapshot_path.open("wb") as dst:
+                        shutil.copyfileobj(src, dst, _ZIP_COPY_CHUNK_SIZE)
+                    result = self._import_sqlite_snapshot(snapshot_path, mode=mode, progress=progress)
+            elif any(name.endswith(_JSONL_SUFFIX) for name in expected):
+                package_format = "zip+jsonl"
+                package.verify_other([name for name in expected if name.endswith(_JSONL_SUFFIX)])
+                result = self._import_jsonl_members(package, mode=mode, path=str(file_path), progress=progress)
+            elif "export.xlsx" in expected:
+                package_format = "zip+delta" if is_delta else "zip+excel"
+                package.verify_other(["export.xlsx"])
+                # openpyxl читает книгу с произвольным доступом, а член ZIP перематывается
+                # только распаковкой с начала — книга копируется в буфер (в памяти, для
+                # больших книг — во временном файле) за то же чтение, что сверяет хэш.
+                with tempfile.SpooledTemporaryFile(max_size=_EXCEL_SPOOL_SIZE) as workbook:
+                    with package.open("export.xlsx") as src:
+                        shutil.copyfileobj(src, workbook, _ZIP_COPY_CHUNK_SIZE)
+                    workbook.seek(0)
+                    result = self._import_excel_workbook(
+                        cast(BinaryIO, workbook),
+                        mode=mode,
+                        path=str(file_path),
+                        progress=progress,
+                        tombstones=tombstones,
+                    )
+            else:
                 raise ValueError("В архиве отсутствует export.xlsx")
-            result = self.import_excel(
-                excel_path,
-                actor_id=actor_id,
-                mode=mode,
-                write_error_log=False,
-                log_package=False,
-            )
+        deleted = result.get("deleted", {})
+        self._after_import([*result["details"], *deleted])
+        progress.finish()
 
-        package_hash = sha256_file(file_path)
+        package_hash = sha256_file_cached(file_path)
         errors = result["errors"]
         self._log_package(
             "import",
-            "zip+excel",
+            package_format,
             file_path,
             package_hash,
             actor_id,
-            scope_tables=list(result["details"]),
-            rows_affected=int(result["summary"]["imported"]),
+            scope_tables=list(dict.fromkeys([*result["details"], *deleted])),
+            rows_affected=int(result["summary"]["imported"]) + sum(deleted.values()),
             errors_count=len(errors),
             first_error_code=_first_error_code(errors),
         )
-        return {
+        zip_result: ZipImportResult = {
             "path": str(file_path),
             "counts": result["counts"],
             "details": result["details"],
@@ -1309,6 +1985,203 @@ class ExchangeService:
             "summary": result["summary"],
             "sha256": package_hash,
         }
+        if "deleted" in result:
+            zip_result["deleted"] = deleted
+        return zip_result
+
+    def _import_jsonl_members(
+        self, package: _ZipPackageReader, *, mode: str, path: str, progress: ExchangeProgress | None = None
+    ) -> ExcelImportResult:
+        """Импортировать члены ``<таблица>.jsonl`` прямо из ZIP через ``_BulkTableImporter``.
+
+        Хэш члена сверяется по окончании его чтения; при расхождении транзакция
+        откатывается целиком.
+        """
+        counts: dict[str, int] = {}
+        details: dict[str, ExchangeTableStats] = {}
+        errors: list[ExchangeImportErrorEntry] = []
+        with self.session_factory() as session:
+            for name, model_cls in TABLE_MODELS.items():
+                member_name = f"{name}{_JSONL_SUFFIX}"
+                if member_name not in package.expected:
+                    continue
+                with package.open(member_name) as stream:
+                    lines = io.TextIOWrapper(stream, encoding="utf-8")
+                    table_errors, stats = self._import_json_items(
+                        session, name, model_cls, _iter_jsonl(lines), mode=mode, progress=progress
+                    )
+                errors.extend(table_errors)
+                counts[name] = stats["rows"]
+                details[name] = stats
+        summary = _build_import_summary(details, errors_count=len(errors))
+        return {
+            "path": path,
+            "counts": counts,
+            "details": details,
+            "errors": errors,
+            "error_count": len(errors),
+            "summary": summary,
+        }
+
+    @staticmethod
+    def _import_json_items(
+        session: Session,
+        name: str,
+        model_cls: type[models.Base],
+        items: Iterable[tuple[int, object]],
+        *,
+        mode: str,
+        progress: ExchangeProgress | None = None,
+    ) -> tuple[list[ExchangeImportErrorEntry], ExchangeTableStats]:
+        table_errors: list[ExchangeImportErrorEntry] = []
+
+        def _on_error(row_no: int, exc: Exception) -> None:
+            table_errors.append({"scope": name, "row": row_no, "message": _format_import_error(exc)})
+
+        importer = _BulkTableImporter(session, model_cls, mode=mode, on_error=_on_error)
+        rows_total = 0
+        if progress is not None:
+            items = progress.track_rows(name, items)
+        for row_no, item in items:
+            rows_total += 1
+            if isinstance(item, dict):
+                importer.add(row_no, cast(dict[str, object], item))
+            elif isinstance(item, ValueError):
+                _on_error(row_no, item)
+            else:
+                _on_error(row_no, ValueError("Строка не является JSON-объектом"))
+        importer.flush()
+        table_errors.sort(key=lambda entry: entry["row"])
+        return table_errors, {
+            "rows": rows_total,
+            "added": importer.added,
+            "updated": importer.updated,
+            "skipped": importer.skipped,
+            "errors": len(table_errors),
+        }
+
+    def _import_sqlite_snapshot(
+        self, snapshot_path: Path, *, mode: str, progress: ExchangeProgress | None = None
+    ) -> ExcelImportResult:
+        counts: dict[str, int] = {}
+        details: dict[str, ExchangeTableStats] = {}
+        errors: list[ExchangeImportErrorEntry] = []
+        with self.session_factory() as session, attached_snapshot(session, snapshot_path) as schema:
+            for name, model_cls in TABLE_MODELS.items():
+                stats = self._merge_snapshot_table(session, schema, name, model_cls, mode=mode, errors=errors)
+                counts[name] = stats["rows"]
+                details[name] = stats
+                if progress is not None:
+                    progress.add_rows(name, stats["rows"])
+            session.commit()
+        summary = _build_import_summary(details, errors_count=len(errors))
+        return {
+            "path": str(snapshot_path),
+            "counts": counts,
+            "details": details,
+            "errors": errors,
+            "error_count": len(errors),
+            "summary": summary,
+        }
+
+    def _merge_snapshot_table(
+        self,
+        session: Session,
+        schema: str,
+        name: str,
+        model_cls: type[models.Base],
+        *,
+        mode: str,
+        errors: list[ExchangeImportErrorEntry],
+    ) -> ExchangeTableStats:
+        """Слить таблицу снимка одним ``INSERT … SELECT … ON CONFLICT``.
+
+        Если набор не вставляется целиком (внешние ключи, уникальность), таблица
+        повторяется построчно через ``_BulkTableImporter``, чтобы ошибки получили
+        номера строк снимка.
+        """
+        table = cast(DbTable, model_cls.__table__)
+        available = set(snapshot_columns(session, table.name))
+        pk_names = [column.name for column in table.primary_key.columns]
+        if not available:
+            return {"rows": 0, "added": 0, "updated": 0, "skipped": 0, "errors": 0}
+        if not set(pk_names) <= available:
+            errors.append({"scope": name, "row": 0, "message": "В снимке нет первичного ключа таблицы"})
+            return {"rows": 0, "added": 0, "updated": 0, "skipped": 0, "errors": 1}
+        columns = [column.name for column in table.columns if column.name in available]
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        source = f'{schema}."{table.name}"'
+        target = f'main."{table.name}"'
+        pk_match = " AND ".join(f's."{pk}" = m."{pk}"' for pk in pk_names)
+        rows_total = int(session.execute(text(f"SELECT count(*) FROM {source}")).scalar_one())
+        existing = int(
+            session.execute(
+                text(f"SELECT count(*) FROM {source} AS s WHERE EXISTS (SELECT 1 FROM {target} AS m WHERE {pk_match})")
+            ).scalar_one()
+        )
+        update_columns = [column for column in columns if column not in pk_names]
+        if mode == "append" or not update_columns:
+            conflict_action = "DO NOTHING"
+        else:
+            conflict_action = "DO UPDATE SET " + ", ".join(f'"{column}" = excluded."{column}"' for column in update_columns)
+        # WHERE true снимает неоднозначность разбора INSERT … SELECT … ON CONFLICT в SQLite.
+        statement = text(
+            f"INSERT INTO {target} ({column_list}) SELECT {column_list} FROM {source} WHERE true "
+            f"ON CONFLICT ({', '.join(pk_names)}) {conflict_action}"
+        )
+        try:
+            with session.begin_nested():
+                session.execute(statement)
+        except SQLAlchemyError:
+            return self._merge_snapshot_rows(session, source, name, model_cls, columns, mode=mode, errors=errors)
+        skipped = existing if mode == "append" else 0
+        return {
+            "rows": rows_total,
+            "added": rows_total - existing,
+            "updated": existing - skipped,
+            "skipped": skipped,
+            "errors": 0,
+        }
+
+    def _merge_snapshot_rows(
+        self,
+        session: Session,
+        source: str,
+        name: str,
+        model_cls: type[models.Base],
+        columns: list[str],
+        *,
+        mode: str,
+        errors: list[ExchangeImportErrorEntry],
+    ) -> ExchangeTableStats:
+        table_errors: list[ExchangeImportErrorEntry] = []
+
+        def _on_error(row_no: int, exc: Exception) -> None:
+            table_errors.append({"scope": name, "row": row_no, "message": _format_import_error(exc)})
+
+        importer = _BulkTableImporter(session, model_cls, mode=mode, on_error=_on_error)
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        page = text(f"SELECT rowid, {column_list} FROM {source} WHERE rowid > :after ORDER BY rowid LIMIT :limit")
+        rows_total = 0
+        after = 0
+        while True:
+            batch = session.execute(page, {"after": after, "limit": _IMPORT_BATCH_SIZE}).all()
+            if not batch:
+                break
+            for row in batch:
+                rows_total += 1
+                importer.add(rows_total, dict(zip(columns, row[1:], strict=True)))
+            after = int(batch[-1][0])
+        importer.flush()
+        table_errors.sort(key=lambda item: item["row"])
+        errors.extend(table_errors)
+        return {
+            "rows": rows_total,
+            "added": importer.added,
+            "updated": importer.updated,
+            "skipped": importer.skipped,
+            "errors": len(table_errors),
+        }
 
     def export_form100_package_zip(
         self,
@@ -1317,6 +2190,8 @@ class ExchangeService:
         actor_id: int,
         exported_by: str | None = None,
         card_id: str | None = None,
+        progress: ExchangeProgress | None = None,
+        workers: int = 1,
     ) -> dict[str, object]:
         self._require_permission(actor_id, "manage_exchange")
         if self.form100_v2_service is None:
@@ -1328,6 +2203,8 @@ class ExchangeService:
                 actor_id=actor_id,
                 card_id=card_id,
                 exported_by=exported_by,
+                progress=progress,
+                workers=workers,
             ),
         )
 
@@ -1337,6 +2214,7 @@ class ExchangeService:
         *,
         actor_id: int,
         mode: str = "merge",
+        progress: ExchangeProgress | None = None,
     ) -> dict[str, object]:
         self._require_permission(actor_id, "manage_exchange")
         if self.form100_v2_service is None:
@@ -1347,6 +2225,7 @@ class ExchangeService:
                 file_path=file_path,
                 actor_id=actor_id,
                 mode=mode,
+                progress=progress,
             ),
         )
 
@@ -1389,23 +2268,55 @@ class ExchangeService:
         return {"path": str(file_path), "count": count}
 
     def import_csv(
-        self, file_path: str | Path, table_name: str, *, actor_id: int, mode: str = "merge"
+        self,
+        file_path: str | Path,
+        table_name: str,
+        *,
+        actor_id: int,
+        mode: str = "merge",
+        progress: ExchangeProgress | None = None,
     ) -> CsvImportResult:
+        """Импорт CSV одной таблицы.
+
+        ``progress`` получает обработанные строки и прочитанные байты файла;
+        при отмене транзакция импорта откатывается.
+        """
         self._require_permission(actor_id, "manage_exchange")
+        progress = progress or ExchangeProgress()
         file_path = Path(file_path)
         if table_name not in CSV_TABLES:
             raise ValueError("Неизвестная таблица CSV")
         model_cls = CSV_TABLES[table_name]
         started_at = datetime.now(UTC)
-        count = 0
         rows_total = 0
-        added = updated = skipped = 0
+        skipped = 0
         errors: list[ExchangeImportErrorEntry] = []
         seen_identities: set[object] = set()
-        with self.session_factory() as session, file_path.open("r", encoding="utf-8-sig", newline="") as f:
+        failed_rows: list[ExchangeImportErrorEntry] = []
+
+        def _on_error(row_no: int, exc: Exception) -> None:
+            failed_rows.append(
+                _make_import_error(
+                    scope=table_name,
+                    row=row_no,
+                    field=None,
+                    value=None,
+                    error_code="import_row_failed",
+                    message=f"Строка {row_no}: запись не импортирована из-за некорректных данных.",
+                    hint=_format_import_error(exc),
+                )
+            )
+
+        progress.set_bytes_total(file_path.stat().st_size)
+        with (
+            self.session_factory() as session,
+            file_path.open("rb") as raw,
+            io.TextIOWrapper(progress.reader(raw), encoding="utf-8-sig", newline="") as f,
+        ):
+            importer = _BulkTableImporter(session, model_cls, mode=mode, on_error=_on_error)
             reader = csv.DictReader(f, restkey=_CSV_EXTRA_COLUMNS_KEY, restval=None, strict=True)
             try:
-                for row_idx, row in enumerate(reader, start=2):
+                for row_idx, row in progress.track_rows(table_name, enumerate(reader, start=2)):
                     rows_total += 1
                     mapped_row, row_errors = _validate_csv_row(
                         table_name=table_name,
@@ -1421,33 +2332,7 @@ class ExchangeService:
                     if mapped_row is None:
                         skipped += 1
                         continue
-                    try:
-                        identity = _get_pk_identity(model_cls, mapped_row)
-                        existing = session.get(model_cls, identity) if identity is not None else None
-                        if mode == "append" and existing is not None:
-                            skipped += 1
-                            continue
-                        obj = _dict_to_model(model_cls, mapped_row)
-                        with session.begin_nested():
-                            session.merge(obj)
-                        if existing is not None:
-                            updated += 1
-                        else:
-                            added += 1
-                        count += 1
-                    except _HANDLED_IMPORT_ERRORS as exc:
-                        skipped += 1
-                        errors.append(
-                            _make_import_error(
-                                scope=table_name,
-                                row=row_idx,
-                                field=None,
-                                value=None,
-                                error_code="import_row_failed",
-                                message=f"Строка {row_idx}: запись не импортирована из-за некорректных данных.",
-                                hint=_format_import_error(exc),
-                            )
-                        )
+                    importer.add(row_idx, mapped_row)
             except csv.Error as exc:
                 errors.append(
                     _make_import_error(
@@ -1460,6 +2345,15 @@ class ExchangeService:
                         hint=str(exc) or None,
                     )
                 )
+            importer.flush()
+        progress.finish()
+        added = importer.added
+        updated = importer.updated
+        count = added + updated
+        skipped += importer.skipped + len(failed_rows)
+        if failed_rows:
+            # Ошибки записи приходят при сбросе пакета — возвращаем их в порядок строк файла.
+            errors = sorted(errors + failed_rows, key=lambda item: item["row"])
         details: dict[str, ExchangeTableStats] = {
             table_name: {
                 "rows": rows_total,
@@ -1487,6 +2381,7 @@ class ExchangeService:
             ),
             "summary": summary,
         }
+        self._after_import([table_name])
         self._record_package("import", "csv", file_path, actor_id, scope_tables=[table_name], rows_affected=int(summary["imported"]), errors=errors)
         return result
 
@@ -1497,17 +2392,10 @@ class ExchangeService:
             raise ValueError("Неизвестная таблица PDF")
         model_cls = CSV_TABLES[table_name]
         unicode_font = get_pdf_unicode_font_name()
-
-        styles = getSampleStyleSheet()
-        normal_style = styles["Normal"]
-        cell_style = ParagraphStyle(
-            "PdfCell",
-            parent=normal_style,
-            fontName=unicode_font,
-            fontSize=6,
-            leading=7,
-            wordWrap="CJK",
-        )
+        cell_style = _pdf_cell_style(unicode_font)
+        page_width, page_height = landscape(A4)
+        # Approximate dynamic widths by equally dividing usable landscape space
+        usable_width = page_width - 10 * mm
 
         count = 0
         with self.session_factory() as session:
@@ -1515,82 +2403,88 @@ class ExchangeService:
             columns = [c.name for c in model_cls.__table__.columns]
             extended_columns = _build_extended_columns(table_name, columns)
             headers = _get_csv_headers(table_name, extended_columns)
-            data = [[Paragraph(h, cell_style) for h in headers]]
-            for row in _iter_model_rows(session, model_cls):
-                record = _model_to_dict(row)
-                _fill_resolved_fields(record, table_name, resolver)
-                data.append(
-                    [
-                        Paragraph("" if record.get(col) is None else str(record.get(col)), cell_style)
-                        for col in extended_columns
-                    ]
-                )
-                count += 1
+            col_widths = [usable_width / len(headers)] * len(headers)
 
-        self._prepare_output_dir(file_path.parent)
-        doc = SimpleDocTemplate(
-            str(file_path),
-            pagesize=landscape(A4),
-            leftMargin=5 * mm,
-            rightMargin=5 * mm,
-            topMargin=10 * mm,
-            bottomMargin=10 * mm,
-        )
+            # Шапка рисуется на каждой странице отдельно, поэтому куски таблицы
+            # верстаются без повторяемой строки заголовка.
+            header_table = Table([[Paragraph(h, cell_style) for h in headers]], colWidths=col_widths)
+            header_table.setStyle(_pdf_table_style(unicode_font, header=True))
+            _width, header_height = header_table.wrap(usable_width, page_height)
 
-        # Approximate dynamic widths by equally dividing usable landscape space
-        usable_width = landscape(A4)[0] - 10 * mm
-        num_cols = len(data[0])
-        col_widths = [usable_width / num_cols] * num_cols
-
-        table = Table(data, repeatRows=1, colWidths=col_widths)
-        table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-                    ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
-                    ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                    ("FONTNAME", (0, 0), (-1, -1), unicode_font),
-                    ("FONTSIZE", (0, 0), (-1, -1), 6),
-                    ("LEFTPADDING", (0, 0), (-1, -1), 1 * mm),
-                    ("RIGHTPADDING", (0, 0), (-1, -1), 1 * mm),
-                    ("TOPPADDING", (0, 0), (-1, -1), 1 * mm),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 1 * mm),
-                ]
+            def _draw_header(canvas: Canvas, doc: SimpleDocTemplate) -> None:
+                header_table.drawOn(canvas, doc.leftMargin, page_height - doc.topMargin - _PDF_FRAME_PADDING)
+
+            def _row_tables() -> Iterator[Table]:
+                nonlocal count
+                chunk: list[list[Paragraph]] = []
+                for row in _iter_model_rows(session, model_cls):
+                    record = _model_to_dict(row)
+                    _fill_resolved_fields(record, table_name, resolver)
+                    chunk.append(
+                        [
+                            Paragraph("" if record.get(col) is None else str(record.get(col)), cell_style)
+                            for col in extended_columns
+                        ]
+                    )
+                    count += 1
+                    if len(chunk) >= _PDF_ROWS_PER_TABLE:
+                        yield _pdf_rows_table(chunk, col_widths, unicode_font)
+                        chunk = []
+                if chunk:
+                    yield _pdf_rows_table(chunk, col_widths, unicode_font)
+                elif not count:
+                    # Пустая таблица — всё равно одна страница с шапкой.
+                    yield Spacer(1, 0)
+
+            self._prepare_output_dir(file_path.parent)
+            doc = SimpleDocTemplate(
+                str(file_path),
+                pagesize=landscape(A4),
+                leftMargin=5 * mm,
+                rightMargin=5 * mm,
+                topMargin=10 * mm + header_height,
+                bottomMargin=10 * mm,
             )
-        )
-        build_invariant_pdf(doc, [table])
+            build_invariant_pdf(doc, _row_tables(), on_page=_draw_header)
         self._record_package("export", "pdf", file_path, actor_id, scope_tables=[table_name], rows_affected=count)
         return {"path": str(file_path), "count": count}
 
     # Legacy JSON support (not used in UI)
     def export_json(
-        self, file_path: str | Path, *, exported_by: str | None = None, actor_id: int
+        self,
+        file_path: str | Path,
+        *,
+        exported_by: str | None = None,
+        actor_id: int,
     ) -> LegacyJsonExportResult:
         self._require_permission(actor_id, "manage_exchange")
         file_path = Path(file_path)
-        payload: JSONDict = {
+        header: JSONDict = {
             "schema_version": "1.0",
             "exported_at": cast(str, to_iso_utc(datetime.now(UTC))),
             "exported_by": exported_by,
-            "data": cast(JSONValue, {}),
             "notes": cast(JSONValue, dict(_FULL_EXPORT_NOTES)),
         }
 
-        with self.session_factory() as session:
-            for name, model_cls in TABLE_MODELS.items():
-                data_payload = cast(JSONDict, payload["data"])
-                data_payload[name] = cast(
-                    JSONValue,
-                    [
-                        _model_to_dict(x, nested_json=True, portable_paths=True, machine_json=True)
-                        for x in _iter_model_rows(session, model_cls)
-                    ],
-                )
-
         self._prepare_output_dir(file_path.parent)
-        file_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
-        data_payload = cast(JSONDict, payload["data"])
-        counts = {k: len(cast(list[object], v)) for k, v in data_payload.items()}
+        counts: dict[str, int] = {}
+        # Документ пишется по мере чтения таблиц, а не собирается целиком в памяти.
+        with file_path.open("w", encoding="utf-8") as f:
+            f.write("{\n")
+            for key, value in header.items():
+                f.write(f"  {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)},\n")
+            f.write('  "data": {')
+            for table_index, (name, rows) in enumerate(self._iter_table_rows(_iter_json_rows)):
+                f.write(",\n" if table_index else "\n")
+                f.write(f"    {json.dumps(name)}: [")
+                count = 0
+                for row in rows:
+                    f.write(",\n      " if count else "\n      ")
+                    f.write(json.dumps(row, ensure_ascii=False))
+                    count += 1
+                f.write("\n    ]" if count else "]")
+                counts[name] = count
+            f.write("\n  }\n}\n")
         self._record_package(
             "export",
             "json",
@@ -1618,41 +2512,12 @@ class ExchangeService:
         with self.session_factory() as session:
             for name, model_cls in TABLE_MODELS.items():
                 raw_items = data.get(name)
-                items = cast(list[dict[str, object]], raw_items if isinstance(raw_items, list) else [])
-                rows_total = 0
-                added = updated = skipped = 0
-                table_errors = 0
-                for idx, item in enumerate(items, start=1):
-                    rows_total += 1
-                    try:
-                        identity = _get_pk_identity(model_cls, item)
-                        existing = session.get(model_cls, identity) if identity is not None else None
-                        if mode == "append" and existing is not None:
-                            skipped += 1
-                            continue
-                        obj = _dict_to_model(model_cls, item)
-                        if existing is not None:
-                            updated += 1
-                        else:
-                            added += 1
-                        session.merge(obj)
-                    except _HANDLED_IMPORT_ERRORS as exc:
-                        table_errors += 1
-                        errors.append(
-                            {
-                                "scope": name,
-                                "row": idx,
-                                "message": _format_import_error(exc),
-                            }
-                        )
-                counts[name] = rows_total
-                details[name] = {
-                    "rows": rows_total,
-                    "added": added,
-                    "updated": updated,
-                    "skipped": skipped,
-                    "errors": table_errors,
-                }
+                items = cast(list[object], raw_items if isinstance(raw_items, list) else [])
+                table_errors, stats = self._import_json_items(session, name, model_cls, enumerate(items, start=1), mode=mode)
+                errors.extend(table_errors)
+                counts[name] = stats["rows"]
+                details[name] = stats
+        self._after_import(details)
         summary = _build_import_summary(details, errors_count=len(errors))
         self._record_package(
             "import",
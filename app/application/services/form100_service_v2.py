@@ -4,15 +4,18 @@ import hashlib
 import importlib
 import json
 import logging
+import multiprocessing
 import os
 import shutil
 import tempfile
 import zipfile
-from collections.abc import Callable, Iterator
-from contextlib import contextmanager
+from collections.abc import Callable, Generator, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import AbstractContextManager, closing, contextmanager
 from datetime import UTC, date, datetime
+from functools import partial
 from pathlib import Path, PurePosixPath
-from typing import Any, SupportsInt, cast
+from typing import Any, BinaryIO, SupportsInt, cast
 from uuid import uuid4
 
 from sqlalchemy.orm import Session
@@ -33,8 +36,10 @@ from app.application.dto.form100_v2_dto import (
     Form100SignV2Request,
     Form100UpdateV2Request,
     Form100V2Filters,
+    Form100V2ListCursor,
 )
 from app.application.exceptions import PermissionError as AppPermissionError
+from app.application.services.exchange_progress import ExchangeProgress
 from app.config import DATA_DIR
 from app.domain.models.form100_v2 import FORM100_V2_STATUS_DRAFT, FORM100_V2_STATUS_SIGNED
 from app.domain.rules.form100_rules_v2 import (
@@ -51,10 +56,12 @@ from app.infrastructure.db.repositories.form100_repo_v2 import Form100Repository
 from app.infrastructure.db.repositories.user_repo import UserRepository
 from app.infrastructure.db.session import session_scope
 from app.infrastructure.export.form100_export_v2 import build_manifest_v2, export_form100_json
+from app.infrastructure.export.package_zip import HashingReader
 from app.infrastructure.reporting.form100_pdf_report_v2 import export_form100_pdf_v2
-from app.infrastructure.security.sha256 import sha256_file
+from app.infrastructure.security.sha256 import remember_sha256, sha256_file, sha256_file_cached
 
 FORM100_V2_ARTIFACT_DIR = DATA_DIR / "artifacts" / "form100_v2"
+_PDF_COPY_CHUNK_SIZE = 1024 * 1024
 logger = logging.getLogger(__name__)
 
 
@@ -87,9 +94,8 @@ def _working_temp_dir() -> Iterator[Path]:
     raise OSError("Failed to create temporary Form100 directory") from last_error
 
 
-def _safe_extract_zip(zip_file: zipfile.ZipFile, destination: Path) -> list[Path]:
-    destination = destination.resolve()
-    extracted: list[Path] = []
+def _zip_members(zip_file: zipfile.ZipFile) -> dict[str, zipfile.ZipInfo]:
+    members: dict[str, zipfile.ZipInfo] = {}
     for member in zip_file.infolist():
         if member.is_dir():
             continue
@@ -101,20 +107,78 @@ def _safe_extract_zip(zip_file: zipfile.ZipFile, destination: Path) -> list[Path
             raise ValueError(f"Invalid archive path: {member.filename}")
         if pure_path.parts and ":" in pure_path.parts[0]:
             raise ValueError(f"Invalid archive path: {member.filename}")
-        target_path = (destination / Path(*pure_path.parts)).resolve()
+        members[pure_path.as_posix()] = member
+    return members
+
+
+@contextmanager
+def _open_verified_member(
+    zip_file: zipfile.ZipFile,
+    member: zipfile.ZipInfo,
+    expected_sha256: str | None,
+    progress: ExchangeProgress | None = None,
+) -> Iterator[BinaryIO]:
+    """Читать член архива без распаковки; SHA-256 из manifest сверяется по окончании чтения."""
+    with zip_file.open(member, "r") as raw:
+        source = cast(BinaryIO, raw)
+        reader = HashingReader(progress.reader(source) if progress is not None else source)
+        yield cast(BinaryIO, reader.buffered())
+        digest = reader.finish()
+    if expected_sha256 is not None and digest != expected_sha256:
+        raise ValueError(f"Hash mismatch for file: {member.filename}")
+
+
+def _render_card_pdf(card: dict[str, Any], file_path: Path) -> str:
+    """Сформировать PDF карточки и вернуть его SHA-256 (выполняется и в процессах пула)."""
+    export_form100_pdf_v2(card=card, file_path=file_path)
+    return sha256_file(file_path)
+
+
+def _render_card_pdfs(
+    cards: list[dict[str, Any]],
+    form_dir: Path,
+    *,
+    workers: int,
+) -> Generator[tuple[Path, str], None, None]:
+    """Отдавать ``(путь PDF, SHA-256)`` по карточкам в их исходном порядке.
+
+    При ``workers > 1`` PDF формируются в пуле процессов: вёрстка ReportLab и
+    наложение bodymap упираются в процессор и GIL. Процессы запускаются через
+    ``spawn`` — ``fork`` многопоточного Qt-приложения небезопасен. Результаты
+    отдаются по мере готовности, но строго в порядке карточек, а
+    ``build_invariant_pdf`` делает байты PDF независимыми от процесса — пакет
+    получается тем же, что и при последовательной выгрузке.
+    """
+    paths = [form_dir / f"{card['id']}.pdf" for card in cards]
+    if workers <= 1 or len(cards) <= 1:
+        for card, path in zip(cards, paths, strict=True):
+            yield path, _render_card_pdf(card, path)
+        return
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(cards)),
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as pool:
+        futures: list[Future[str]] = [
+            pool.submit(_render_card_pdf, card, path) for card, path in zip(cards, paths, strict=True)
+        ]
         try:
-            target_path.relative_to(destination)
-        except ValueError as exc:
-            raise ValueError(f"Invalid archive path: {member.filename}") from exc
-        target_path.parent.mkdir(parents=True, exist_ok=True)
-        with zip_file.open(member, "r") as src, target_path.open("wb") as dst:
-            while True:
-                chunk = src.read(1024 * 1024)
-                if not chunk:
-                    break
-                dst.write(chunk)
-        extracted.append(target_path)
-    return extracted
+            for path, future in zip(paths, futures, strict=True):
+                yield path, future.result()
+        finally:
+            # Отмена или ошибка: снимаем карточки, до которых пул ещё не дошёл.
+            for future in futures:
+                future.cancel()
+
+
+def _drain_verified_member(
+    zip_file: zipfile.ZipFile,
+    member: zipfile.ZipInfo,
+    expected_sha256: str | None,
+    progress: ExchangeProgress | None = None,
+) -> None:
+    """Сверить SHA-256 члена архива с manifest, не сохраняя его (поток дочитывается при закрытии)."""
+    with _open_verified_member(zip_file, member, expected_sha256, progress):
+        pass
 
 
 class Form100ServiceV2:
@@ -138,10 +202,18 @@ class Form100ServiceV2:
         *,
         limit: int = 100,
         offset: int = 0,
+        after: Form100V2ListCursor | None = None,
     ) -> list[Form100CardV2ListItemDto]:
         filter_payload = filters.model_dump(exclude_none=True) if filters else {}
+        after_key = (after.updated_at, after.id) if after is not None else None
         with self.session_factory() as session:
-            rows = self.repo.list_cards(session, filters=filter_payload, limit=limit, offset=offset)
+            rows = self.repo.list_cards(
+                session,
+                filters=filter_payload,
+                limit=limit,
+                offset=offset,
+                after=after_key,
+            )
             return [
                 Form100CardV2ListItemDto(
                     id=str(item.id),
@@ -470,7 +542,7 @@ class Form100ServiceV2:
         card_status = str(payload.get("status") or "")
 
         export_form100_pdf_v2(card=payload, file_path=file_path)
-        artifact_hash = sha256_file(file_path)
+        artifact_hash = sha256_file_cached(file_path)
         with self.session_factory() as session:
             self.repo.record_artifact(
                 session,
@@ -503,9 +575,21 @@ class Form100ServiceV2:
         card_id: str | None = None,
         filters: Form100V2Filters | None = None,
         exported_by: str | None = None,
+        progress: ExchangeProgress | None = None,
+        workers: int = 1,
     ) -> Form100PackageExportResult:
+        """Выгрузить карточки с их PDF в ZIP-пакет с manifest.
+
+        PDF карточек при ``workers > 1`` формируются в пуле процессов и
+        дописываются в архив по мере готовности в порядке карточек;
+        ``form100.json`` и ``manifest.json`` с их хэшами пишутся последними.
+        ``progress`` получает число сформированных карточек (таблица ``form100``)
+        и байты, записанные в архив; при отмене или ошибке недописанный пакет
+        удаляется.
+        """
         if actor_id is None:
             raise AppPermissionError("actor_id обязателен для операций записи")
+        progress = progress or ExchangeProgress()
         filter_payload = filters.model_dump(exclude_none=True) if filters else {}
         with self.session_factory() as session:
             rows = self.repo.find_cards_for_export(session, card_id=card_id, filters=filter_payload)
@@ -519,37 +603,48 @@ class Form100ServiceV2:
                 for card in cards_payload
             ]
 
+        file_path = Path(file_path)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
         with _working_temp_dir() as tmp_dir:
             form_dir = tmp_dir / "form100"
             form_dir.mkdir(parents=True, exist_ok=True)
-            files: list[Path] = []
-            for card, json_card in zip(cards_payload, json_cards_payload, strict=True):
-                card_pdf_path = form_dir / f"{card['id']}.pdf"
-                export_form100_pdf_v2(card=card, file_path=card_pdf_path)
-                pdf_sha256 = sha256_file(card_pdf_path)
-                json_card["artifact_path"] = card_pdf_path.relative_to(tmp_dir).as_posix()
-                json_card["artifact_sha256"] = pdf_sha256
-                files.append(card_pdf_path)
-
-            json_path = tmp_dir / "form100.json"
-            counts = export_form100_json(json_cards_payload, json_path)
-            files.insert(0, json_path)
-
-            manifest = build_manifest_v2(files=files, exported_by=exported_by, base_dir=tmp_dir)
-            manifest_path = tmp_dir / "manifest.json"
-            manifest_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
-            files.append(manifest_path)
-
-            file_path = Path(file_path)
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            with zipfile.ZipFile(file_path, "w", zipfile.ZIP_DEFLATED) as zf:
-                zf.write(json_path, arcname="form100.json")
-                zf.write(manifest_path, arcname="manifest.json")
-                for card in cards_payload:
-                    card_pdf_path = form_dir / f"{card['id']}.pdf"
-                    zf.write(card_pdf_path, arcname=f"form100/{card['id']}.pdf")
-
-        package_hash = sha256_file(file_path)
+            pdf_files: list[Path] = []
+            written = 0
+            try:
+                with (
+                    zipfile.ZipFile(file_path, "w", zipfile.ZIP_DEFLATED) as zf,
+                    closing(_render_card_pdfs(cards_payload, form_dir, workers=workers)) as rendered,
+                ):
+                    for json_card, (card_pdf_path, pdf_sha256) in zip(json_cards_payload, rendered, strict=True):
+                        remember_sha256(card_pdf_path, pdf_sha256)
+                        arcname = card_pdf_path.relative_to(tmp_dir).as_posix()
+                        json_card["artifact_path"] = arcname
+                        json_card["artifact_sha256"] = pdf_sha256
+                        zf.write(card_pdf_path, arcname=arcname)
+                        pdf_size = card_pdf_path.stat().st_size
+                        written += pdf_size
+                        progress.add_bytes(pdf_size)
+                        pdf_files.append(card_pdf_path)
+                        progress.add_rows("form100")
+
+                    json_path = tmp_dir / "form100.json"
+                    counts = export_form100_json(json_cards_payload, json_path)
+                    manifest = build_manifest_v2(files=[json_path, *pdf_files], exported_by=exported_by, base_dir=tmp_dir)
+                    manifest_path = tmp_dir / "manifest.json"
+                    manifest_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+                    tail_members = [(json_path, "form100.json"), (manifest_path, "manifest.json")]
+                    # Общий объём известен только после того, как сформированы все PDF.
+                    progress.set_bytes_total(written + sum(source.stat().st_size for source, _ in tail_members))
+                    for source, member_name in tail_members:
+                        progress.check_cancelled()
+                        zf.write(source, arcname=member_name)
+                        progress.add_bytes(source.stat().st_size)
+            except BaseException:
+                file_path.unlink(missing_ok=True)
+                raise
+        progress.finish()
+
+        package_hash = sha256_file_cached(file_path)
         with self.session_factory() as session:
             session.add(
                 models.DataExchangePackage(
@@ -581,130 +676,163 @@ class Form100ServiceV2:
         actor_id: int | None,
         mode: str = "merge",
         system: bool = False,
+        progress: ExchangeProgress | None = None,
     ) -> Form100PackageImportResult:
+        """Импортировать ZIP-пакет карточек Form100 с их PDF.
+
+        ``progress`` получает обработанные карточки и прочитанные байты членов
+        архива; при отмене транзакция откатывается, а сохранённые PDF удаляются.
+        """
         actor_login, actor_role = self._resolve_actor(actor_id, system=system)
+        progress = progress or ExchangeProgress()
         file_path = Path(file_path)
-        with _working_temp_dir() as tmp_dir:
-            with zipfile.ZipFile(file_path, "r") as zf:
-                _safe_extract_zip(zf, tmp_dir)
-
-            manifest_path = tmp_dir / "manifest.json"
-            if not manifest_path.exists():
+        stored_artifacts: list[Path] = []
+        with zipfile.ZipFile(file_path, "r") as zf:
+            members = _zip_members(zf)
+            if "manifest.json" not in members:
                 raise ValueError("manifest.json is missing in archive")
-            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+            manifest = json.loads(zf.read(members["manifest.json"]))
             files = cast(list[Form100ManifestFileEntry], manifest.get("files") or [])
+            expected: dict[str, str] = {}
             for entry in files:
-                payload_path = (tmp_dir / str(entry.get("name"))).resolve()
-                if not payload_path.exists():
+                name = str(entry.get("name"))
+                if name not in members:
                     raise ValueError(f"Missing file in archive: {entry.get('name')}")
-                if sha256_file(payload_path) != str(entry.get("sha256")):
-                    raise ValueError(f"Hash mismatch for file: {entry.get('name')}")
+                expected[name] = str(entry.get("sha256"))
+            progress.set_bytes_total(sum(members[name].file_size for name in expected))
 
-            json_path = tmp_dir / "form100.json"
-            if not json_path.exists():
+            if "form100.json" not in members:
                 raise ValueError("form100.json is missing in archive")
             import_module = importlib.import_module("app.infrastructure.import.form100_import_v2")
-            load_form100_json = cast(Callable[[Path], list[JSONDict]], import_module.load_form100_json)
-            cards = load_form100_json(json_path)
+            load_form100_json = cast(Callable[[BinaryIO], list[JSONDict]], import_module.load_form100_json)
+            with _open_verified_member(zf, members["form100.json"], expected.get("form100.json"), progress) as stream:
+                cards = load_form100_json(stream)
+
+            # PDF карточек сверяются при копировании в хранилище, остальные члены manifest — сразу.
+            card_pdfs = {f"form100/{str(item.get('id') or '').strip()}.pdf" for item in cards}
+            for name, sha256 in expected.items():
+                if name != "form100.json" and name not in card_pdfs:
+                    _drain_verified_member(zf, members[name], sha256, progress)
+            unverified_pdfs = {name for name in expected if name in card_pdfs}
 
             added = 0
             updated = 0
             skipped = 0
             errors_list: list[Form100ImportError] = []
-            with self.session_factory() as session:
-                for item in cards:
-                    incoming_id = str(item.get("id") or "").strip() or str(uuid4())
-                    existing = self.repo.get_card(session, incoming_id)
-                    incoming_data = cast(JSONDict, item.get("data") or {})
-                    card_payload: dict[str, object] = {
-                        "emr_case_id": item.get("emr_case_id"),
-                        "main_full_name": item.get("main_full_name") or "",
-                        "main_unit": item.get("main_unit") or "",
-                        "main_id_tag": item.get("main_id_tag"),
-                        "main_diagnosis": item.get("main_diagnosis"),
-                        "birth_date": item.get("birth_date"),
-                        "status": item.get("status") or FORM100_V2_STATUS_DRAFT,
-                        "signed_by": item.get("signed_by"),
-                        "signed_at": item.get("signed_at"),
-                        "legacy_card_id": item.get("legacy_card_id"),
-                        "is_archived": bool(item.get("is_archived")),
-                    }
-                    try:
-                        validate_card_payload_v2({**card_payload, **incoming_data})
-                    except (TypeError, ValueError, KeyError) as exc:
-                        errors_list.append({"id": incoming_id, "error": str(exc)})
-                        skipped += 1
-                        continue
-                    if existing is None:
-                        added += 1
-                        self.repo.create_card(
-                            session,
-                            card_id=incoming_id,
-                            payload=card_payload,
-                            data_payload=cast(dict[str, object], incoming_data),
-                            actor_login=actor_login,
-                        )
-                    elif mode == "append":
-                        skipped += 1
-                        continue
-                    else:
-                        updated += 1
-                        self.repo.update_card(
-                            session,
-                            card_id=incoming_id,
-                            payload=card_payload,
-                            data_payload=cast(dict[str, object], incoming_data),
-                            expected_version=_as_int(existing.version),
-                            actor_login=actor_login,
-                        )
-
-                    pdf_path = tmp_dir / "form100" / f"{incoming_id}.pdf"
-                    if pdf_path.exists():
-                        artifact_path = self._store_imported_pdf(card_id=incoming_id, source_pdf=pdf_path)
-                        if artifact_path is not None:
-                            artifact_hash = sha256_file(artifact_path)
-                            self.repo.set_pdf_artifact(
+            try:
+                with self.session_factory() as session:
+                    for item in cards:
+                        progress.add_rows("form100")
+                        incoming_id = str(item.get("id") or "").strip() or str(uuid4())
+                        existing = self.repo.get_card(session, incoming_id)
+                        incoming_data = cast(JSONDict, item.get("data") or {})
+                        card_payload: dict[str, object] = {
+                            "emr_case_id": item.get("emr_case_id"),
+                            "main_full_name": item.get("main_full_name") or "",
+                            "main_unit": item.get("main_unit") or "",
+                            "main_id_tag": item.get("main_id_tag"),
+                            "main_diagnosis": item.get("main_diagnosis"),
+                            "birth_date": item.get("birth_date"),
+                            "status": item.get("status") or FORM100_V2_STATUS_DRAFT,
+                            "signed_by": item.get("signed_by"),
+                            "signed_at": item.get("signed_at"),
+                            "legacy_card_id": item.get("legacy_card_id"),
+                            "is_archived": bool(item.get("is_archived")),
+                        }
+                        try:
+                            validate_card_payload_v2({**card_payload, **incoming_data})
+                        except (TypeError, ValueError, KeyError) as exc:
+                            errors_list.append({"id": incoming_id, "error": str(exc)})
+                            skipped += 1
+                            continue
+                        if existing is None:
+                            added += 1
+                            self.repo.create_card(
+                                session,
+                                card_id=incoming_id,
+                                payload=card_payload,
+                                data_payload=cast(dict[str, object], incoming_data),
+                                actor_login=actor_login,
+                            )
+                        elif mode == "append":
+                            skipped += 1
+                            continue
+                        else:
+                            updated += 1
+                            self.repo.update_card(
                                 session,
                                 card_id=incoming_id,
-                                artifact_path=str(artifact_path),
-                                artifact_sha256=artifact_hash,
+                                payload=card_payload,
+                                data_payload=cast(dict[str, object], incoming_data),
+                                expected_version=_as_int(existing.version),
                                 actor_login=actor_login,
                             )
 
-                package_hash = sha256_file(file_path)
-                session.add(
-                    models.DataExchangePackage(
-                        direction="import",
-                        package_format="form100+zip",
-                        file_path=str(file_path),
-                        sha256=package_hash,
-                        created_by=actor_id,
-                        notes=json.dumps({"mode": mode}, ensure_ascii=False),
+                        pdf_name = f"form100/{incoming_id}.pdf"
+                        if pdf_name in members:
+                            stored = self._store_imported_pdf(
+                                card_id=incoming_id,
+                                open_source=partial(
+                                    _open_verified_member, zf, members[pdf_name], expected.get(pdf_name), progress
+                                ),
+                            )
+                            if stored is not None:
+                                unverified_pdfs.discard(pdf_name)
+                                artifact_path, artifact_hash = stored
+                                stored_artifacts.append(artifact_path)
+                                self.repo.set_pdf_artifact(
+                                    session,
+                                    card_id=incoming_id,
+                                    artifact_path=str(artifact_path),
+                                    artifact_sha256=artifact_hash,
+                                    actor_login=actor_login,
+                                )
+
+                    # PDF пропущенных и отклонённых карточек не копировались — сверяем их
+                    # отдельно, чтобы пакет с неверным хэшем в manifest не принимался.
+                    for name in sorted(unverified_pdfs):
+                        _drain_verified_member(zf, members[name], expected[name], progress)
+
+                    package_hash = sha256_file_cached(file_path)
+                    session.add(
+                        models.DataExchangePackage(
+                            direction="import",
+                            package_format="form100+zip",
+                            file_path=str(file_path),
+                            sha256=package_hash,
+                            created_by=actor_id,
+                            notes=json.dumps({"mode": mode}, ensure_ascii=False),
+                        )
                     )
-                )
-                audit_summary: Form100PackageSummary = {
-                    "rows_total": len(cards),
-                    "added": added,
-                    "updated": updated,
-                    "skipped": skipped,
-                    "errors": len(errors_list),
-                }
-                self.audit_repo.add_event(
-                    session,
-                    user_id=actor_id,
-                    entity_type="form100",
-                    entity_id="-",
-                    action="form100_import",
-                    payload_json=json.dumps(
-                        {
-                            "schema": "form100.audit.v2",
-                            "summary": audit_summary,
-                            "actor_role": actor_role,
-                        },
-                        ensure_ascii=False,
-                    ),
-                )
+                    audit_summary: Form100PackageSummary = {
+                        "rows_total": len(cards),
+                        "added": added,
+                        "updated": updated,
+                        "skipped": skipped,
+                        "errors": len(errors_list),
+                    }
+                    self.audit_repo.add_event(
+                        session,
+                        user_id=actor_id,
+                        entity_type="form100",
+                        entity_id="-",
+                        action="form100_import",
+                        payload_json=json.dumps(
+                            {
+                                "schema": "form100.audit.v2",
+                                "summary": audit_summary,
+                                "actor_role": actor_role,
+                            },
+                            ensure_ascii=False,
+                        ),
+                    )
+            except Exception:
+                # Транзакция откатилась — сохранённые PDF больше ни на что не ссылаются.
+                for artifact_path in stored_artifacts:
+                    artifact_path.unlink(missing_ok=True)
+                raise
 
+        progress.finish()
         result_summary: Form100PackageSummary = {
             "rows_total": len(cards),
             "added": added,
@@ -720,7 +848,13 @@ class Form100ServiceV2:
             "errors": errors_list,
         }
 
-    def _store_imported_pdf(self, *, card_id: str, source_pdf: Path) -> Path | None:
+    def _store_imported_pdf(
+        self,
+        *,
+        card_id: str,
+        open_source: Callable[[], AbstractContextManager[BinaryIO]],
+    ) -> tuple[Path, str] | None:
+        """Скопировать PDF из пакета в хранилище артефактов; возвращает путь и SHA-256 копии."""
         now = _utc_now()
         relative_dir = Path(now.strftime("%Y")) / now.strftime("%m")
         filename = f"{card_id}_{now.strftime('%Y%m%d_%H%M%S')}_{uuid4().hex[:6]}.pdf"
@@ -730,16 +864,25 @@ class Form100ServiceV2:
         ]
 
         for target_dir in target_roots:
+            target_path = target_dir / filename
             try:
                 target_dir.mkdir(parents=True, exist_ok=True)
                 if not os.access(target_dir, os.W_OK):
                     logger.warning("Каталог артефактов %s недоступен для записи", target_dir)
                     continue
-                target_path = target_dir / filename
-                shutil.copy2(source_pdf, target_path)
-                return target_path
+                digest = hashlib.sha256()
+                with open_source() as src, target_path.open("wb") as dst:
+                    for chunk in iter(lambda: src.read(_PDF_COPY_CHUNK_SIZE), b""):
+                        digest.update(chunk)
+                        dst.write(chunk)
+                remember_sha256(target_path, digest.hexdigest())
+                return target_path, digest.hexdigest()
             except OSError as exc:
+                target_path.unlink(missing_ok=True)
                 logger.warning("Не удалось сохранить PDF-артефакт в %s: %s", target_dir, exc)
+            except ValueError:
+                target_path.unlink(missing_ok=True)
+                raise
         return None
 
     def _write_audit(
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import json
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from datetime import UTC, date, datetime, timedelta
-from typing import cast
+from typing import Any, cast
 
 from app.application.dto.lab_dto import (
     LabSampleCreateRequest,
+    LabSampleListFilters,
+    LabSampleListPage,
     LabSampleResponse,
     LabSampleResultUpdate,
     LabSampleUpdateRequest,
@@ -120,6 +122,90 @@ class LabService:
                 qc_status=qc_status,
             )
 
+    def create_samples_bulk(
+        self, requests: Sequence[LabSampleCreateRequest], *, actor_id: int
+    ) -> list[LabSampleResponse]:
+        """Зарегистрировать пачку проб одной транзакцией (массовый скрининг).
+
+        Все запросы проверяются до записи; номера резервируются блоком на каждую
+        пару (дата взятия, тип материала), пробы вставляются одним пакетным
+        INSERT, в аудит пишется одно сводное событие. Ответы возвращаются в
+        порядке ``requests``.
+        """
+        if not requests:
+            return []
+        now = datetime.now(UTC)
+        with self.session_factory() as session:
+            self._require_write_access(session, actor_id)
+            materials: dict[int, Any] = {}
+            for material_type_id in dict.fromkeys(request.material_type_id for request in requests):
+                material = self.ref_repo.get_material_type(session, material_type_id)
+                if not material:
+                    raise ValueError(f"Тип материала не найден: {material_type_id}")
+                materials[material_type_id] = material
+
+            seq_dates = [(request.taken_at or now).date() for request in requests]
+            groups: dict[tuple[date, int], list[int]] = {}
+            for index, request in enumerate(requests):
+                groups.setdefault((seq_dates[index], request.material_type_id), []).append(index)
+            lab_nos: list[str] = [""] * len(requests)
+            for (seq_date, material_type_id), indexes in groups.items():
+                numbers = self.lab_repo.reserve_lab_numbers(
+                    session, seq_date, material_type_id, len(indexes)
+                )
+                material_code = cast(str, materials[material_type_id].code)
+                for index, seq in zip(indexes, numbers, strict=True):
+                    lab_nos[index] = _format_lab_no(material_code, seq_date, seq)
+
+            rows: list[dict[str, Any]] = []
+            for request, lab_no in zip(requests, lab_nos, strict=True):
+                material = materials[request.material_type_id]
+                rows.append(
+                    {
+                        "patient_id": request.patient_id,
+                        "emr_case_id": request.emr_case_id,
+                        "lab_no": lab_no,
+                        "material_type_id": request.material_type_id,
+                        "material_location": request.material_location,
+                        "medium": request.medium,
+                        "study_kind": request.study_kind,
+                        "ordered_at": request.ordered_at,
+                        "taken_at": request.taken_at,
+                        "delivered_at": request.delivered_at,
+                        "qc_due_at": _compute_qc_due_at(
+                            request.taken_at,
+                            cast(str | None, material.code),
+                            cast(str | None, material.name),
+                        ),
+                        "qc_status": "valid",
+                        "created_by": actor_id,
+                    }
+                )
+            sample_ids = self.lab_repo.create_samples_bulk(session, rows)
+
+            self.audit_repo.add_event(
+                session,
+                user_id=actor_id,
+                entity_type="lab_sample",
+                entity_id="*",
+                action="create_lab_samples_bulk",
+                payload_json=json.dumps({"count": len(rows), "lab_nos": lab_nos}),
+            )
+            return [
+                LabSampleResponse(
+                    id=sample_id,
+                    lab_no=row["lab_no"],
+                    material_type_id=row["material_type_id"],
+                    material_location=row["material_location"],
+                    medium=row["medium"],
+                    taken_at=row["taken_at"],
+                    growth_flag=None,
+                    qc_due_at=row["qc_due_at"],
+                    qc_status=row["qc_status"],
+                )
+                for sample_id, row in zip(sample_ids, rows, strict=True)
+            ]
+
     def update_result(self, sample_id: int, request: LabSampleResultUpdate, actor_id: int) -> LabSampleResponse:
         with self.session_factory() as session:
             self._require_write_access(session, actor_id)
@@ -229,38 +315,85 @@ class LabService:
 
     def list_samples(self, patient_id: int, emr_case_id: int | None = None) -> list[LabSampleResponse]:
         with self.session_factory() as session:
-            samples = self.lab_repo.list_by_patient(session, patient_id, emr_case_id=emr_case_id)
-            responses = []
-            for s in samples:
-                sample_id = cast(int, s.id)
-                isolation = self.lab_repo.get_isolation(session, sample_id)
-                micro = isolation[0] if isolation else None
-                lab_no_value = cast(str, s.lab_no)
-                material_type_id = cast(int, s.material_type_id)
-                material_location = cast(str | None, s.material_location)
-                medium = cast(str | None, s.medium)
-                taken_at = cast(datetime | None, s.taken_at)
-                growth_flag = cast(int | None, s.growth_flag)
-                qc_due_at_value = cast(datetime | None, s.qc_due_at)
-                qc_status = cast(str | None, s.qc_status)
-                microorganism_id = cast(int | None, micro.microorganism_id) if micro else None
-                microorganism_free = cast(str | None, micro.microorganism_free) if micro else None
-                responses.append(
-                    LabSampleResponse(
-                        id=sample_id,
-                        lab_no=lab_no_value,
-                        material_type_id=material_type_id,
-                        material_location=material_location,
-                        medium=medium,
-                        taken_at=taken_at,
-                        growth_flag=growth_flag,
-                        qc_due_at=qc_due_at_value,
-                        qc_status=qc_status,
-                        microorganism_id=microorganism_id,
-                        microorganism_free=microorganism_free,
-                    )
+            rows = self.lab_repo.list_by_patient_with_first_isolation(
+                session, patient_id, emr_case_id=emr_case_id
+            )
+            return [self._to_list_response(*row) for row in rows]
+
+    def list_samples_page(
+        self,
+        patient_id: int,
+        emr_case_id: int | None = None,
+        *,
+        filters: LabSampleListFilters | None = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> LabSampleListPage:
+        filter_payload = filters.model_dump(exclude_none=True) if filters else {}
+        with self.session_factory() as session:
+            summary = self.lab_repo.growth_summary_by_patient(
+                session, patient_id, emr_case_id=emr_case_id
+            )
+            if filter_payload:
+                filtered_total = self.lab_repo.count_by_patient(
+                    session, patient_id, emr_case_id=emr_case_id, **filter_payload
+                )
+            else:
+                filtered_total = summary["total"]
+            rows = self.lab_repo.list_by_patient_with_first_isolation(
+                session,
+                patient_id,
+                emr_case_id=emr_case_id,
+                limit=limit,
+                offset=offset,
+                **filter_payload,
+            )
+            return LabSampleListPage(
+                items=[self._to_list_response(*row) for row in rows],
+                filtered_total=filtered_total,
+                total=summary["total"],
+                positive=summary["positive"],
+                negative=summary["negative"],
+                pending=summary["pending"],
+            )
+
+    @staticmethod
+    def _to_list_response(
+        sample: Any,
+        microorganism_id: int | None,
+        microorganism_free: str | None,
+    ) -> LabSampleResponse:
+        return LabSampleResponse(
+            id=cast(int, sample.id),
+            lab_no=cast(str, sample.lab_no),
+            material_type_id=cast(int, sample.material_type_id),
+            material_location=cast(str | None, sample.material_location),
+            medium=cast(str | None, sample.medium),
+            taken_at=cast(datetime | None, sample.taken_at),
+            growth_flag=cast(int | None, sample.growth_flag),
+            qc_due_at=cast(datetime | None, sample.qc_due_at),
+            qc_status=cast(str | None, sample.qc_status),
+            microorganism_id=microorganism_id,
+            microorganism_free=microorganism_free,
+        )
+
+    def find_by_number(self, query: str, limit: int = 20) -> list[LabSampleResponse]:
+        with self.session_factory() as session:
+            samples = self.lab_repo.search_by_number(session, query, limit=limit)
+            return [
+                LabSampleResponse(
+                    id=cast(int, s.id),
+                    lab_no=cast(str, s.lab_no),
+                    material_type_id=cast(int, s.material_type_id),
+                    material_location=cast(str | None, s.material_location),
+                    medium=cast(str | None, s.medium),
+                    taken_at=cast(datetime | None, s.taken_at),
+                    growth_flag=cast(int | None, s.growth_flag),
+                    qc_due_at=cast(datetime | None, s.qc_due_at),
+                    qc_status=cast(str | None, s.qc_status),
                 )
-            return responses
+                for s in samples
+            ]
 
     def get_detail(self, sample_id: int) -> dict:
         with self.session_factory() as session:
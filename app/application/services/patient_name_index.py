@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import heapq
+import re
+import threading
+from bisect import bisect_left, insort
+from collections.abc import Iterable
+
+from app.application.dto.patient_dto import PatientResponse
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def normalize_tokens(value: str | None) -> list[str]:
+    """Разбить строку на нормализованные токены поиска (casefold, «ё» → «е»)."""
+    if not value:
+        return []
+    return _TOKEN_RE.findall(value.casefold().replace("ё", "е"))
+
+
+def _patient_tokens(patient: PatientResponse) -> frozenset[str]:
+    tokens = set(normalize_tokens(patient.full_name))
+    if patient.dob is not None:
+        tokens.update(normalize_tokens(patient.dob.strftime("%d.%m.%Y")))
+    tokens.update(normalize_tokens(patient.category))
+    return frozenset(tokens)
+
+
+class PatientNameIndex:
+    """Префиксный индекс пациентов в памяти для пикера и поиска по мере ввода.
+
+    Индекс строится лениво (``load``) и затем поддерживается инкрементально
+    через ``upsert``/``remove``. Каждый пациент раскладывается на токены ФИО,
+    даты рождения и категории; запрос совпадает, если каждое его слово является
+    префиксом какого-либо токена пациента. Порядок выдачи совпадает с
+    ``PatientRepository.list_for_picker``: ФИО, затем ID.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._generation = 0
+        self._patients: dict[int, PatientResponse] = {}
+        self._tokens: dict[int, frozenset[str]] = {}
+        # Отсортированные пары (токен, id): префикс ищется бинарным поиском.
+        self._postings: list[tuple[str, int]] = []
+        # Отсортированные пары (ФИО, id) — порядок пикера.
+        self._order: list[tuple[str, int]] = []
+
+    @property
+    def is_loaded(self) -> bool:
+        with self._lock:
+            return self._loaded
+
+    @property
+    def generation(self) -> int:
+        """Счётчик изменений; используется, чтобы не загрузить устаревший снимок."""
+        with self._lock:
+            return self._generation
+
+    def load(self, patients: Iterable[PatientResponse], *, generation: int) -> bool:
+        """Заполнить индекс снимком из БД.
+
+        Снимок отбрасывается, если после его чтения индекс успел получить
+        изменения (``generation`` не совпадает) — тогда вызывающий код должен
+        обслужить запрос из БД и повторить загрузку позже.
+        """
+        patients_by_id = {patient.id: patient for patient in patients}
+        tokens = {patient_id: _patient_tokens(p) for patient_id, p in patients_by_id.items()}
+        postings = sorted(
+            (token, patient_id)
+            for patient_id, patient_tokens in tokens.items()
+            for token in patient_tokens
+        )
+        order = sorted((p.full_name, patient_id) for patient_id, p in patients_by_id.items())
+        with self._lock:
+            if generation != self._generation:
+                return False
+            self._patients = patients_by_id
+            self._tokens = tokens
+            self._postings = postings
+            self._order = order
+            self._loaded = True
+            return True
+
+    def invalidate(self) -> None:
+        """Сбросить индекс; он будет перестроен при следующем обращении."""
+        with self._lock:
+            self._generation += 1
+            self._loaded = False
+            self._patients = {}
+            self._tokens = {}
+            self._postings = []
+            self._order = []
+
+    def upsert(self, patient: PatientResponse) -> None:
+        with self._lock:
+            self._generation += 1
+            if not self._loaded:
+                return
+            self._remove_locked(patient.id)
+            patient_tokens = _patient_tokens(patient)
+            self._patients[patient.id] = patient
+            self._tokens[patient.id] = patient_tokens
+            for token in patient_tokens:
+                insort(self._postings, (token, patient.id))
+            insort(self._order, (patient.full_name, patient.id))
+
+    def remove(self, patient_id: int) -> None:
+        with self._lock:
+            self._generation += 1
+            if self._loaded:
+                self._remove_locked(patient_id)
+
+    def list_all(self, limit: int | None = None) -> list[PatientResponse]:
+        with self._lock:
+            keys = self._order if limit is None else self._order[:limit]
+            return [self._patients[patient_id] for _name, patient_id in keys]
+
+    def search(self, query: str, limit: int = 10) -> list[PatientResponse]:
+        terms = sorted(set(normalize_tokens(query)), key=len, reverse=True)
+        if not terms or limit <= 0:
+            return []
+        with self._lock:
+            candidates: set[int] | None = None
+            # Длинные слова избирательнее — начинаем с них, чтобы пересечение быстрее сузилось.
+            for term in terms:
+                matched = self._prefix_ids(term)
+                candidates = matched if candidates is None else candidates & matched
+                if not candidates:
+                    return []
+            assert candidates is not None
+            best = heapq.nsmallest(
+                limit,
+                candidates,
+                key=lambda patient_id: (self._patients[patient_id].full_name, patient_id),
+            )
+            return [self._patients[patient_id] for patient_id in best]
+
+    def _prefix_ids(self, prefix: str) -> set[int]:
+        postings = self._postings
+        idx = bisect_left(postings, (prefix,))
+        result: set[int] = set()
+        while idx < len(postings) and postings[idx][0].startswith(prefix):
+            result.add(postings[idx][1])
+            idx += 1
+        return result
+
+    def _remove_locked(self, patient_id: int) -> None:
+        patient = self._patients.pop(patient_id, None)
+        if patient is None:
+            return
+        for token in self._tokens.pop(patient_id, frozenset()):
+            self._discard_sorted(self._postings, (token, patient_id))
+        self._discard_sorted(self._order, (patient.full_name, patient_id))
+
+    @staticmethod
+    def _discard_sorted(items: list[tuple[str, int]], key: tuple[str, int]) -> None:
+        idx = bisect_left(items, key)
+        if idx < len(items) and items[idx] == key:
+            del items[idx]
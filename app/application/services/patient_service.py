@@ -10,7 +10,8 @@ from sqlalchemy import select
 from sqlalchemy.exc import OperationalError
 
 from app.application.dto.patient_dto import PatientCreateRequest, PatientResponse
-from app.infrastructure.db.fts_manager import FtsManager
+from app.application.services.patient_name_index import PatientNameIndex
+from app.infrastructure.db.fts_manager import FtsManager, rebuild_rowid_keyed_fts
 from app.infrastructure.db.models_sqlalchemy import (
     AuditLog,
     EmrAntibioticCourse,
@@ -39,12 +40,53 @@ class PatientService:
         fts_manager: FtsManager | None = None,
         user_repo: UserRepository | None = None,
         audit_repo: AuditLogRepository | None = None,
+        name_index: PatientNameIndex | None = None,
     ) -> None:
         self.patient_repo = patient_repo or PatientRepository()
         self.session_factory = session_factory
         self.fts_manager = fts_manager or FtsManager(session_factory=session_factory)
         self.user_repo = user_repo or UserRepository()
         self.audit_repo = audit_repo or AuditLogRepository()
+        self.name_index = name_index or PatientNameIndex()
+
+    @staticmethod
+    def _to_response(patient: Any) -> PatientResponse:
+        return PatientResponse(
+            id=cast(int, patient.id),
+            full_name=cast(str, patient.full_name),
+            dob=cast("date | None", patient.dob),
+            sex=cast(str, patient.sex),
+            category=cast(str | None, patient.category),
+            military_unit=cast(str | None, patient.military_unit),
+            military_district=cast(str | None, patient.military_district),
+        )
+
+    def _ensure_name_index(self) -> bool:
+        """Лениво построить индекс ФИО; False — индекс пока недоступен, читать из БД."""
+        if self.name_index.is_loaded:
+            return True
+        generation = self.name_index.generation
+        with self.session_factory() as session:
+            patients = [
+                self._to_response(patient)
+                for patient in self.patient_repo.list_for_picker(session)
+            ]
+        return self.name_index.load(patients, generation=generation)
+
+    def _refresh_name_index(self, patient_id: int) -> None:
+        if not self.name_index.is_loaded:
+            return
+        with self.session_factory() as session:
+            patient = self.patient_repo.get_by_id(session, patient_id)
+            response = self._to_response(patient) if patient else None
+        if response is None:
+            self.name_index.remove(patient_id)
+        else:
+            self.name_index.upsert(response)
+
+    def invalidate_name_index(self) -> None:
+        """Сбросить индекс ФИО после массовых изменений в обход сервиса (импорт)."""
+        self.name_index.invalidate()
 
     def _apply_identity_updates(self, existing_obj: Any, request: PatientCreateRequest) -> None:
         if existing_obj.category != request.category:
@@ -83,6 +125,12 @@ class PatientService:
         )
 
     def create_or_get(self, request: PatientCreateRequest, actor_id: int) -> PatientResponse:
+        response = self._create_or_get(request, actor_id)
+        # Индекс обновляется только после фиксации транзакции.
+        self.name_index.upsert(response)
+        return response
+
+    def _create_or_get(self, request: PatientCreateRequest, actor_id: int) -> PatientResponse:
         with self.session_factory() as session:
             self._require_write_access(session, actor_id)
             existing = self.patient_repo.find_by_identity(session, request.full_name, request.dob)
@@ -206,27 +254,19 @@ class PatientService:
     def search_by_name(self, query: str, limit: int = 10) -> list[PatientResponse]:
         with self.session_factory() as session:
             patients = self.patient_repo.search_by_name(session, query, limit=limit)
-            results: list[PatientResponse] = []
-            for patient in patients:
-                patient_id_value = cast(int, patient.id)
-                full_name = cast(str, patient.full_name)
-                dob = cast("date | None", patient.dob)
-                sex = cast(str, patient.sex)
-                category = cast(str | None, patient.category)
-                military_unit = cast(str | None, patient.military_unit)
-                military_district = cast(str | None, patient.military_district)
-                results.append(
-                    PatientResponse(
-                        id=patient_id_value,
-                        full_name=full_name,
-                        dob=dob,
-                        sex=sex,
-                        category=category,
-                        military_unit=military_unit,
-                        military_district=military_district,
-                    )
-                )
-            return results
+            return [self._to_response(patient) for patient in patients]
+
+    def autocomplete(self, query: str, limit: int = 10) -> list[PatientResponse]:
+        """Подсказки по мере ввода из индекса ФИО в памяти, в порядке пикера.
+
+        Если префиксы слов запроса ничего не нашли, используется ``search_by_name``
+        (FTS/LIKE в БД) — он находит и подстроки внутри слов.
+        """
+        if self._ensure_name_index():
+            found = self.name_index.search(query, limit=limit)
+            if found:
+                return found
+        return self.search_by_name(query, limit=limit)
 
     def get_patient_name(self, patient_id: int) -> str | None:
         with self.session_factory() as session:
@@ -261,29 +301,11 @@ class PatientService:
             return results
 
     def list_for_picker(self, limit: int | None = None) -> list[PatientResponse]:
+        if self._ensure_name_index():
+            return self.name_index.list_all(limit=limit)
         with self.session_factory() as session:
             patients = self.patient_repo.list_for_picker(session, limit=limit)
-            results: list[PatientResponse] = []
-            for patient in patients:
-                patient_id_value = cast(int, patient.id)
-                full_name = cast(str, patient.full_name)
-                dob = cast("date | None", patient.dob)
-                sex = cast(str, patient.sex)
-                category = cast(str | None, patient.category)
-                military_unit = cast(str | None, patient.military_unit)
-                military_district = cast(str | None, patient.military_district)
-                results.append(
-                    PatientResponse(
-                        id=patient_id_value,
-                        full_name=full_name,
-                        dob=dob,
-                        sex=sex,
-                        category=category,
-                        military_unit=military_unit,
-                        military_district=military_district,
-                    )
-                )
-            return results
+            return [self._to_response(patient) for patient in patients]
 
     def update_category(self, patient_id: int, category: str, actor_id: int) -> None:
         with self.session_factory() as session:
@@ -334,6 +356,7 @@ class PatientService:
                 action="update_patient",
                 changed_fields=["category"],
             )
+        self._refresh_name_index(patient_id)
 
     def update_details(
         self,
@@ -435,6 +458,7 @@ class PatientService:
                 action="update_patient",
                 changed_fields=changed_fields,
             )
+        self._refresh_name_index(patient_id)
 
     def _repair_database_raw(self, session) -> None:
         bind = session.get_bind()
@@ -455,6 +479,7 @@ class PatientService:
                 )
             cur.execute("REINDEX")
             cur.execute("VACUUM")
+            rebuild_rowid_keyed_fts(conn)
             conn.commit()
         finally:
             conn.close()
@@ -603,6 +628,4 @@ class PatientService:
                 patient_id=patient_id,
                 action="delete_patient",
             )
-
-
-
+        self.name_index.remove(patient_id)
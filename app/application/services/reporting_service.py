@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import json
 import logging
-import shutil
 from collections.abc import Callable
 from datetime import UTC, date, datetime
 from pathlib import Path
@@ -30,7 +29,7 @@ from app.infrastructure.db import models_sqlalchemy as models
 from app.infrastructure.db.session import session_scope
 from app.infrastructure.reporting.pdf_determinism import build_invariant_pdf
 from app.infrastructure.reporting.pdf_fonts import get_pdf_unicode_font_name
-from app.infrastructure.security.sha256 import sha256_file
+from app.infrastructure.security.sha256 import copy_file_with_sha256, sha256_file_cached
 
 REPORT_ARTIFACT_DIR = DATA_DIR / "artifacts" / "reports"
 
@@ -216,7 +215,7 @@ class ReportingService:
         wb.save(file_path)
 
         artifact_path = self._save_artifact_copy(report_type="analytics", source_path=file_path)
-        report_hash = sha256_file(artifact_path)
+        report_hash = sha256_file_cached(artifact_path)
         report_run_id = self._log_report_run(
             report_type="analytics",
             filters=filters,
@@ -463,7 +462,7 @@ class ReportingService:
         build_invariant_pdf(doc, elements)
 
         artifact_path = self._save_artifact_copy(report_type="analytics", source_path=file_path)
-        report_hash = sha256_file(artifact_path)
+        report_hash = sha256_file_cached(artifact_path)
         report_run_id = self._log_report_run(
             report_type="analytics",
             filters=filters,
@@ -496,7 +495,7 @@ class ReportingService:
         report_type = "form100"
 
         artifact_path = self._save_artifact_copy(report_type=report_type, source_path=file_path)
-        report_hash = sha256_file(artifact_path)
+        report_hash = sha256_file_cached(artifact_path)
         report_run_id = self._log_report_run(
             report_type=report_type,
             filters={"card_id": card_id},
@@ -667,7 +666,7 @@ class ReportingService:
             result["message"] = "Эталонный SHA256 не сохранен"
             return result
         try:
-            actual_sha256 = sha256_file(path)
+            actual_sha256 = sha256_file_cached(path)
         except OSError as exc:
             result["status"] = "error"
             result["verified"] = False
@@ -697,7 +696,7 @@ class ReportingService:
         suffix = source_path.suffix or ".bin"
         artifact_name = f"{report_type}_{now.strftime('%Y%m%d_%H%M%S')}_{uuid4().hex[:8]}{suffix}"
         artifact_path = artifact_dir / artifact_name
-        shutil.copy2(source_path, artifact_path)
+        copy_file_with_sha256(source_path, artifact_path)
         return artifact_path
 
     def _safe_json_loads(self, payload: str) -> dict[str, Any]:
@@ -1,16 +1,21 @@
 from __future__ import annotations
 
 import json
-from collections.abc import Callable
-from datetime import UTC, datetime
-from typing import cast
+from collections.abc import Callable, Sequence
+from datetime import UTC, date, datetime
+from typing import Any, cast
 
 from app.application.dto.sanitary_dto import (
+    SanitaryDepartmentOverview,
     SanitarySampleCreateRequest,
+    SanitarySampleListCursor,
+    SanitarySampleListFilters,
+    SanitarySampleListPage,
     SanitarySampleResponse,
     SanitarySampleResultUpdate,
     SanitarySampleUpdateRequest,
 )
+from app.infrastructure.db.models_sqlalchemy import SanitarySample
 from app.infrastructure.db.repositories.audit_repo import AuditLogRepository
 from app.infrastructure.db.repositories.sanitary_repo import SanitaryRepository
 from app.infrastructure.db.repositories.user_repo import UserRepository
@@ -87,6 +92,164 @@ class SanitaryService:
                 growth_flag=growth_flag,
             )
 
+    def create_sampling_round(
+        self, requests: Sequence[SanitarySampleCreateRequest], *, actor_id: int
+    ) -> list[SanitarySampleResponse]:
+        """Зарегистрировать обход (все точки отбора за день) одной транзакцией.
+
+        Номера резервируются блоком из ``sanitary_number_sequence`` на каждую дату
+        взятия, пробы вставляются одним пакетным INSERT, в аудит пишется одно
+        сводное событие. Ответы возвращаются в порядке ``requests``.
+        """
+        if not requests:
+            return []
+        for request in requests:
+            if not request.sampling_point:
+                raise ValueError("Укажите точку отбора для каждой пробы обхода")
+        now = datetime.now(UTC)
+        with self.session_factory() as session:
+            self._require_write_access(session, actor_id)
+            seq_dates = [request.taken_at or now for request in requests]
+            groups: dict[date, list[int]] = {}
+            for index, seq_date in enumerate(seq_dates):
+                groups.setdefault(seq_date.date(), []).append(index)
+            lab_nos: list[str] = [""] * len(requests)
+            for indexes in groups.values():
+                seq_date = seq_dates[indexes[0]]
+                numbers = self.repo.reserve_lab_numbers(session, seq_date, len(indexes))
+                for index, seq in zip(indexes, numbers, strict=True):
+                    lab_nos[index] = _format_sanitary_lab_no(seq_date, seq)
+
+            rows: list[dict[str, Any]] = [
+                {
+                    "lab_no": lab_no,
+                    "department_id": request.department_id,
+                    "sampling_point": request.sampling_point,
+                    "room": request.room,
+                    "medium": request.medium,
+                    "taken_at": request.taken_at,
+                    "delivered_at": request.delivered_at,
+                    "created_by": actor_id,
+                }
+                for request, lab_no in zip(requests, lab_nos, strict=True)
+            ]
+            sample_ids = self.repo.create_samples_bulk(session, rows)
+
+            self.audit_repo.add_event(
+                session,
+                user_id=actor_id,
+                entity_type="sanitary_sample",
+                entity_id="*",
+                action="create_sanitary_round",
+                payload_json=json.dumps(
+                    {
+                        "count": len(rows),
+                        "departments": sorted({request.department_id for request in requests}),
+                        "lab_nos": lab_nos,
+                    }
+                ),
+            )
+            return [
+                SanitarySampleResponse(
+                    id=sample_id,
+                    lab_no=row["lab_no"],
+                    department_id=row["department_id"],
+                    sampling_point=row["sampling_point"],
+                    room=row["room"],
+                    medium=row["medium"],
+                    taken_at=row["taken_at"],
+                    growth_flag=None,
+                )
+                for sample_id, row in zip(sample_ids, rows, strict=True)
+            ]
+
+    def update_results_bulk(
+        self, results: Sequence[tuple[int, SanitarySampleResultUpdate]], *, actor_id: int
+    ) -> list[SanitarySampleResponse]:
+        """Внести результаты обхода пакетно: как ``update_result``, но для многих проб сразу.
+
+        Результаты, культуры, чувствительность и фаги записываются несколькими
+        пакетными операторами независимо от числа проб; в аудит пишется одно
+        сводное событие.
+        """
+        if not results:
+            return []
+        sample_ids = [sample_id for sample_id, _request in results]
+        if len(set(sample_ids)) != len(sample_ids):
+            raise ValueError("Проба указана в пакете результатов несколько раз")
+        with self.session_factory() as session:
+            self._require_write_access(session, actor_id)
+            existing = {
+                cast(int, sample.id)
+                for sample, _micro_id, _micro_free in self.repo.list_by_ids_with_first_isolation(
+                    session, sample_ids
+                )
+            }
+            missing = [sample_id for sample_id in sample_ids if sample_id not in existing]
+            if missing:
+                raise ValueError(f"Проба не найдена: {missing[0]}")
+
+            self.repo.update_results_bulk(
+                session,
+                [
+                    {
+                        "id": sample_id,
+                        "growth_result_at": request.growth_result_at,
+                        "growth_flag": request.growth_flag,
+                        "colony_desc": request.colony_desc,
+                        "microscopy": request.microscopy,
+                        "cfu": request.cfu,
+                    }
+                    for sample_id, request in results
+                ],
+            )
+            self.repo.replace_isolation_bulk(
+                session,
+                {
+                    sample_id: (
+                        [
+                            {
+                                "microorganism_id": request.microorganism_id,
+                                "microorganism_free": request.microorganism_free,
+                                "notes": None,
+                            }
+                        ]
+                        if request.microorganism_id or request.microorganism_free
+                        else []
+                    )
+                    for sample_id, request in results
+                },
+            )
+            self.repo.replace_susceptibility_bulk(
+                session, {sample_id: request.susceptibility for sample_id, request in results}
+            )
+            self.repo.replace_phages_bulk(
+                session, {sample_id: request.phages for sample_id, request in results}
+            )
+
+            self.audit_repo.add_event(
+                session,
+                user_id=actor_id,
+                entity_type="sanitary_sample",
+                entity_id="*",
+                action="update_sanitary_results_bulk",
+                payload_json=json.dumps(
+                    {
+                        "count": len(results),
+                        "results": {
+                            str(sample_id): request.growth_flag for sample_id, request in results
+                        },
+                    }
+                ),
+            )
+            session.expire_all()
+            return [
+                self._to_response(sample, microorganism_id, microorganism_free)
+                for sample, microorganism_id, microorganism_free in (
+                    self.repo.list_by_ids_with_first_isolation(session, sample_ids)
+                )
+            ]
+
     def update_result(
         self, sample_id: int, request: SanitarySampleResultUpdate, actor_id: int
     ) -> SanitarySampleResponse:
@@ -219,6 +382,131 @@ class SanitaryService:
                 )
             return responses
 
+    def list_samples_page(
+        self,
+        department_id: int,
+        *,
+        filters: SanitarySampleListFilters | None = None,
+        limit: int = 50,
+        after: SanitarySampleListCursor | None = None,
+    ) -> SanitarySampleListPage:
+        """Страница истории проб отделения: фильтры и keyset-пагинация выполняются в БД.
+
+        ``after`` — ``next_cursor`` предыдущей страницы; для первой страницы не передаётся.
+        """
+        filters = filters or SanitarySampleListFilters()
+        criteria = filters.model_dump()
+        with self.session_factory() as session:
+            rows = self.repo.list_page_by_department(
+                session,
+                department_id,
+                **criteria,
+                after=(after.taken_at, after.id) if after is not None else None,
+                limit=limit + 1,
+            )
+            filtered_total, positive, last_taken_at = self.repo.count_by_department(
+                session, department_id, **criteria
+            )
+            if any(value not in (None, "") for value in criteria.values()):
+                total, _positive, _last = self.repo.count_by_department(session, department_id)
+            else:
+                total = filtered_total
+            has_more = len(rows) > limit
+            items = [
+                self._to_response(sample, microorganism_id, microorganism_free)
+                for sample, microorganism_id, microorganism_free in rows[:limit]
+            ]
+            next_cursor = (
+                SanitarySampleListCursor(taken_at=items[-1].taken_at, id=items[-1].id)
+                if has_more and items
+                else None
+            )
+            return SanitarySampleListPage(
+                items=items,
+                filtered_total=filtered_total,
+                total=total,
+                positive=positive,
+                last_taken_at=last_taken_at,
+                next_cursor=next_cursor,
+            )
+
+    def get_department_overview(
+        self,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        growth: int | None = None,
+    ) -> list[SanitaryDepartmentOverview]:
+        """Счётчики и последняя проба по отделениям за период — одним сгруппированным запросом.
+
+        В ответ попадают только отделения с пробами в периоде; ``growth`` (1, 0
+        или -1 — без результата) оставляет отделения, где есть хотя бы одна
+        проба с таким результатом.
+        """
+        with self.session_factory() as session:
+            rows = self.repo.department_overview(
+                session, date_from=date_from, date_to=date_to, growth=growth
+            )
+            return [
+                SanitaryDepartmentOverview(
+                    department_id=department_id,
+                    total_count=total,
+                    positive_count=positive,
+                    negative_count=negative,
+                    pending_count=pending,
+                    last_sample=(
+                        self._to_response(sample, microorganism_id, microorganism_free)
+                        if sample is not None
+                        else None
+                    ),
+                )
+                for (
+                    department_id,
+                    total,
+                    positive,
+                    negative,
+                    pending,
+                    sample,
+                    microorganism_id,
+                    microorganism_free,
+                ) in rows
+            ]
+
+    @staticmethod
+    def _to_response(
+        sample: SanitarySample,
+        microorganism_id: int | None = None,
+        microorganism_free: str | None = None,
+    ) -> SanitarySampleResponse:
+        return SanitarySampleResponse(
+            id=cast(int, sample.id),
+            lab_no=cast(str, sample.lab_no),
+            department_id=cast(int, sample.department_id),
+            sampling_point=cast(str | None, sample.sampling_point),
+            room=cast(str | None, sample.room),
+            medium=cast(str | None, sample.medium),
+            taken_at=cast(datetime | None, sample.taken_at),
+            growth_flag=cast(int | None, sample.growth_flag),
+            microorganism_id=microorganism_id,
+            microorganism_free=microorganism_free,
+        )
+
+    def find_by_number(self, query: str, limit: int = 20) -> list[SanitarySampleResponse]:
+        with self.session_factory() as session:
+            samples = self.repo.search_by_number(session, query, limit=limit)
+            return [
+                SanitarySampleResponse(
+                    id=cast(int, s.id),
+                    lab_no=cast(str, s.lab_no),
+                    department_id=cast(int, s.department_id),
+                    sampling_point=cast(str | None, s.sampling_point),
+                    room=cast(str | None, s.room),
+                    medium=cast(str | None, s.medium),
+                    taken_at=cast(datetime | None, s.taken_at),
+                    growth_flag=cast(int | None, s.growth_flag),
+                )
+                for s in samples
+            ]
+
     def get_detail(self, sample_id: int) -> dict:
         with self.session_factory() as session:
             sample = self.repo.get_sample(session, sample_id)
@@ -91,12 +91,20 @@ def build_container() -> Container:
     user_admin_service = UserAdminService(
         user_repo=user_repo, audit_repo=audit_repo, session_factory=app_session_scope
     )
+    patient_service = PatientService(
+        patient_repo=patient_repo,
+        session_factory=app_session_scope,
+        fts_manager=fts_manager,
+        user_repo=user_repo,
+        audit_repo=audit_repo,
+    )
     emz_service = EmzService(
         emz_repo=emz_repo,
         patient_repo=patient_repo,
         user_repo=user_repo,
         audit_repo=audit_repo,
         session_factory=app_session_scope,
+        patient_service=patient_service,
     )
     form100_v2_service = Form100ServiceV2(
         repo=form100_v2_repo,
@@ -104,13 +112,6 @@ def build_container() -> Container:
         audit_repo=audit_repo,
         session_factory=app_session_scope,
     )
-    patient_service = PatientService(
-        patient_repo=patient_repo,
-        session_factory=app_session_scope,
-        fts_manager=fts_manager,
-        user_repo=user_repo,
-        audit_repo=audit_repo,
-    )
     lab_service = LabService(
         lab_repo=lab_repo,
         ref_repo=ref_repo,
@@ -132,6 +133,7 @@ def build_container() -> Container:
         session_factory=app_session_scope,
         form100_v2_service=form100_v2_service,
         user_repo=user_repo,
+        patient_service=patient_service,
     )
     dashboard_service = DashboardService(session_factory=app_session_scope)
     reference_service = ReferenceService(
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+CHANGE_LOG_TABLE = "data_change_log"
+
+# Таблицы обмена и их первичные ключи. Для каждой строки в data_change_log хранится
+# номер последней правки (seq), по которому собираются дельта-пакеты обмена, и
+# признак удаления (deleted) — надгробие, которое дельта переносит на другую БД.
+TRACKED_TABLES: tuple[tuple[str, str], ...] = (
+    ("departments", "id"),
+    ("ref_icd10", "code"),
+    ("ref_microorganisms", "id"),
+    ("ref_antibiotic_groups", "id"),
+    ("ref_antibiotics", "id"),
+    ("ref_phages", "id"),
+    ("ref_material_types", "id"),
+    ("ref_ismp_abbreviations", "id"),
+    ("patients", "id"),
+    ("emr_case", "id"),
+    ("ismp_case", "id"),
+    ("emr_case_version", "id"),
+    ("emr_diagnosis", "id"),
+    ("emr_intervention", "id"),
+    ("emr_antibiotic_course", "id"),
+    ("lab_sample", "id"),
+    ("lab_microbe_isolation", "id"),
+    ("lab_abx_susceptibility", "id"),
+    ("lab_phage_panel_result", "id"),
+    ("sanitary_sample", "id"),
+    ("san_microbe_isolation", "id"),
+    ("san_abx_susceptibility", "id"),
+    ("san_phage_panel_result", "id"),
+    ("form100", "id"),
+    ("form100_data", "id"),
+)
+
+# Префикс имён триггеров учёта изменений; FtsManager не трогает такие триггеры.
+CHANGE_TRIGGER_PREFIX = "trg_change_"
+
+
+def change_trigger_ddl(table_name: str, pk_name: str) -> list[str]:
+    """DDL триггеров, отмечающих вставку, изменение и удаление строки новым номером правки."""
+    statements: list[str] = []
+    for suffix, event, row, deleted in (
+        ("ai", "INSERT", "NEW", 0),
+        ("au", "UPDATE", "NEW", 0),
+        ("ad", "DELETE", "OLD", 1),
+    ):
+        statements.append(
+            f"CREATE TRIGGER IF NOT EXISTS {CHANGE_TRIGGER_PREFIX}{table_name}_{suffix} "
+            f"AFTER {event} ON {table_name} BEGIN "
+            f"INSERT INTO {CHANGE_LOG_TABLE}(table_name, row_key, seq, deleted) "
+            f"VALUES ('{table_name}', CAST({row}.{pk_name} AS TEXT), "
+            f"(SELECT COALESCE(MAX(seq), 0) + 1 FROM {CHANGE_LOG_TABLE}), {deleted}) "
+            "ON CONFLICT(table_name, row_key) DO UPDATE SET seq = excluded.seq, deleted = excluded.deleted; "
+            "END"
+        )
+    return statements
+
+
+def install_change_triggers(connection: Connection) -> None:
+    """Создать недостающие триггеры учёта изменений для существующих таблиц."""
+    existing = set(
+        connection.execute(text("SELECT name FROM sqlite_master WHERE type='table'")).scalars()
+    )
+    if CHANGE_LOG_TABLE not in existing:
+        return
+    for table_name, pk_name in TRACKED_TABLES:
+        if table_name not in existing:
+            continue
+        for statement in change_trigger_ddl(table_name, pk_name):
+            connection.execute(text(statement))
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import sqlite3
 from collections.abc import Callable, Iterator
 from contextlib import contextmanager
 
@@ -8,6 +9,7 @@ from sqlalchemy import text
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
 
+from app.infrastructure.db.change_tracking import CHANGE_TRIGGER_PREFIX
 from app.infrastructure.db.session import session_scope
 
 _FTS_INTEGRITY_CHECK_SQL = {
@@ -16,8 +18,67 @@ _FTS_INTEGRITY_CHECK_SQL = {
         "INSERT INTO ref_microorganisms_fts(ref_microorganisms_fts) VALUES('integrity-check')"
     ),
     "ref_icd10_fts": text("INSERT INTO ref_icd10_fts(ref_icd10_fts) VALUES('integrity-check')"),
+    "lab_sample_fts": text("INSERT INTO lab_sample_fts(lab_sample_fts) VALUES('integrity-check')"),
+    "sanitary_sample_fts": text(
+        "INSERT INTO sanitary_sample_fts(sanitary_sample_fts) VALUES('integrity-check')"
+    ),
+    "emr_case_fts": text("INSERT INTO emr_case_fts(emr_case_fts) VALUES('integrity-check')"),
+    "form100_fts": text("INSERT INTO form100_fts(form100_fts) VALUES('integrity-check')"),
 }
 
+# Триграммные индексы: (FTS-таблица, исходная таблица, индексируемые колонки, колонка rowid).
+# Используется external content, поэтому сами значения хранятся только в исходной таблице.
+# У form100 строковый первичный ключ, поэтому индекс привязан к неявному rowid;
+# VACUUM может перенумеровать такие rowid — после него вызывается rebuild_rowid_keyed_fts.
+_TRIGRAM_INDEXES: tuple[tuple[str, str, tuple[str, ...], str], ...] = (
+    ("lab_sample_fts", "lab_sample", ("lab_no", "barcode"), "id"),
+    ("sanitary_sample_fts", "sanitary_sample", ("lab_no", "barcode"), "id"),
+    ("emr_case_fts", "emr_case", ("hospital_case_no",), "id"),
+    (
+        "form100_fts",
+        "form100",
+        ("main_full_name", "main_unit", "main_id_tag", "main_diagnosis"),
+        "rowid",
+    ),
+)
+
+# Значения строки пациента для patients_fts. unicode61 сам приводит кириллицу к нижнему
+# регистру, но «ё» не раскладывает даже с remove_diacritics — сводим её к «е» явно.
+_PATIENTS_FTS_COLUMNS = "full_name, dob, military_unit, military_district, patient_id"
+
+
+def rebuild_rowid_keyed_fts(conn: sqlite3.Connection) -> None:
+    """Перестроить триграммные индексы, привязанные к неявному rowid исходной таблицы.
+
+    VACUUM может перенумеровать rowid таблиц без INTEGER PRIMARY KEY, и такой
+    external content индекс молча расходится с таблицей — вызывается сразу после VACUUM.
+    """
+    for table_name, _source_table, _columns, rowid_column in _TRIGRAM_INDEXES:
+        if rowid_column != "rowid":
+            continue
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table_name,)
+        ).fetchone()
+        if exists is not None:
+            # SQL-injection safe: table_name берётся из _TRIGRAM_INDEXES, не из пользовательского ввода.
+            conn.execute(f"INSERT INTO {table_name}({table_name}) VALUES('rebuild')")
+
+
+def _patients_fts_values(prefix: str) -> str:
+    return (
+        f"replace(replace({prefix}full_name, 'ё', 'е'), 'Ё', 'Е'), {prefix}dob, "
+        f"{prefix}military_unit, {prefix}military_district, {prefix}id"
+    )
+
+
+def _fts_trigger_names(names: list[str]) -> list[str]:
+    # На тех же таблицах висят триггеры учёта изменений для обмена — их не удаляем.
+    return [name for name in names if not name.startswith(CHANGE_TRIGGER_PREFIX)]
+
+
+def _normalized_ddl(sql: str) -> str:
+    return " ".join(sql.replace("IF NOT EXISTS ", "").strip().rstrip(";").split())
+
 
 class FtsManager:
     def __init__(self, session_factory: Callable = session_scope) -> None:
@@ -39,7 +100,8 @@ class FtsManager:
                 ok_patients = self._ensure_patients(db)
                 ok_micro = self._ensure_microorganisms(db)
                 ok_icd10 = self._ensure_icd10(db)
-                ok = ok_patients and ok_micro and ok_icd10
+                ok_trigram = self._ensure_trigram_indexes(db)
+                ok = ok_patients and ok_micro and ok_icd10 and ok_trigram
                 self.logger.debug("[FTS] ensure_all done: %s", ok)
                 return ok
         except Exception:  # noqa: BLE001
@@ -70,7 +132,7 @@ class FtsManager:
                     {"pattern": "%patients_fts%"},
                 ).scalars()
             )
-            for name in trigger_names:
+            for name in _fts_trigger_names(trigger_names):
                 # SQL-injection safe: идентификатор контролируется программно, не пользовательский ввод.
                 db.execute(text(f'DROP TRIGGER IF EXISTS "{name}"'))
             for table_name in (
@@ -109,10 +171,20 @@ class FtsManager:
                 {"tbl": table_name},
             ).scalars()
         )
-        for name in trigger_names:
+        for name in _fts_trigger_names(trigger_names):
             # SQL-injection safe: идентификатор контролируется программно, не пользовательский ввод.
             session.execute(text(f'DROP TRIGGER IF EXISTS "{name}"'))
 
+    def _fts_definition_outdated(self, session: Session, table_name: str, ddl: str) -> bool:
+        current = session.execute(
+            text("SELECT sql FROM sqlite_master WHERE type='table' AND name=:name"),
+            {"name": table_name},
+        ).scalar()
+        if current is None or not str(current).lstrip().upper().startswith("CREATE VIRTUAL TABLE"):
+            # Обычные таблицы-заглушки обрабатывает проверка целостности.
+            return False
+        return _normalized_ddl(str(current)) != _normalized_ddl(ddl)
+
     def _integrity_failed(self, session: Session, table_name: str) -> bool:
         try:
             statement = _FTS_INTEGRITY_CHECK_SQL.get(table_name)
@@ -133,6 +205,12 @@ class FtsManager:
         unavailable_cleanup: Callable[[Session], None],
     ) -> tuple[bool, bool]:
         exists = self._fts_exists(session, table_name)
+        if exists and self._fts_definition_outdated(session, table_name, ddl):
+            # Состав колонок или токенизатор изменились — пересоздаём таблицу.
+            self.logger.info("[FTS] %s definition changed, recreating", table_name)
+            # SQL-injection safe: table_name берётся из внутреннего whitelist, не из пользовательского ввода.
+            session.execute(text(f"DROP TABLE IF EXISTS {table_name}"))
+            exists = False
         rebuild = not exists
         try:
             session.execute(text(ddl))
@@ -159,7 +237,8 @@ class FtsManager:
             table_name="patients_fts",
             ddl=(
                 "CREATE VIRTUAL TABLE IF NOT EXISTS patients_fts "
-                "USING fts5(full_name, patient_id UNINDEXED);"
+                "USING fts5(full_name, dob, military_unit, military_district, "
+                "patient_id UNINDEXED, tokenize='unicode61 remove_diacritics 2');"
             ),
             source_table="patients",
             unavailable_cleanup=lambda s: self._drop_triggers_for_table(s, "patients"),
@@ -174,10 +253,10 @@ class FtsManager:
         )
         session.execute(
             text(
-                """
+                f"""
                 CREATE TRIGGER patients_ai AFTER INSERT ON patients BEGIN
-                    INSERT INTO patients_fts(rowid, full_name, patient_id)
-                    VALUES (new.id, new.full_name, new.id);
+                    INSERT INTO patients_fts(rowid, {_PATIENTS_FTS_COLUMNS})
+                    VALUES (new.id, {_patients_fts_values("new.")});
                 END;
                 """
             )
@@ -193,17 +272,25 @@ class FtsManager:
         )
         session.execute(
             text(
-                """
+                f"""
                 CREATE TRIGGER patients_au AFTER UPDATE ON patients BEGIN
                     DELETE FROM patients_fts WHERE rowid = old.id;
-                    INSERT INTO patients_fts(rowid, full_name, patient_id)
-                    VALUES (new.id, new.full_name, new.id);
+                    INSERT INTO patients_fts(rowid, {_PATIENTS_FTS_COLUMNS})
+                    VALUES (new.id, {_patients_fts_values("new.")});
                 END;
                 """
             )
         )
         if rebuild:
-            session.execute(text("INSERT INTO patients_fts(patients_fts) VALUES('rebuild')"))
+            # patients_fts хранит собственную копию значений, поэтому 'rebuild' не подтянет
+            # пациентов, появившихся до создания таблицы, — заполняем её из patients явно.
+            session.execute(text("DELETE FROM patients_fts"))
+            session.execute(
+                text(
+                    f"INSERT INTO patients_fts(rowid, {_PATIENTS_FTS_COLUMNS}) "
+                    f"SELECT id, {_patients_fts_values('')} FROM patients"
+                )
+            )
         return True
 
     def _ensure_microorganisms(self, session: Session) -> bool:
@@ -314,6 +401,88 @@ class FtsManager:
             session.execute(text("INSERT INTO ref_icd10_fts(ref_icd10_fts) VALUES('rebuild')"))
         return True
 
+    def _ensure_trigram_indexes(self, session: Session) -> bool:
+        ok = True
+        for table_name, source_table, columns, rowid_column in _TRIGRAM_INDEXES:
+            ok = self._ensure_trigram_index(
+                session,
+                table_name=table_name,
+                source_table=source_table,
+                columns=columns,
+                rowid_column=rowid_column,
+            ) and ok
+        return ok
+
+    def _ensure_trigram_index(
+        self,
+        session: Session,
+        *,
+        table_name: str,
+        source_table: str,
+        columns: tuple[str, ...],
+        rowid_column: str,
+    ) -> bool:
+        # SQL-injection safe: имена таблиц и колонок берутся из _TRIGRAM_INDEXES, не из пользовательского ввода.
+        column_list = ", ".join(columns)
+        new_values = ", ".join(f"new.{column}" for column in columns)
+        old_values = ", ".join(f"old.{column}" for column in columns)
+        available, rebuild = self._ensure_fts_table(
+            session,
+            table_name=table_name,
+            ddl=(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {table_name} "
+                f"USING fts5({column_list}, content='{source_table}', "
+                f"content_rowid='{rowid_column}', tokenize='trigram');"
+            ),
+            source_table=source_table,
+            unavailable_cleanup=lambda s: self._drop_triggers_for_table(s, source_table),
+        )
+        if not available:
+            return True
+        self._drop_known_triggers(
+            session,
+            f"{source_table}_ai",
+            f"{source_table}_ad",
+            f"{source_table}_au",
+        )
+        session.execute(
+            text(
+                f"""
+                CREATE TRIGGER {source_table}_ai AFTER INSERT ON {source_table} BEGIN
+                    INSERT INTO {table_name}(rowid, {column_list})
+                    VALUES (new.{rowid_column}, {new_values});
+                END;
+                """
+            )
+        )
+        session.execute(
+            text(
+                f"""
+                CREATE TRIGGER {source_table}_ad AFTER DELETE ON {source_table} BEGIN
+                    INSERT INTO {table_name}({table_name}, rowid, {column_list})
+                    VALUES ('delete', old.{rowid_column}, {old_values});
+                END;
+                """
+            )
+        )
+        # Триггер реагирует только на изменение индексируемых колонок: например,
+        # запись результатов посева не должна переписывать триграммный индекс.
+        session.execute(
+            text(
+                f"""
+                CREATE TRIGGER {source_table}_au AFTER UPDATE OF {column_list} ON {source_table} BEGIN
+                    INSERT INTO {table_name}({table_name}, rowid, {column_list})
+                    VALUES ('delete', old.{rowid_column}, {old_values});
+                    INSERT INTO {table_name}(rowid, {column_list})
+                    VALUES (new.{rowid_column}, {new_values});
+                END;
+                """
+            )
+        )
+        if rebuild:
+            session.execute(text(f"INSERT INTO {table_name}({table_name}) VALUES('rebuild')"))
+        return True
+
     def _drop_known_triggers(self, session: Session, *names: str) -> None:
         for name in names:
             # SQL-injection safe: name задаётся в коде как константа, не пользовательский ввод.
@@ -321,4 +490,6 @@ class FtsManager:
 
     def _is_fts_unavailable(self, exc: OperationalError) -> bool:
         text_value = str(exc).lower()
+        if "no such tokenizer" in text_value:
+            return True
         return "fts5" in text_value and "no such module" in text_value
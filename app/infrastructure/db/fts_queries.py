@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Триграммный токенизатор FTS5 не умеет искать подстроки короче трёх символов.
+TRIGRAM_MIN_LENGTH = 3
+
+
+def trigram_phrase(value: str | None) -> str | None:
+    """Собрать MATCH-выражение для поиска подстроки по триграммному индексу.
+
+    Возвращает ``None``, если строка слишком короткая для триграмм —
+    в этом случае вызывающий код должен использовать обычный LIKE.
+    """
+    clean = (value or "").strip()
+    if len(clean) < TRIGRAM_MIN_LENGTH:
+        return None
+    return '"' + clean.replace('"', '""') + '"'
+
+
+def is_fts_table(session: Session, table_name: str) -> bool:
+    """Проверить, что таблица существует и является виртуальной FTS5-таблицей."""
+    row = session.execute(
+        text("SELECT sql FROM sqlite_master WHERE type='table' AND name=:name"),
+        {"name": table_name},
+    ).first()
+    if row is None or row[0] is None:
+        return False
+    return str(row[0]).lstrip().upper().startswith("CREATE VIRTUAL TABLE")
@@ -0,0 +1,24 @@
+"""Add Form100 keyset pagination index.
+
+Revision ID: 0022_form100_keyset_index
+Revises: 0021_form100_artifacts
+Create Date: 2026-10-19
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0022_form100_keyset_index"
+down_revision = "0021_form100_artifacts"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_form100_updated_at_id", "form100", ["updated_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_form100_updated_at_id", table_name="form100")
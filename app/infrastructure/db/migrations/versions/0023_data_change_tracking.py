@@ -0,0 +1,87 @@
+"""Track row changes for delta exchange packages.
+
+Revision ID: 0023_data_change_tracking
+Revises: 0022_form100_keyset_index
+Create Date: 2026-10-19
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0023_data_change_tracking"
+down_revision = "0022_form100_keyset_index"
+branch_labels = None
+depends_on = None
+
+_TRACKED_TABLES: tuple[tuple[str, str], ...] = (
+    ("departments", "id"),
+    ("ref_icd10", "code"),
+    ("ref_microorganisms", "id"),
+    ("ref_antibiotic_groups", "id"),
+    ("ref_antibiotics", "id"),
+    ("ref_phages", "id"),
+    ("ref_material_types", "id"),
+    ("ref_ismp_abbreviations", "id"),
+    ("patients", "id"),
+    ("emr_case", "id"),
+    ("ismp_case", "id"),
+    ("emr_case_version", "id"),
+    ("emr_diagnosis", "id"),
+    ("emr_intervention", "id"),
+    ("emr_antibiotic_course", "id"),
+    ("lab_sample", "id"),
+    ("lab_microbe_isolation", "id"),
+    ("lab_abx_susceptibility", "id"),
+    ("lab_phage_panel_result", "id"),
+    ("sanitary_sample", "id"),
+    ("san_microbe_isolation", "id"),
+    ("san_abx_susceptibility", "id"),
+    ("san_phage_panel_result", "id"),
+    ("form100", "id"),
+    ("form100_data", "id"),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "data_change_log",
+        sa.Column("table_name", sa.String(), nullable=False),
+        sa.Column("row_key", sa.String(), nullable=False),
+        sa.Column("seq", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("table_name", "row_key", name="pk_data_change_log"),
+    )
+    op.create_index("ix_data_change_log_seq", "data_change_log", ["seq"], unique=True)
+    op.create_index("ix_data_change_log_table_name_seq", "data_change_log", ["table_name", "seq"])
+
+    with op.batch_alter_table("data_exchange_package", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("change_seq", sa.Integer(), nullable=True))
+
+    for table_name, pk_name in _TRACKED_TABLES:
+        for suffix, event in (("ai", "INSERT"), ("au", "UPDATE")):
+            op.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS trg_change_{table_name}_{suffix}
+                AFTER {event} ON {table_name} BEGIN
+                    INSERT INTO data_change_log(table_name, row_key, seq)
+                    VALUES ('{table_name}', CAST(NEW.{pk_name} AS TEXT),
+                            (SELECT COALESCE(MAX(seq), 0) + 1 FROM data_change_log))
+                    ON CONFLICT(table_name, row_key) DO UPDATE SET seq = excluded.seq;
+                END;
+                """
+            )
+
+
+def downgrade() -> None:
+    for table_name, _pk_name in _TRACKED_TABLES:
+        for suffix in ("ai", "au"):
+            op.execute(f"DROP TRIGGER IF EXISTS trg_change_{table_name}_{suffix}")
+
+    with op.batch_alter_table("data_exchange_package", schema=None) as batch_op:
+        batch_op.drop_column("change_seq")
+
+    op.drop_index("ix_data_change_log_table_name_seq", table_name="data_change_log")
+    op.drop_index("ix_data_change_log_seq", table_name="data_change_log")
+    op.drop_table("data_change_log")
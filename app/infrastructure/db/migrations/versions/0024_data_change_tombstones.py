@@ -0,0 +1,96 @@
+"""Record row deletions in the change log for delta exchange packages.
+
+Revision ID: 0024_data_change_tombstones
+Revises: 0023_data_change_tracking
+Create Date: 2026-10-19
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0024_data_change_tombstones"
+down_revision = "0023_data_change_tracking"
+branch_labels = None
+depends_on = None
+
+_TRACKED_TABLES: tuple[tuple[str, str], ...] = (
+    ("departments", "id"),
+    ("ref_icd10", "code"),
+    ("ref_microorganisms", "id"),
+    ("ref_antibiotic_groups", "id"),
+    ("ref_antibiotics", "id"),
+    ("ref_phages", "id"),
+    ("ref_material_types", "id"),
+    ("ref_ismp_abbreviations", "id"),
+    ("patients", "id"),
+    ("emr_case", "id"),
+    ("ismp_case", "id"),
+    ("emr_case_version", "id"),
+    ("emr_diagnosis", "id"),
+    ("emr_intervention", "id"),
+    ("emr_antibiotic_course", "id"),
+    ("lab_sample", "id"),
+    ("lab_microbe_isolation", "id"),
+    ("lab_abx_susceptibility", "id"),
+    ("lab_phage_panel_result", "id"),
+    ("sanitary_sample", "id"),
+    ("san_microbe_isolation", "id"),
+    ("san_abx_susceptibility", "id"),
+    ("san_phage_panel_result", "id"),
+    ("form100", "id"),
+    ("form100_data", "id"),
+)
+
+
+def _create_trigger(table_name: str, pk_name: str, suffix: str, event: str, row: str, deleted: int) -> None:
+    op.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_change_{table_name}_{suffix}
+        AFTER {event} ON {table_name} BEGIN
+            INSERT INTO data_change_log(table_name, row_key, seq, deleted)
+            VALUES ('{table_name}', CAST({row}.{pk_name} AS TEXT),
+                    (SELECT COALESCE(MAX(seq), 0) + 1 FROM data_change_log), {deleted})
+            ON CONFLICT(table_name, row_key) DO UPDATE SET seq = excluded.seq, deleted = excluded.deleted;
+        END;
+        """
+    )
+
+
+def upgrade() -> None:
+    op.add_column(
+        "data_change_log",
+        sa.Column("deleted", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+    for table_name, pk_name in _TRACKED_TABLES:
+        # Повторная вставка удалённой строки должна снимать признак удаления.
+        for suffix in ("ai", "au"):
+            op.execute(f"DROP TRIGGER IF EXISTS trg_change_{table_name}_{suffix}")
+        _create_trigger(table_name, pk_name, "ai", "INSERT", "NEW", 0)
+        _create_trigger(table_name, pk_name, "au", "UPDATE", "NEW", 0)
+        _create_trigger(table_name, pk_name, "ad", "DELETE", "OLD", 1)
+
+
+def downgrade() -> None:
+    # Триггеры ссылаются на data_change_log — снимаем их до пересоздания таблицы.
+    for table_name, _pk_name in _TRACKED_TABLES:
+        for suffix in ("ai", "au", "ad"):
+            op.execute(f"DROP TRIGGER IF EXISTS trg_change_{table_name}_{suffix}")
+    op.execute("DELETE FROM data_change_log WHERE deleted")
+    with op.batch_alter_table("data_change_log", schema=None) as batch_op:
+        batch_op.drop_column("deleted")
+    for table_name, pk_name in _TRACKED_TABLES:
+        for suffix, event in (("ai", "INSERT"), ("au", "UPDATE")):
+            op.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS trg_change_{table_name}_{suffix}
+                AFTER {event} ON {table_name} BEGIN
+                    INSERT INTO data_change_log(table_name, row_key, seq)
+                    VALUES ('{table_name}', CAST(NEW.{pk_name} AS TEXT),
+                            (SELECT COALESCE(MAX(seq), 0) + 1 FROM data_change_log))
+                    ON CONFLICT(table_name, row_key) DO UPDATE SET seq = excluded.seq;
+                END;
+                """
+            )
@@ -16,10 +16,13 @@ from sqlalchemy import (
     Table,
     Text,
     UniqueConstraint,
+    event,
 )
 from sqlalchemy.orm import DeclarativeBase, relationship
 from sqlalchemy.sql import expression
 
+from app.infrastructure.db.change_tracking import install_change_triggers
+
 naming_convention = {
     "ix": "ix_%(column_0_label)s",
     "uq": "uq_%(table_name)s_%(column_0_name)s",
@@ -39,6 +42,9 @@ PatientsFts = Table(
     "patients_fts",
     metadata,
     Column("full_name", Text),
+    Column("dob", Text),
+    Column("military_unit", Text),
+    Column("military_district", Text),
     Column("patient_id", Integer),
 )
 
@@ -361,6 +367,10 @@ class SanitarySample(Base):
     created_at = Column(DateTime, nullable=False, default=utc_now)
     created_by = Column(Integer, ForeignKey("users.id"))
 
+    __table_args__ = (
+        Index("ix_sanitary_sample_department_id_taken_at", "department_id", "taken_at"),
+    )
+
 
 class SanitaryNumberSequence(Base):
     __tablename__ = "sanitary_number_sequence"
@@ -576,6 +586,7 @@ class Form100V2(Base):
         Index("ix_form100_status", "status"),
         Index("ix_form100_main_full_name", "main_full_name"),
         Index("ix_form100_main_unit", "main_unit"),
+        Index("ix_form100_updated_at_id", "updated_at", "id"),
     )
 
 
@@ -635,12 +646,33 @@ class DataExchangePackage(Base):
     file_path = Column(String, nullable=False)
     sha256 = Column(String, nullable=False)
     notes = Column(Text)
+    # Номер правки data_change_log на момент выгрузки — база для следующей дельты.
+    change_seq = Column(Integer)
 
     __table_args__ = (
         Index("ix_data_exchange_package_direction_created_at", "direction", "created_at"),
     )
 
 
+class DataChangeLog(Base):
+    """Номер последней правки каждой строки таблиц обмена; ведётся триггерами БД.
+
+    ``deleted`` отмечает удалённую строку (надгробие для дельта-пакетов).
+    """
+
+    __tablename__ = "data_change_log"
+
+    table_name = Column(String, primary_key=True)
+    row_key = Column(String, primary_key=True)
+    seq = Column(Integer, nullable=False)
+    deleted = Column(Boolean, nullable=False, server_default=expression.false())
+
+    __table_args__ = (
+        Index("ix_data_change_log_seq", "seq", unique=True),
+        Index("ix_data_change_log_table_name_seq", "table_name", "seq"),
+    )
+
+
 class ReportRun(Base):
     __tablename__ = "report_run"
 
@@ -673,3 +705,8 @@ class SavedFilter(Base):
         UniqueConstraint("filter_type", "name", name="uq_saved_filters_type_name"),
         Index("ix_saved_filters_type_created_at", "filter_type", "created_at"),
     )
+
+
+@event.listens_for(metadata, "after_create")
+def _create_change_triggers(_target, connection, **_kw) -> None:
+    install_change_triggers(connection)
@@ -2,9 +2,10 @@ from __future__ import annotations
 
 from datetime import date, datetime, timedelta
 
-from sqlalchemy import case, func, or_, select
+from sqlalchemy import case, func, or_, select, text
 from sqlalchemy.orm import Session
 
+from app.infrastructure.db.fts_queries import is_fts_table, trigram_phrase
 from app.infrastructure.db.models_sqlalchemy import (
     Department,
     EmrCase,
@@ -48,6 +49,7 @@ class AnalyticsRepository:
         patient_name: str | None,
         lab_no: str | None,
         search_text: str | None,
+        lab_no_fts: bool = False,
     ):
         stmt = (
             select(LabSample.id.label("sample_id"))
@@ -71,7 +73,14 @@ class AnalyticsRepository:
         if patient_name:
             stmt = stmt.where(Patient.full_name.ilike(f"%{patient_name}%"))
         if lab_no:
-            stmt = stmt.where(LabSample.lab_no.ilike(f"%{lab_no}%"))
+            phrase = trigram_phrase(lab_no) if lab_no_fts else None
+            if phrase is not None:
+                matched_ids = text(
+                    "SELECT rowid FROM lab_sample_fts WHERE lab_sample_fts MATCH :lab_no_q"
+                ).bindparams(lab_no_q=f"lab_no : {phrase}")
+                stmt = stmt.where(LabSample.id.in_(matched_ids))
+            else:
+                stmt = stmt.where(LabSample.lab_no.ilike(f"%{lab_no}%"))
 
         if microorganism_id:
             micro_match = (
@@ -363,6 +372,7 @@ class AnalyticsRepository:
             patient_name=patient_name,
             lab_no=lab_no,
             search_text=search_text,
+            lab_no_fts=bool(lab_no) and is_fts_table(session, "lab_sample_fts"),
         )
         micro_label = (
             select(func.coalesce(RefMicroorganism.code, "-") + " - " + RefMicroorganism.name)
@@ -440,6 +450,7 @@ class AnalyticsRepository:
             patient_name=patient_name,
             lab_no=lab_no,
             search_text=search_text,
+            lab_no_fts=bool(lab_no) and is_fts_table(session, "lab_sample_fts"),
         )
 
         counts_stmt = (
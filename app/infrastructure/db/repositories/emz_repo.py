@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+from collections import defaultdict
 from collections.abc import Iterable
 from datetime import UTC, datetime
 
-from sqlalchemy import select, update
+from sqlalchemy import select, text, update
 from sqlalchemy.orm import Session
 
+from app.infrastructure.db.fts_queries import is_fts_table, trigram_phrase
 from app.infrastructure.db.models_sqlalchemy import (
     EmrAntibioticCourse,
     EmrCase,
@@ -14,6 +16,7 @@ from app.infrastructure.db.models_sqlalchemy import (
     EmrIntervention,
     IsmpCase,
     LabSample,
+    Patient,
 )
 
 
@@ -126,17 +129,99 @@ class EmzRepository:
         ismp = self.list_ismp(session, emr_case_id)
         return case, version, diagnoses, interventions, abx, ismp
 
+    def fetch_case_details_by_patient(
+        self, session: Session, patient_id: int
+    ) -> list[
+        tuple[
+            EmrCase,
+            EmrCaseVersion,
+            Patient | None,
+            list[EmrDiagnosis],
+            list[EmrIntervention],
+            list[EmrAntibioticCourse],
+            list[IsmpCase],
+        ]
+    ]:
+        """Все госпитализации пациента с текущими версиями и вложенными записями.
+
+        Вместо ``fetch_case_detail`` на каждую госпитализацию выполняется
+        фиксированное число запросов: случаи с версией и пациентом, затем по
+        одному IN-запросу на диагнозы, вмешательства, курсы АБ и ИСМП.
+        Госпитализации без текущей версии пропускаются, как в ``list_cases_by_patient``.
+        """
+        stmt = (
+            select(EmrCase, EmrCaseVersion, Patient)
+            .join(
+                EmrCaseVersion,
+                (EmrCaseVersion.emr_case_id == EmrCase.id) & (EmrCaseVersion.is_current == True),  # noqa: E712
+            )
+            .outerjoin(Patient, Patient.id == EmrCase.patient_id)
+            .where(EmrCase.patient_id == patient_id)
+            .order_by(EmrCase.created_at.desc())
+        )
+        rows = session.execute(stmt).all()
+        if not rows:
+            return []
+        version_ids = [row[1].id for row in rows]
+        case_ids = [row[0].id for row in rows]
+
+        diagnoses: dict[int, list[EmrDiagnosis]] = defaultdict(list)
+        for diagnosis in session.execute(
+            select(EmrDiagnosis)
+            .where(EmrDiagnosis.emr_case_version_id.in_(version_ids))
+            .order_by(EmrDiagnosis.id)
+        ).scalars():
+            diagnoses[diagnosis.emr_case_version_id].append(diagnosis)
+        interventions: dict[int, list[EmrIntervention]] = defaultdict(list)
+        for intervention in session.execute(
+            select(EmrIntervention)
+            .where(EmrIntervention.emr_case_version_id.in_(version_ids))
+            .order_by(EmrIntervention.id)
+        ).scalars():
+            interventions[intervention.emr_case_version_id].append(intervention)
+        courses: dict[int, list[EmrAntibioticCourse]] = defaultdict(list)
+        for course in session.execute(
+            select(EmrAntibioticCourse)
+            .where(EmrAntibioticCourse.emr_case_version_id.in_(version_ids))
+            .order_by(EmrAntibioticCourse.id)
+        ).scalars():
+            courses[course.emr_case_version_id].append(course)
+        ismp: dict[int, list[IsmpCase]] = defaultdict(list)
+        for ismp_case in session.execute(
+            select(IsmpCase)
+            .where(IsmpCase.emr_case_id.in_(case_ids))
+            .order_by(IsmpCase.start_date.asc(), IsmpCase.id)
+        ).scalars():
+            ismp[ismp_case.emr_case_id].append(ismp_case)
+
+        return [
+            (
+                case,
+                version,
+                patient,
+                diagnoses[version.id],
+                interventions[version.id],
+                courses[version.id],
+                ismp[case.id],
+            )
+            for case, version, patient in rows
+        ]
+
     def list_cases_by_patient(self, session: Session, patient_id: int) -> list[EmrCase]:
         stmt = select(EmrCase).where(EmrCase.patient_id == patient_id).order_by(EmrCase.created_at.desc())
         return list(session.execute(stmt).scalars())
 
     def search_cases_by_case_no(self, session: Session, query: str, limit: int = 10) -> list[EmrCase]:
-        stmt = (
-            select(EmrCase)
-            .where(EmrCase.hospital_case_no.ilike(f"%{query}%"))
-            .order_by(EmrCase.created_at.desc())
-            .limit(limit)
-        )
+        stmt = select(EmrCase)
+        phrase = trigram_phrase(query)
+        if phrase is not None and is_fts_table(session, "emr_case_fts"):
+            matched_ids = text("SELECT rowid FROM emr_case_fts WHERE emr_case_fts MATCH :q").bindparams(
+                q=phrase
+            )
+            stmt = stmt.where(EmrCase.id.in_(matched_ids))
+        else:
+            stmt = stmt.where(EmrCase.hospital_case_no.ilike(f"%{query}%"))
+        stmt = stmt.order_by(EmrCase.created_at.desc()).limit(limit)
         return list(session.execute(stmt).scalars())
 
     def delete_case(self, session: Session, emr_case_id: int) -> bool:
@@ -5,10 +5,11 @@ from datetime import UTC, date, datetime
 from typing import Any, cast
 from uuid import uuid4
 
-from sqlalchemy import select
+from sqlalchemy import select, text, tuple_
 from sqlalchemy.orm import Session
 
 from app.infrastructure.db import models_sqlalchemy as models
+from app.infrastructure.db.fts_queries import is_fts_table, trigram_phrase
 
 _DATA_JSON_FIELD_MAP = {
     "stub": "stub_json",
@@ -92,7 +93,13 @@ class Form100RepositoryV2:
         filters: dict[str, object] | None = None,
         limit: int = 100,
         offset: int = 0,
+        after: tuple[datetime, str] | None = None,
     ) -> list[models.Form100V2]:
+        """Список карточек в порядке ``(updated_at, id)`` по убыванию.
+
+        ``after`` — ключ последней карточки предыдущей страницы (keyset-пагинация);
+        в отличие от ``offset`` стоимость запроса не растёт с номером страницы.
+        """
         filters = filters or {}
         stmt = select(models.Form100V2)
 
@@ -105,13 +112,22 @@ class Form100RepositoryV2:
 
         query_text = str(filters.get("query") or "").strip()
         if query_text:
-            like = f"%{query_text}%"
-            stmt = stmt.where(
-                models.Form100V2.main_full_name.ilike(like)
-                | models.Form100V2.main_unit.ilike(like)
-                | models.Form100V2.main_id_tag.ilike(like)
-                | models.Form100V2.main_diagnosis.ilike(like)
-            )
+            phrase = trigram_phrase(query_text)
+            if phrase is not None and is_fts_table(session, "form100_fts"):
+                matched_ids = text(
+                    "SELECT form100.id FROM form100_fts "
+                    "JOIN form100 ON form100.rowid = form100_fts.rowid "
+                    "WHERE form100_fts MATCH :query_q"
+                ).bindparams(query_q=phrase)
+                stmt = stmt.where(models.Form100V2.id.in_(matched_ids))
+            else:
+                like = f"%{query_text}%"
+                stmt = stmt.where(
+                    models.Form100V2.main_full_name.ilike(like)
+                    | models.Form100V2.main_unit.ilike(like)
+                    | models.Form100V2.main_id_tag.ilike(like)
+                    | models.Form100V2.main_diagnosis.ilike(like)
+                )
 
         status = filters.get("status")
         if status:
@@ -136,8 +152,17 @@ class Form100RepositoryV2:
         if isinstance(created_to, date):
             stmt = stmt.where(models.Form100V2.created_at <= datetime.combine(created_to, datetime.max.time()))
 
-        stmt = stmt.order_by(models.Form100V2.updated_at.desc()).offset(offset).limit(limit)
-        return list(session.execute(stmt).scalars())
+        if after is not None:
+            after_updated_at, after_id = after
+            stmt = stmt.where(
+                tuple_(models.Form100V2.updated_at, models.Form100V2.id)
+                < tuple_(_normalize_datetime(after_updated_at), after_id)
+            )
+
+        stmt = stmt.order_by(models.Form100V2.updated_at.desc(), models.Form100V2.id.desc())
+        if offset:
+            stmt = stmt.offset(offset)
+        return list(session.execute(stmt.limit(limit)).scalars())
 
     def get_card(self, session: Session, card_id: str) -> models.Form100V2 | None:
         return session.get(models.Form100V2, card_id)
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 from collections.abc import Iterable
-from datetime import date, datetime
+from datetime import date, datetime, time, timedelta
 from typing import Any, cast
 
-from sqlalchemy import select, update
+from sqlalchemy import ColumnElement, case, func, insert, or_, select, text, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
+from app.infrastructure.db.fts_queries import is_fts_table, trigram_phrase
 from app.infrastructure.db.models_sqlalchemy import (
     LabAbxSusceptibility,
     LabMicrobeIsolation,
@@ -28,21 +30,178 @@ class LabRepository:
         stmt = stmt.order_by(LabSample.created_at.desc())
         return list(session.execute(stmt).scalars())
 
+    def _patient_sample_conditions(
+        self,
+        patient_id: int,
+        *,
+        emr_case_id: int | None = None,
+        lab_no: str | None = None,
+        growth_flag: int | None = None,
+        material_type_id: int | None = None,
+        taken_from: date | None = None,
+        taken_to: date | None = None,
+    ) -> list[ColumnElement[bool]]:
+        conditions: list[ColumnElement[bool]] = [LabSample.patient_id == patient_id]
+        if emr_case_id is not None:
+            conditions.append(LabSample.emr_case_id == emr_case_id)
+        if lab_no:
+            conditions.append(LabSample.lab_no.ilike(f"%{lab_no}%"))
+        if growth_flag is not None:
+            conditions.append(LabSample.growth_flag == growth_flag)
+        if material_type_id is not None:
+            conditions.append(LabSample.material_type_id == material_type_id)
+        if taken_from is not None:
+            conditions.append(LabSample.taken_at >= datetime.combine(taken_from, time.min))
+        if taken_to is not None:
+            conditions.append(
+                LabSample.taken_at < datetime.combine(taken_to + timedelta(days=1), time.min)
+            )
+        return conditions
+
+    def list_by_patient_with_first_isolation(
+        self,
+        session: Session,
+        patient_id: int,
+        *,
+        emr_case_id: int | None = None,
+        lab_no: str | None = None,
+        growth_flag: int | None = None,
+        material_type_id: int | None = None,
+        taken_from: date | None = None,
+        taken_to: date | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[tuple[LabSample, int | None, str | None]]:
+        """Пробы пациента вместе с первой выделенной культурой — одним запросом.
+
+        Первая культура — изолят с минимальным id (как и ``get_isolation(...)[0]``).
+        Сортировка: сначала пробы без даты взятия, затем по дате взятия по убыванию.
+        """
+        first_isolation_id = (
+            select(func.min(LabMicrobeIsolation.id))
+            .where(LabMicrobeIsolation.lab_sample_id == LabSample.id)
+            .correlate(LabSample)
+            .scalar_subquery()
+        )
+        stmt = (
+            select(
+                LabSample,
+                LabMicrobeIsolation.microorganism_id,
+                LabMicrobeIsolation.microorganism_free,
+            )
+            .outerjoin(LabMicrobeIsolation, LabMicrobeIsolation.id == first_isolation_id)
+            .where(
+                *self._patient_sample_conditions(
+                    patient_id,
+                    emr_case_id=emr_case_id,
+                    lab_no=lab_no,
+                    growth_flag=growth_flag,
+                    material_type_id=material_type_id,
+                    taken_from=taken_from,
+                    taken_to=taken_to,
+                )
+            )
+            .order_by(
+                LabSample.taken_at.is_(None).desc(),
+                LabSample.taken_at.desc(),
+                LabSample.id.desc(),
+            )
+        )
+        if offset:
+            stmt = stmt.offset(offset)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return [
+            (row[0], cast(int | None, row[1]), cast(str | None, row[2]))
+            for row in session.execute(stmt).all()
+        ]
+
+    def count_by_patient(
+        self,
+        session: Session,
+        patient_id: int,
+        *,
+        emr_case_id: int | None = None,
+        lab_no: str | None = None,
+        growth_flag: int | None = None,
+        material_type_id: int | None = None,
+        taken_from: date | None = None,
+        taken_to: date | None = None,
+    ) -> int:
+        stmt = select(func.count(LabSample.id)).where(
+            *self._patient_sample_conditions(
+                patient_id,
+                emr_case_id=emr_case_id,
+                lab_no=lab_no,
+                growth_flag=growth_flag,
+                material_type_id=material_type_id,
+                taken_from=taken_from,
+                taken_to=taken_to,
+            )
+        )
+        return int(session.execute(stmt).scalar_one())
+
+    def growth_summary_by_patient(
+        self,
+        session: Session,
+        patient_id: int,
+        emr_case_id: int | None = None,
+    ) -> dict[str, int]:
+        stmt = select(
+            func.count(LabSample.id),
+            func.sum(case((LabSample.growth_flag == 1, 1), else_=0)),
+            func.sum(case((LabSample.growth_flag == 0, 1), else_=0)),
+            func.sum(case((LabSample.growth_flag.is_(None), 1), else_=0)),
+        ).where(*self._patient_sample_conditions(patient_id, emr_case_id=emr_case_id))
+        total, positive, negative, pending = session.execute(stmt).one()
+        return {
+            "total": int(total or 0),
+            "positive": int(positive or 0),
+            "negative": int(negative or 0),
+            "pending": int(pending or 0),
+        }
+
     def next_lab_number(self, session: Session, seq_date: date, material_type_id: int) -> int:
-        stmt = select(LabNumberSequence).where(
-            LabNumberSequence.seq_date == seq_date,
-            LabNumberSequence.material_type_id == material_type_id,
+        return self.reserve_lab_numbers(session, seq_date, material_type_id, 1)[0]
+
+    def reserve_lab_numbers(
+        self, session: Session, seq_date: date, material_type_id: int, count: int
+    ) -> range:
+        """Атомарно зарезервировать ``count`` подряд идущих номеров за день и тип материала.
+
+        Один оператор ``INSERT ... ON CONFLICT DO UPDATE ... RETURNING``: строка
+        счётчика создаётся или увеличивается на ``count`` без предварительного
+        SELECT, поэтому параллельные регистрации не получат одинаковых номеров,
+        а блокировка строки держится только на время одной записи.
+        """
+        if count < 1:
+            raise ValueError("Количество резервируемых номеров должно быть положительным")
+        insert_stmt = sqlite_insert(LabNumberSequence).values(
+            seq_date=seq_date, material_type_id=material_type_id, last_number=count
         )
-        seq = session.execute(stmt).scalar_one_or_none()
-        if seq is None:
-            seq = LabNumberSequence(seq_date=seq_date, material_type_id=material_type_id, last_number=1)
-            session.add(seq)
-            session.flush()
-            return cast(int, cast(Any, seq).last_number)
-        seq_obj = cast(Any, seq)
-        seq_obj.last_number = cast(int, seq_obj.last_number) + 1
-        session.flush()
-        return cast(int, seq_obj.last_number)
+        upsert = insert_stmt.on_conflict_do_update(
+            index_elements=[LabNumberSequence.seq_date, LabNumberSequence.material_type_id],
+            set_={"last_number": LabNumberSequence.last_number + insert_stmt.excluded.last_number},
+        )
+        last_number = int(session.execute(upsert.returning(LabNumberSequence.last_number)).scalar_one())
+        return range(last_number - count + 1, last_number + 1)
+
+    def search_by_number(self, session: Session, query: str, limit: int = 20) -> list[LabSample]:
+        clean = query.strip()
+        if not clean:
+            return []
+        stmt = select(LabSample)
+        phrase = trigram_phrase(clean)
+        if phrase is not None and is_fts_table(session, "lab_sample_fts"):
+            matched_ids = text("SELECT rowid FROM lab_sample_fts WHERE lab_sample_fts MATCH :q").bindparams(
+                q=phrase
+            )
+            stmt = stmt.where(LabSample.id.in_(matched_ids))
+        else:
+            pattern = f"%{clean}%"
+            stmt = stmt.where(or_(LabSample.lab_no.ilike(pattern), LabSample.barcode.ilike(pattern)))
+        stmt = stmt.order_by(LabSample.created_at.desc(), LabSample.id.desc()).limit(limit)
+        return list(session.execute(stmt).scalars())
 
     def create_sample(
         self,
@@ -81,6 +240,13 @@ class LabRepository:
         session.flush()
         return sample
 
+    def create_samples_bulk(self, session: Session, rows: list[dict[str, Any]]) -> list[int]:
+        """Вставить пробы одним пакетным INSERT; возвращает id в порядке ``rows``."""
+        if not rows:
+            return []
+        stmt = insert(LabSample).returning(LabSample.id, sort_by_parameter_order=True)
+        return [int(sample_id) for sample_id in session.execute(stmt, rows).scalars()]
+
     def update_result(
         self,
         session: Session,
@@ -11,6 +11,17 @@ from sqlalchemy.orm import Session
 
 from app.infrastructure.db.models_sqlalchemy import Patient
 
+_RU_DATE_RE = re.compile(r"^(\d{2})\.(\d{2})\.(\d{4})$")
+
+
+def _normalize_fts_term(term: str) -> str:
+    # Дата рождения хранится в ISO-виде: «01.03.1985» ищем как «1985-03-01».
+    match = _RU_DATE_RE.match(term)
+    if match:
+        day, month, year = match.groups()
+        return f"{year}-{month}-{day}"
+    return term.replace("ё", "е").replace("Ё", "Е")
+
 
 class PatientRepository:
     def find_by_identity(self, session: Session, full_name: str, dob: date | None) -> Patient | None:
@@ -49,8 +60,10 @@ class PatientRepository:
         clean = query.strip()
         if not clean:
             return []
-        terms = [t for t in re.split(r"\s+", clean) if t]
-        fts_query = " ".join(f"{t}*" for t in terms)
+        # Каждое слово — префиксная фраза по всем колонкам (ФИО, дата рождения, часть, округ),
+        # поэтому «Иванов 1985» разрешается одним MATCH.
+        terms = [_normalize_fts_term(t) for t in re.split(r"\s+", clean) if t]
+        fts_query = " ".join('"' + t.replace('"', '""') + '"*' for t in terms)
         if fts_query:
             try:
                 ids = [
@@ -61,7 +74,7 @@ class PatientRepository:
                             SELECT patient_id
                             FROM patients_fts
                             WHERE patients_fts MATCH :q
-                            ORDER BY bm25(patients_fts)
+                            ORDER BY bm25(patients_fts, 10.0, 2.0, 1.0, 1.0, 0.0)
                             LIMIT :limit
                             """
                         ),
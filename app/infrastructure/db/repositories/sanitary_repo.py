@@ -1,12 +1,26 @@
 from __future__ import annotations
 
 from collections.abc import Iterable
-from datetime import datetime
+from datetime import date, datetime, time, timedelta
 from typing import Any, cast
 
-from sqlalchemy import select, update
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    and_,
+    case,
+    delete,
+    func,
+    insert,
+    or_,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, aliased
 
+from app.infrastructure.db.fts_queries import is_fts_table, trigram_phrase
 from app.infrastructure.db.models_sqlalchemy import (
     SanAbxSusceptibility,
     SanitaryNumberSequence,
@@ -22,18 +36,42 @@ class SanitaryRepository:
         return session.execute(stmt).scalar_one_or_none()
 
     def next_lab_number(self, session: Session, seq_date: datetime) -> int:
-        seq_day = seq_date.date()
-        stmt = select(SanitaryNumberSequence).where(SanitaryNumberSequence.seq_date == seq_day)
-        seq = session.execute(stmt).scalar_one_or_none()
-        if seq is None:
-            seq = SanitaryNumberSequence(seq_date=seq_day, last_number=1)
-            session.add(seq)
-            session.flush()
-            return cast(int, cast(Any, seq).last_number)
-        seq_obj = cast(Any, seq)
-        seq_obj.last_number = cast(int, seq_obj.last_number) + 1
-        session.flush()
-        return cast(int, seq_obj.last_number)
+        return self.reserve_lab_numbers(session, seq_date, 1)[0]
+
+    def reserve_lab_numbers(self, session: Session, seq_date: datetime, count: int) -> range:
+        """Атомарно зарезервировать ``count`` подряд идущих номеров за день.
+
+        Работает так же, как ``LabRepository.reserve_lab_numbers``: один
+        ``INSERT ... ON CONFLICT DO UPDATE ... RETURNING`` по строке счётчика.
+        """
+        if count < 1:
+            raise ValueError("Количество резервируемых номеров должно быть положительным")
+        insert_stmt = sqlite_insert(SanitaryNumberSequence).values(
+            seq_date=seq_date.date(), last_number=count
+        )
+        upsert = insert_stmt.on_conflict_do_update(
+            index_elements=[SanitaryNumberSequence.seq_date],
+            set_={"last_number": SanitaryNumberSequence.last_number + insert_stmt.excluded.last_number},
+        )
+        last_number = int(session.execute(upsert.returning(SanitaryNumberSequence.last_number)).scalar_one())
+        return range(last_number - count + 1, last_number + 1)
+
+    def search_by_number(self, session: Session, query: str, limit: int = 20) -> list[SanitarySample]:
+        clean = query.strip()
+        if not clean:
+            return []
+        stmt = select(SanitarySample)
+        phrase = trigram_phrase(clean)
+        if phrase is not None and is_fts_table(session, "sanitary_sample_fts"):
+            matched_ids = text("SELECT rowid FROM sanitary_sample_fts WHERE sanitary_sample_fts MATCH :q").bindparams(
+                q=phrase
+            )
+            stmt = stmt.where(SanitarySample.id.in_(matched_ids))
+        else:
+            pattern = f"%{clean}%"
+            stmt = stmt.where(or_(SanitarySample.lab_no.ilike(pattern), SanitarySample.barcode.ilike(pattern)))
+        stmt = stmt.order_by(SanitarySample.created_at.desc(), SanitarySample.id.desc()).limit(limit)
+        return list(session.execute(stmt).scalars())
 
     def create_sample(
         self,
@@ -62,6 +100,13 @@ class SanitaryRepository:
         session.flush()
         return sample
 
+    def create_samples_bulk(self, session: Session, rows: list[dict[str, Any]]) -> list[int]:
+        """Вставить пробы одним пакетным INSERT; возвращает id в порядке ``rows``."""
+        if not rows:
+            return []
+        stmt = insert(SanitarySample).returning(SanitarySample.id, sort_by_parameter_order=True)
+        return [int(sample_id) for sample_id in session.execute(stmt, rows).scalars()]
+
     def update_result(
         self,
         session: Session,
@@ -86,6 +131,14 @@ class SanitaryRepository:
         )
         session.execute(stmt)
 
+    def update_results_bulk(self, session: Session, rows: list[dict[str, Any]]) -> None:
+        """Обновить результаты нескольких проб пакетным UPDATE по первичному ключу.
+
+        Каждая строка содержит ``id`` и поля результата, как в ``update_result``.
+        """
+        if rows:
+            session.execute(update(SanitarySample), rows)
+
     def update_sample(
         self,
         session: Session,
@@ -111,22 +164,314 @@ class SanitaryRepository:
         session.execute(stmt)
 
     def replace_isolation(self, session: Session, sample_id: int, items: Iterable[dict]) -> None:
-        session.query(SanMicrobeIsolation).filter(SanMicrobeIsolation.sanitary_sample_id == sample_id).delete()
-        session.add_all([SanMicrobeIsolation(sanitary_sample_id=sample_id, **item) for item in items])
+        self.replace_isolation_bulk(session, {sample_id: items})
 
     def replace_susceptibility(self, session: Session, sample_id: int, items: Iterable[dict]) -> None:
-        session.query(SanAbxSusceptibility).filter(SanAbxSusceptibility.sanitary_sample_id == sample_id).delete()
-        session.add_all([SanAbxSusceptibility(sanitary_sample_id=sample_id, **item) for item in items])
+        self.replace_susceptibility_bulk(session, {sample_id: items})
 
     def replace_phages(self, session: Session, sample_id: int, items: Iterable[dict]) -> None:
-        session.query(SanPhagePanelResult).filter(SanPhagePanelResult.sanitary_sample_id == sample_id).delete()
-        session.add_all([SanPhagePanelResult(sanitary_sample_id=sample_id, **item) for item in items])
+        self.replace_phages_bulk(session, {sample_id: items})
+
+    def replace_isolation_bulk(self, session: Session, items_by_sample: dict[int, Iterable[dict]]) -> None:
+        """Заменить культуры сразу у нескольких проб: один DELETE и один пакетный INSERT."""
+        self._replace_children_bulk(session, SanMicrobeIsolation, items_by_sample)
+
+    def replace_susceptibility_bulk(
+        self, session: Session, items_by_sample: dict[int, Iterable[dict]]
+    ) -> None:
+        self._replace_children_bulk(session, SanAbxSusceptibility, items_by_sample)
+
+    def replace_phages_bulk(self, session: Session, items_by_sample: dict[int, Iterable[dict]]) -> None:
+        self._replace_children_bulk(session, SanPhagePanelResult, items_by_sample)
+
+    def _replace_children_bulk(
+        self,
+        session: Session,
+        model: type[SanMicrobeIsolation] | type[SanAbxSusceptibility] | type[SanPhagePanelResult],
+        items_by_sample: dict[int, Iterable[dict]],
+    ) -> None:
+        if not items_by_sample:
+            return
+        session.execute(
+            delete(model)
+            .where(model.sanitary_sample_id.in_(list(items_by_sample)))
+            .execution_options(synchronize_session=False)
+        )
+        rows = [
+            {**item, "sanitary_sample_id": sample_id}
+            for sample_id, items in items_by_sample.items()
+            for item in items
+        ]
+        if rows:
+            session.execute(insert(model), rows)
 
     def list_by_department(self, session: Session, department_id: int) -> list[SanitarySample]:
         stmt = select(SanitarySample).where(SanitarySample.department_id == department_id)
         stmt = stmt.order_by(SanitarySample.created_at.desc())
         return list(session.execute(stmt).scalars())
 
+    def _select_with_first_isolation(self) -> Select:
+        """SELECT проб вместе с первой выделенной культурой (изолят с минимальным id).
+
+        Строки: ``(проба, microorganism_id, microorganism_free)``.
+        """
+        first_isolation_id = (
+            select(func.min(SanMicrobeIsolation.id))
+            .where(SanMicrobeIsolation.sanitary_sample_id == SanitarySample.id)
+            .correlate(SanitarySample)
+            .scalar_subquery()
+        )
+        return select(
+            SanitarySample,
+            SanMicrobeIsolation.microorganism_id,
+            SanMicrobeIsolation.microorganism_free,
+        ).outerjoin(SanMicrobeIsolation, SanMicrobeIsolation.id == first_isolation_id)
+
+    def list_by_ids_with_first_isolation(
+        self, session: Session, sample_ids: list[int]
+    ) -> list[tuple[SanitarySample, int | None, str | None]]:
+        """Пробы по списку id (в порядке ``sample_ids``) с первой культурой — одним запросом."""
+        if not sample_ids:
+            return []
+        stmt = self._select_with_first_isolation().where(SanitarySample.id.in_(sample_ids))
+        rows = {
+            row[0].id: (row[0], cast(int | None, row[1]), cast(str | None, row[2]))
+            for row in session.execute(stmt).all()
+        }
+        return [rows[sample_id] for sample_id in sample_ids if sample_id in rows]
+
+    def _department_sample_conditions(
+        self,
+        department_id: int,
+        *,
+        lab_no: str | None = None,
+        growth_flag: int | None = None,
+        sampling_point: str | None = None,
+        microorganism_id: int | None = None,
+        taken_from: date | None = None,
+        taken_to: date | None = None,
+    ) -> list[ColumnElement[bool]]:
+        conditions: list[ColumnElement[bool]] = [SanitarySample.department_id == department_id]
+        if lab_no:
+            conditions.append(SanitarySample.lab_no.ilike(f"%{lab_no}%"))
+        if growth_flag is not None:
+            conditions.append(SanitarySample.growth_flag == growth_flag)
+        if sampling_point:
+            conditions.append(SanitarySample.sampling_point.ilike(f"%{sampling_point}%"))
+        if microorganism_id is not None:
+            isolation = aliased(SanMicrobeIsolation)
+            conditions.append(
+                select(isolation.id)
+                .where(
+                    isolation.sanitary_sample_id == SanitarySample.id,
+                    isolation.microorganism_id == microorganism_id,
+                )
+                .correlate(SanitarySample)
+                .exists()
+            )
+        if taken_from is not None:
+            conditions.append(SanitarySample.taken_at >= datetime.combine(taken_from, time.min))
+        if taken_to is not None:
+            conditions.append(
+                SanitarySample.taken_at < datetime.combine(taken_to + timedelta(days=1), time.min)
+            )
+        return conditions
+
+    def list_page_by_department(
+        self,
+        session: Session,
+        department_id: int,
+        *,
+        lab_no: str | None = None,
+        growth_flag: int | None = None,
+        sampling_point: str | None = None,
+        microorganism_id: int | None = None,
+        taken_from: date | None = None,
+        taken_to: date | None = None,
+        after: tuple[datetime | None, int] | None = None,
+        limit: int | None = None,
+    ) -> list[tuple[SanitarySample, int | None, str | None]]:
+        """Страница проб отделения с первой выделенной культурой.
+
+        Порядок: сначала пробы без даты взятия, затем по дате взятия по убыванию,
+        при равенстве — по id по убыванию. ``after`` — ключ ``(taken_at, id)``
+        последней пробы предыдущей страницы (keyset-пагинация).
+        """
+        stmt = self._select_with_first_isolation().where(
+            *self._department_sample_conditions(
+                department_id,
+                lab_no=lab_no,
+                growth_flag=growth_flag,
+                sampling_point=sampling_point,
+                microorganism_id=microorganism_id,
+                taken_from=taken_from,
+                taken_to=taken_to,
+            )
+        )
+        if after is not None:
+            after_taken_at, after_id = after
+            if after_taken_at is None:
+                stmt = stmt.where(
+                    or_(
+                        and_(SanitarySample.taken_at.is_(None), SanitarySample.id < after_id),
+                        SanitarySample.taken_at.is_not(None),
+                    )
+                )
+            else:
+                stmt = stmt.where(
+                    SanitarySample.taken_at.is_not(None),
+                    or_(
+                        SanitarySample.taken_at < after_taken_at,
+                        and_(SanitarySample.taken_at == after_taken_at, SanitarySample.id < after_id),
+                    ),
+                )
+        stmt = stmt.order_by(
+            SanitarySample.taken_at.is_(None).desc(),
+            SanitarySample.taken_at.desc(),
+            SanitarySample.id.desc(),
+        )
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return [
+            (row[0], cast(int | None, row[1]), cast(str | None, row[2]))
+            for row in session.execute(stmt).all()
+        ]
+
+    def count_by_department(
+        self,
+        session: Session,
+        department_id: int,
+        *,
+        lab_no: str | None = None,
+        growth_flag: int | None = None,
+        sampling_point: str | None = None,
+        microorganism_id: int | None = None,
+        taken_from: date | None = None,
+        taken_to: date | None = None,
+    ) -> tuple[int, int, datetime | None]:
+        """Число проб по фильтрам, из них положительных, и дата последнего взятия."""
+        stmt = select(
+            func.count(SanitarySample.id),
+            func.sum(case((SanitarySample.growth_flag == 1, 1), else_=0)),
+            func.max(SanitarySample.taken_at),
+        ).where(
+            *self._department_sample_conditions(
+                department_id,
+                lab_no=lab_no,
+                growth_flag=growth_flag,
+                sampling_point=sampling_point,
+                microorganism_id=microorganism_id,
+                taken_from=taken_from,
+                taken_to=taken_to,
+            )
+        )
+        total, positive, last_taken_at = session.execute(stmt).one()
+        return int(total or 0), int(positive or 0), cast(datetime | None, last_taken_at)
+
+    def department_overview(
+        self,
+        session: Session,
+        *,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        growth: int | None = None,
+    ) -> list[tuple[int, int, int, int, int, SanitarySample | None, int | None, str | None]]:
+        """Сводка по отделениям одним запросом: счётчики, последняя проба и её первая культура.
+
+        Возвращает кортежи ``(department_id, total, positive, negative, pending,
+        last_sample, microorganism_id, microorganism_free)`` только для отделений,
+        у которых есть пробы в периоде. ``growth`` оставляет отделения, где есть
+        хотя бы одна проба с таким результатом: 1 — рост, 0 — нет роста,
+        -1 — результат не внесён. Последняя проба — с максимальной датой взятия
+        (пробы без даты не учитываются).
+        """
+        conditions: list[ColumnElement[bool]] = []
+        if date_from is not None:
+            conditions.append(SanitarySample.taken_at >= datetime.combine(date_from, time.min))
+        if date_to is not None:
+            conditions.append(
+                SanitarySample.taken_at < datetime.combine(date_to + timedelta(days=1), time.min)
+            )
+
+        positive = func.sum(case((SanitarySample.growth_flag == 1, 1), else_=0))
+        negative = func.sum(case((SanitarySample.growth_flag == 0, 1), else_=0))
+        pending = func.sum(case((SanitarySample.growth_flag.is_(None), 1), else_=0))
+        stats_stmt = (
+            select(
+                SanitarySample.department_id.label("department_id"),
+                func.count(SanitarySample.id).label("total"),
+                positive.label("positive"),
+                negative.label("negative"),
+                pending.label("pending"),
+            )
+            .where(*conditions)
+            .group_by(SanitarySample.department_id)
+        )
+        if growth == 1:
+            stats_stmt = stats_stmt.having(positive > 0)
+        elif growth == 0:
+            stats_stmt = stats_stmt.having(negative > 0)
+        elif growth == -1:
+            stats_stmt = stats_stmt.having(pending > 0)
+        stats = stats_stmt.subquery("stats")
+
+        # Последняя проба отделения — первая строка окна по (department_id, taken_at DESC),
+        # которое SQLite обходит по индексу ix_sanitary_sample_department_id_taken_at.
+        ranked = (
+            select(
+                SanitarySample.id.label("sample_id"),
+                SanitarySample.department_id.label("department_id"),
+                func.row_number()
+                .over(
+                    partition_by=SanitarySample.department_id,
+                    order_by=(SanitarySample.taken_at.desc(), SanitarySample.id.desc()),
+                )
+                .label("rn"),
+            )
+            .where(SanitarySample.taken_at.is_not(None), *conditions)
+            .subquery("ranked")
+        )
+        last_sample = aliased(SanitarySample, name="last_sample")
+        first_isolation_id = (
+            select(func.min(SanMicrobeIsolation.id))
+            .where(SanMicrobeIsolation.sanitary_sample_id == last_sample.id)
+            .correlate(last_sample)
+            .scalar_subquery()
+        )
+        stmt = (
+            select(
+                stats.c.department_id,
+                stats.c.total,
+                stats.c.positive,
+                stats.c.negative,
+                stats.c.pending,
+                last_sample,
+                SanMicrobeIsolation.microorganism_id,
+                SanMicrobeIsolation.microorganism_free,
+            )
+            .select_from(stats)
+            .outerjoin(
+                ranked,
+                and_(ranked.c.department_id == stats.c.department_id, ranked.c.rn == 1),
+            )
+            .outerjoin(last_sample, last_sample.id == ranked.c.sample_id)
+            .outerjoin(SanMicrobeIsolation, SanMicrobeIsolation.id == first_isolation_id)
+            .order_by(stats.c.department_id)
+        )
+        return [
+            (
+                int(row[0]),
+                int(row[1] or 0),
+                int(row[2] or 0),
+                int(row[3] or 0),
+                int(row[4] or 0),
+                row[5],
+                cast(int | None, row[6]),
+                cast(str | None, row[7]),
+            )
+            for row in session.execute(stmt).all()
+        ]
+
     def get_isolation(self, session: Session, sample_id: int) -> list[SanMicrobeIsolation]:
         return list(
             session.query(SanMicrobeIsolation)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Iterator, Sequence
+from contextlib import closing, contextmanager
+from pathlib import Path
+
+from sqlalchemy import Table, text
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateTable
+
+SNAPSHOT_SCHEMA = "exchange_snapshot"
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def sqlite_database_path(session: Session) -> Path:
+    """Путь к файлу БД сессии; снимки поддерживаются только для файловой SQLite."""
+    url = session.get_bind().engine.url
+    if url.get_backend_name() != "sqlite" or not url.database or url.database == ":memory:":
+        raise ValueError("Снимок SQLite доступен только для файловой базы SQLite")
+    return Path(url.database)
+
+
+def write_snapshot(source_path: Path, target_path: Path, tables: Sequence[Table]) -> dict[str, int]:
+    """Скопировать таблицы из ``source_path`` в новый компактный файл SQLite.
+
+    В снимок попадают только переданные таблицы (без индексов и триггеров) —
+    пользователи, аудит и прочие служебные данные в пакет не уходят. Все таблицы
+    читаются в одной транзакции, поэтому снимок согласован.
+    """
+    source_uri = f"{source_path.resolve().as_uri()}?mode=ro"
+    target_uri = target_path.resolve().as_uri()
+    counts: dict[str, int] = {}
+    with closing(sqlite3.connect(target_uri, uri=True, isolation_level=None)) as connection:
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        for table in tables:
+            connection.execute(str(CreateTable(table).compile(dialect=sqlite.dialect())))
+        connection.execute("ATTACH DATABASE ? AS source", (source_uri,))
+        try:
+            connection.execute("BEGIN")
+            for table in tables:
+                columns = ", ".join(_quote(column.name) for column in table.columns)
+                name = _quote(table.name)
+                cursor = connection.execute(
+                    f"INSERT INTO main.{name} ({columns}) SELECT {columns} FROM source.{name}"
+                )
+                counts[table.name] = cursor.rowcount
+            connection.execute("COMMIT")
+        finally:
+            connection.execute("DETACH DATABASE source")
+    return counts
+
+
+@contextmanager
+def attached_snapshot(session: Session, snapshot_path: Path) -> Iterator[str]:
+    """Подключить снимок к соединению сессии как схему ``SNAPSHOT_SCHEMA``.
+
+    Снимок отключается после завершения транзакции — вызывающий код должен
+    зафиксировать или откатить изменения внутри блока.
+    """
+    try:
+        session.execute(
+            text(f"ATTACH DATABASE :path AS {SNAPSHOT_SCHEMA}"),
+            {"path": str(snapshot_path)},
+        )
+        session.execute(text(f"SELECT count(*) FROM {SNAPSHOT_SCHEMA}.sqlite_master"))
+    except SQLAlchemyError as exc:
+        session.rollback()
+        raise ValueError(f"Файл снимка SQLite повреждён: {exc}") from exc
+    try:
+        yield SNAPSHOT_SCHEMA
+    finally:
+        session.rollback()
+        session.execute(text(f"DETACH DATABASE {SNAPSHOT_SCHEMA}"))
+
+
+def snapshot_columns(session: Session, table_name: str) -> list[str]:
+    rows = session.execute(text(f"PRAGMA {SNAPSHOT_SCHEMA}.table_info({_quote(table_name)})"))
+    return [str(row[1]) for row in rows]
@@ -5,7 +5,7 @@ from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
-from app.infrastructure.security.sha256 import sha256_file
+from app.infrastructure.security.sha256 import sha256_file_cached
 
 
 def export_form100_json(cards: list[dict[str, Any]], file_path: str | Path) -> dict[str, int]:
@@ -39,7 +39,7 @@ def build_manifest_v2(*, files: list[Path], exported_by: str | None, base_dir: P
         entries.append(
             {
                 "name": name,
-                "sha256": sha256_file(file),
+                "sha256": sha256_file_cached(file),
                 "size": file.stat().st_size,
             }
         )
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import zipfile
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, cast
+
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class PackageMember:
+    name: str
+    sha256: str
+    size: int
+
+
+class _HashingStream:
+    """Поток записи, считающий SHA-256 и размер проходящих через него байтов.
+
+    У потока нет ``seek``, поэтому ``zipfile`` пишет записи строго
+    последовательно (с data descriptor) и не перечитывает уже записанное.
+    """
+
+    def __init__(self, target: BinaryIO, on_write: Callable[[int], None] | None = None) -> None:
+        self._target = target
+        self._hash = hashlib.sha256()
+        self._on_write = on_write
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self._target.write(data)
+        self._hash.update(data)
+        self.size += len(data)
+        if self._on_write is not None:
+            self._on_write(len(data))
+        return len(data)
+
+    def tell(self) -> int:
+        return self.size
+
+    def flush(self) -> None:
+        self._target.flush()
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+class PackageZipWriter:
+    """Однопроходная запись ZIP-пакета обмена.
+
+    Члены архива пишутся потоком прямо в ZIP, а SHA-256 и размер каждого
+    члена и всего архива считаются по ходу записи — без временных копий и
+    повторного чтения. Хэш архива доступен в ``sha256`` после закрытия.
+    ``on_write`` получает число байтов каждой записи в архив (для прогресса).
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        compression: int = zipfile.ZIP_DEFLATED,
+        on_write: Callable[[int], None] | None = None,
+    ) -> None:
+        self.path = path
+        self.members: list[PackageMember] = []
+        self.sha256: str | None = None
+        self._file = path.open("wb")
+        self._archive_stream = _HashingStream(self._file, on_write)
+        self._zip = zipfile.ZipFile(cast(BinaryIO, self._archive_stream), "w", compression)
+
+    def __enter__(self) -> PackageZipWriter:
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        try:
+            self.close()
+        finally:
+            if exc_type is not None:
+                # Недописанный пакет не оставляем — в нём не хватает членов и manifest.
+                self.path.unlink(missing_ok=True)
+
+    @contextmanager
+    def open_member(self, name: str) -> Iterator[BinaryIO]:
+        """Открыть член архива для потоковой записи; хэш фиксируется при выходе."""
+        with self._zip.open(name, "w", force_zip64=True) as raw:
+            stream = _HashingStream(cast(BinaryIO, raw))
+            yield cast(BinaryIO, stream)
+        self.members.append(PackageMember(name=name, sha256=stream.hexdigest(), size=stream.size))
+
+    def add_file(self, source: Path, name: str | None = None) -> PackageMember:
+        with self.open_member(name or source.name) as target, source.open("rb") as f:
+            for chunk in iter(lambda: f.read(_COPY_CHUNK_SIZE), b""):
+                target.write(chunk)
+        return self.members[-1]
+
+    def add_bytes(self, name: str, data: bytes) -> PackageMember:
+        with self.open_member(name) as target:
+            target.write(data)
+        return self.members[-1]
+
+    def close(self) -> None:
+        if self.sha256 is not None:
+            return
+        try:
+            self._zip.close()
+        finally:
+            self._file.close()
+        self.sha256 = self._archive_stream.hexdigest()
+
+
+class HashingReader(io.RawIOBase):
+    """Чтение потока (например, члена ``ZipFile.open``) с подсчётом SHA-256.
+
+    Позволяет сверить хэш из manifest за то же чтение, которым данные
+    импортируются, без распаковки на диск.
+    """
+
+    def __init__(self, source: BinaryIO) -> None:
+        super().__init__()
+        self._source = source
+        self._hash = hashlib.sha256()
+        self.size = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        data = self._source.read(len(buffer))
+        size = len(data)
+        buffer[:size] = data
+        self._hash.update(data)
+        self.size += size
+        return size
+
+    def buffered(self) -> io.BufferedReader:
+        return io.BufferedReader(self, _COPY_CHUNK_SIZE)
+
+    def finish(self) -> str:
+        """Дочитать непрочитанный остаток и вернуть SHA-256 всего потока."""
+        for chunk in iter(lambda: self._source.read(_COPY_CHUNK_SIZE), b""):
+            self._hash.update(chunk)
+            self.size += len(chunk)
+        return self._hash.hexdigest()
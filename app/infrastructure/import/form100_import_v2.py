@@ -2,12 +2,14 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
 
-def load_form100_json(file_path: str | Path) -> list[dict[str, Any]]:
-    file_path = Path(file_path)
-    payload = json.loads(file_path.read_text(encoding="utf-8"))
+def load_form100_json(source: str | Path | BinaryIO) -> list[dict[str, Any]]:
+    if isinstance(source, str | Path):
+        payload = json.loads(Path(source).read_text(encoding="utf-8"))
+    else:
+        payload = json.load(source)
     cards = payload.get("cards", [])
     if not isinstance(cards, list):
         raise ValueError("Некорректный формат form100 JSON: cards должен быть списком")
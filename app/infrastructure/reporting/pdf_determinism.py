@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections.abc import Callable, Iterator, Sequence
 from typing import Any
 
 from reportlab.pdfgen import canvas
@@ -12,6 +12,45 @@ def _invariant_canvas(*args: Any, **kwargs: Any) -> canvas.Canvas:
     return canvas.Canvas(*args, **kwargs)
 
 
-def build_invariant_pdf(doc: SimpleDocTemplate, flowables: Sequence[Any]) -> None:
-    """Собирает PDF через ReportLab в воспроизводимом invariant-режиме."""
-    doc.build(list(flowables), canvasmaker=_invariant_canvas)
+class _StreamingStory(list[Any]):
+    """Список flowables, который ReportLab дочитывает из итератора по мере вёрстки.
+
+    ``doc.build`` снимает элементы с головы списка, поэтому в памяти держится
+    только текущий flowable и его не уместившиеся на странице части.
+    """
+
+    def __init__(self, source: Iterator[Any]) -> None:
+        super().__init__()
+        self._source = source
+
+    def _fill(self) -> None:
+        if not super().__len__():
+            for item in self._source:
+                self.append(item)
+                break
+
+    def __len__(self) -> int:
+        self._fill()
+        return super().__len__()
+
+    def __getitem__(self, index: Any) -> Any:
+        self._fill()
+        return super().__getitem__(index)
+
+
+def build_invariant_pdf(
+    doc: SimpleDocTemplate,
+    flowables: Sequence[Any] | Iterator[Any],
+    *,
+    on_page: Callable[[canvas.Canvas, Any], None] | None = None,
+) -> None:
+    """Собирает PDF через ReportLab в воспроизводимом invariant-режиме.
+
+    Итератор flowables верстается потоково, не материализуясь целиком;
+    ``on_page`` вызывается перед отрисовкой каждой страницы.
+    """
+    story = _StreamingStory(flowables) if isinstance(flowables, Iterator) else list(flowables)
+    if on_page is None:
+        doc.build(story, canvasmaker=_invariant_canvas)
+    else:
+        doc.build(story, onFirstPage=on_page, onLaterPages=on_page, canvasmaker=_invariant_canvas)
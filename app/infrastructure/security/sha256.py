@@ -1,21 +1,96 @@
 from __future__ import annotations
 
 import hashlib
+import mmap
+import os
+import shutil
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import BinaryIO
 
+_HASH_CHUNK_SIZE = 1024 * 1024
+# Файлы от этого размера хэшируются через mmap: без копирования в буферы Python.
+_MMAP_MIN_SIZE = 4 * 1024 * 1024
+_MEMO_MAX_ENTRIES = 512
+
+_MemoKey = tuple[str, int, int, int]
+_memo: OrderedDict[_MemoKey, str] = OrderedDict()
+_memo_lock = threading.Lock()
+
 
 def sha256_bytes(data: bytes) -> str:
     return hashlib.sha256(data).hexdigest()
 
 
-def sha256_file(path: Path, chunk_size: int = 8192) -> str:
+def sha256_file(path: Path, chunk_size: int = _HASH_CHUNK_SIZE) -> str:
     h = hashlib.sha256()
     with path.open("rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= _MMAP_MIN_SIZE:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    h.update(mapped)
+                return h.hexdigest()
+            except (OSError, ValueError):
+                # Файловая система без поддержки mmap — читаем обычным способом.
+                h = hashlib.sha256()
+                f.seek(0)
         _update_hash_stream(h, f, chunk_size)
     return h.hexdigest()
 
 
+def sha256_file_cached(path: Path) -> str:
+    """SHA-256 файла с запоминанием по ``(путь, размер, mtime_ns, inode)``.
+
+    Повторный запрос по неизменённому файлу не перечитывает его: изменение
+    содержимого меняет размер или время модификации, а подмена файла — inode.
+    """
+    key = _memo_key(path)
+    with _memo_lock:
+        cached = _memo.get(key)
+        if cached is not None:
+            _memo.move_to_end(key)
+            return cached
+    digest = sha256_file(path)
+    _remember(key, digest)
+    return digest
+
+
+def remember_sha256(path: Path, digest: str) -> None:
+    """Запомнить хэш файла, посчитанный при его записи, чтобы не читать файл повторно."""
+    _remember(_memo_key(path), digest)
+
+
+def copy_file_with_sha256(source: Path, target: Path) -> str:
+    """Скопировать файл (как ``shutil.copy2``), посчитав SHA-256 за то же чтение.
+
+    Хэш копии запоминается для ``sha256_file_cached``.
+    """
+    h = hashlib.sha256()
+    with source.open("rb") as src, target.open("wb") as dst:
+        for chunk in iter(lambda: src.read(_HASH_CHUNK_SIZE), b""):
+            h.update(chunk)
+            dst.write(chunk)
+    shutil.copystat(source, target)
+    digest = h.hexdigest()
+    remember_sha256(target, digest)
+    return digest
+
+
+def _memo_key(path: Path) -> _MemoKey:
+    stat = os.stat(path)
+    return (os.path.abspath(path), stat.st_size, stat.st_mtime_ns, stat.st_ino)
+
+
+def _remember(key: _MemoKey, digest: str) -> None:
+    with _memo_lock:
+        _memo[key] = digest
+        _memo.move_to_end(key)
+        while len(_memo) > _MEMO_MAX_ENTRIES:
+            _memo.popitem(last=False)
+
+
 def _update_hash_stream(h, stream: BinaryIO, chunk_size: int) -> None:
     for chunk in iter(lambda: stream.read(chunk_size), b""):
         h.update(chunk)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import atexit
 import logging
+import multiprocessing
 import sys
 import time
 from io import UnsupportedOperation
@@ -355,6 +356,9 @@ def _schedule_initial_window_size(
     QTimer.singleShot(0, lambda: _apply_when_ready(retries))
 
 if __name__ == "__main__":
+    # Пакет Form100 формирует PDF в пуле процессов; в сборке PyInstaller
+    # дочерний процесс должен выполнить задачу, а не запустить окно приложения.
+    multiprocessing.freeze_support()
     try:
         sys.exit(main())
     except KeyboardInterrupt:
@@ -25,6 +25,7 @@ from app.application.dto.auth_dto import SessionContext
 from app.application.dto.form100_v2_dto import (
     Form100CardV2ListItemDto,
     Form100V2Filters,
+    Form100V2ListCursor,
 )
 from app.application.exceptions import AppError
 from app.application.services.form100_service_v2 import Form100ServiceV2
@@ -37,6 +38,8 @@ _STATUS_LABELS: dict[str, str] = {
     "SIGNED": "Подписан",
 }
 _HANDLED_FORM100_ERRORS = (ValueError, RuntimeError, LookupError, TypeError, AppError)
+# Размер страницы списка: следующая порция догружается при прокрутке к концу таблицы.
+_PAGE_SIZE = 100
 
 
 class _PreviewPanel(QFrame):
@@ -159,6 +162,7 @@ class Form100ListPanel(QDialog):
         self._emr_case_id = emr_case_id
         self._on_data_changed = on_data_changed
         self._cards: list[Form100CardV2ListItemDto] = []
+        self._has_more = False
 
         self.setWindowTitle("Форма 100")
         self.setMinimumSize(780, 560)
@@ -210,6 +214,7 @@ class Form100ListPanel(QDialog):
         self._table.setColumnWidth(2, 180)
         self._table.itemSelectionChanged.connect(self._on_selection_changed)
         self._table.itemDoubleClicked.connect(lambda _: self._open_selected())
+        self._table.verticalScrollBar().valueChanged.connect(self._on_scroll)
         left_lay.addWidget(self._table)
         splitter.addWidget(left)
 
@@ -273,13 +278,14 @@ class Form100ListPanel(QDialog):
 
     # -- Данные ---------------------------------------------------------------
 
-    def _load_cards(self) -> None:
+    def _filters(self) -> Form100V2Filters:
         if self._patient_id is not None:
-            filters = Form100V2Filters(patient_id=self._patient_id)
-        else:
-            filters = Form100V2Filters(emr_case_id=self._emr_case_id)
+            return Form100V2Filters(patient_id=self._patient_id)
+        return Form100V2Filters(emr_case_id=self._emr_case_id)
+
+    def _load_cards(self) -> None:
         try:
-            self._cards = self._service.list_cards(filters, limit=200)
+            self._cards = self._service.list_cards(self._filters(), limit=_PAGE_SIZE)
         except _HANDLED_FORM100_ERRORS as exc:
             exec_message_box(
                 self,
@@ -289,31 +295,64 @@ class Form100ListPanel(QDialog):
                 icon=QMessageBox.Icon.Warning,
             )
             self._cards = []
+        self._has_more = len(self._cards) >= _PAGE_SIZE
         self._rebuild_table()
 
+    def _load_more_cards(self) -> None:
+        if not self._has_more or not self._cards:
+            return
+        last = self._cards[-1]
+        cursor = Form100V2ListCursor(updated_at=last.updated_at, id=last.id)
+        try:
+            page = self._service.list_cards(self._filters(), limit=_PAGE_SIZE, after=cursor)
+        except _HANDLED_FORM100_ERRORS as exc:
+            self._has_more = False
+            exec_message_box(
+                self,
+                "Ошибка",
+                "Не удалось загрузить карточки:\n"
+                f"{error_text(exc, 'Операция не выполнена')}",
+                icon=QMessageBox.Icon.Warning,
+            )
+            return
+        self._has_more = len(page) >= _PAGE_SIZE
+        self._cards.extend(page)
+        for card in page:
+            self._append_row(card)
+
+    def _on_scroll(self, value: int) -> None:
+        if self._has_more and value >= self._table.verticalScrollBar().maximum():
+            self._load_more_cards()
+
     def _rebuild_table(self) -> None:
         self._table.setRowCount(0)
         self._preview.clear()
         for card in self._cards:
-            row = self._table.rowCount()
-            self._table.insertRow(row)
-
-            date_str = card.updated_at.strftime("%d.%m.%Y %H:%M")
-            if card.is_archived:
-                status_text = "Архив"
-            else:
-                status_text = _STATUS_LABELS.get(card.status, card.status)
-
-            items = [
-                QTableWidgetItem(date_str),
-                QTableWidgetItem(status_text),
-                QTableWidgetItem(card.main_full_name or "—"),
-                QTableWidgetItem(card.main_diagnosis or "—"),
-            ]
-            items[0].setData(Qt.ItemDataRole.UserRole, card.id)
-            for col, item in enumerate(items):
-                item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self._table.setItem(row, col, item)
+            self._append_row(card)
+        # Если первая страница целиком помещается в окне, полосы прокрутки нет —
+        # догружаем следующую сразу.
+        if self._has_more and self._table.verticalScrollBar().maximum() == 0:
+            self._load_more_cards()
+
+    def _append_row(self, card: Form100CardV2ListItemDto) -> None:
+        row = self._table.rowCount()
+        self._table.insertRow(row)
+
+        date_str = card.updated_at.strftime("%d.%m.%Y %H:%M")
+        status_text = (
+            "Архив" if card.is_archived else _STATUS_LABELS.get(card.status, card.status)
+        )
+
+        items = [
+            QTableWidgetItem(date_str),
+            QTableWidgetItem(status_text),
+            QTableWidgetItem(card.main_full_name or "—"),
+            QTableWidgetItem(card.main_diagnosis or "—"),
+        ]
+        items[0].setData(Qt.ItemDataRole.UserRole, card.id)
+        for col, item in enumerate(items):
+            item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+            self._table.setItem(row, col, item)
 
     # -- Выбор ----------------------------------------------------------------
 
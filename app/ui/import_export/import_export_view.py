@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from datetime import datetime
 from pathlib import Path
 from typing import cast
@@ -44,6 +45,9 @@ _PACKAGE_FORMAT_LABELS = {
     "csv": "CSV",
     "pdf": "PDF",
     "zip+excel": "ZIP + Excel",
+    "zip+delta": "ZIP (изменения)",
+    "zip+sqlite": "ZIP (снимок SQLite)",
+    "zip+jsonl": "ZIP (JSON Lines)",
     "form100+zip": "Form100 ZIP",
 }
 
@@ -59,10 +63,12 @@ class ImportExportView(QWidget):
         exchange_service: ExchangeService,
         session: SessionContext,
         parent: QWidget | None = None,
+        on_data_changed: Callable[[], None] | None = None,
     ) -> None:
         super().__init__(parent)
         self.exchange_service = exchange_service
         self.session = session
+        self.on_data_changed = on_data_changed
         self._build_ui()
 
     def set_session(self, session: SessionContext) -> None:
@@ -217,6 +223,8 @@ class ImportExportView(QWidget):
         )
         if wizard.exec() == QDialog.DialogCode.Accepted:
             self._load_history()
+            if self.on_data_changed:
+                self.on_data_changed()
 
     def _sync_permissions(self) -> None:
         can_manage = can_manage_exchange(self.session.role)
@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import cast
 
 from openpyxl import load_workbook
+from PySide6.QtCore import QObject, Signal
 from PySide6.QtWidgets import (
     QComboBox,
     QFileDialog,
@@ -24,14 +25,24 @@ from PySide6.QtWidgets import (
 )
 
 from app.application.dto.auth_dto import SessionContext
+from app.application.dto.exchange_dto import ExchangeProgressEvent
+from app.application.exceptions import OperationCancelledError
 from app.application.security import can_manage_exchange
-from app.application.services.exchange_service import ExchangeService
+from app.application.services.exchange_progress import ExchangeProgress
+from app.application.services.exchange_service import DEFAULT_EXPORT_WORKERS, ExchangeService
 from app.ui.widgets.async_task import run_async
 from app.ui.widgets.button_utils import compact_button
 from app.ui.widgets.dialog_utils import exec_message_box
 from app.ui.widgets.notifications import show_error, show_info, show_warning
 from app.ui.widgets.table_utils import connect_combo_autowidth, resize_columns_to_content
 
+_BYTES_PER_MB = 1024 * 1024
+
+
+class _ProgressSignals(QObject):
+    # Прогресс приходит из потока операции — в окно он доставляется сигналом.
+    changed = Signal(object)
+
 
 class ImportExportWizard(QWizard):
     def __init__(
@@ -57,6 +68,9 @@ class ImportExportWizard(QWizard):
         self.addPage(self._direction_page)
         self.addPage(self._path_page)
         self.addPage(self._preview_page)
+        self._progress: ExchangeProgress | None = None
+        self._progress_signals = _ProgressSignals(self)
+        self._progress_signals.changed.connect(self._show_progress)
 
     @property
     def operation_host(self) -> QWidget:
@@ -94,10 +108,14 @@ class ImportExportWizard(QWizard):
             if reply != QMessageBox.StandardButton.Yes:
                 return
 
+        progress = ExchangeProgress(self._progress_signals.changed.emit)
+        self._progress = progress
+        self._preview_page.progress_label.setText("Подготовка операции…")
+        self._preview_page.progress_label.setVisible(True)
         self._set_busy(True)
 
         def _run() -> tuple[str, bool]:
-            return self._run_operation(direction, fmt, table_name, file_path, import_mode)
+            return self._run_operation(direction, fmt, table_name, file_path, import_mode, progress)
 
         def _on_success(result: tuple[str, bool]) -> None:
             message, has_errors = result
@@ -111,6 +129,9 @@ class ImportExportWizard(QWizard):
             self._accept_success()
 
         def _on_error(exc: Exception) -> None:
+            if isinstance(exc, OperationCancelledError):
+                show_info(self, "Операция отменена, изменения не сохранены")
+                return
             show_error(self, str(exc))
 
         run_async(
@@ -118,15 +139,32 @@ class ImportExportWizard(QWizard):
             _run,
             on_success=_on_success,
             on_error=_on_error,
-            on_finished=lambda: self._set_busy(False),
+            on_finished=self._finish_operation,
         )
 
+    def reject(self) -> None:
+        # Во время операции «Отмена» прерывает её, а не закрывает мастер.
+        if self._progress is not None:
+            self._progress.cancel()
+            self._preview_page.progress_label.setText("Отмена операции…")
+            return
+        super().reject()
+
+    def _finish_operation(self) -> None:
+        self._progress = None
+        self._preview_page.progress_label.setVisible(False)
+        self._set_busy(False)
+
+    def _show_progress(self, event: ExchangeProgressEvent) -> None:
+        if self._progress is None or self._progress.is_cancelled:
+            return
+        self._preview_page.progress_label.setText(_format_progress(event, self.table_labels))
+
     def _set_busy(self, busy: bool) -> None:
         for button in (
             QWizard.WizardButton.BackButton,
             QWizard.WizardButton.NextButton,
             QWizard.WizardButton.FinishButton,
-            QWizard.WizardButton.CancelButton,
         ):
             btn = self.button(button)
             if btn:
@@ -142,6 +180,7 @@ class ImportExportWizard(QWizard):
         table_name: str | None,
         file_path: str,
         import_mode: str,
+        progress: ExchangeProgress | None = None,
     ) -> tuple[str, bool]:
         self._ensure_permissions()
         actor_id = self.session.user_id
@@ -151,6 +190,8 @@ class ImportExportWizard(QWizard):
                     file_path=file_path,
                     exported_by=self.session.login,
                     actor_id=actor_id,
+                    write_only=True,
+                    progress=progress,
                 )
                 total = sum(excel_result["counts"].values())
                 return f"{total} записей", False
@@ -177,15 +218,34 @@ class ImportExportWizard(QWizard):
                     file_path=file_path,
                     exported_by=self.session.login,
                     actor_id=actor_id,
+                    progress=progress,
                 )
                 total = sum(zip_result["counts"].values())
                 return f"{total} записей", False
+            if fmt == "sqlite_zip":
+                snapshot_result = self.exchange_service.export_sqlite(
+                    file_path=file_path,
+                    exported_by=self.session.login,
+                    actor_id=actor_id,
+                )
+                total = sum(snapshot_result["counts"].values())
+                return f"{total} записей", False
+            if fmt == "jsonl_zip":
+                jsonl_result = self.exchange_service.export_jsonl(
+                    file_path=file_path,
+                    exported_by=self.session.login,
+                    actor_id=actor_id,
+                )
+                total = sum(jsonl_result["counts"].values())
+                return f"{total} записей", False
             if fmt == "form100_zip":
                 form100_result = self.exchange_service.export_form100_package_zip(
                     file_path=file_path,
                     exported_by=self.session.login,
                     actor_id=actor_id,
                     card_id=None,
+                    progress=progress,
+                    workers=DEFAULT_EXPORT_WORKERS,
                 )
                 counts = cast(dict[str, int], cast(dict[str, object], form100_result).get("counts", {}))
                 total = sum(counts.values())
@@ -193,7 +253,10 @@ class ImportExportWizard(QWizard):
         else:
             if fmt == "excel":
                 excel_import_result = self.exchange_service.import_excel(
-                    file_path=file_path, actor_id=actor_id, mode=import_mode
+                    file_path=file_path,
+                    actor_id=actor_id,
+                    mode=import_mode,
+                    progress=progress,
                 )
                 return self._format_import_result(excel_import_result)
             if fmt == "csv":
@@ -204,13 +267,15 @@ class ImportExportWizard(QWizard):
                     table_name=table_name,
                     actor_id=actor_id,
                     mode=import_mode,
+                    progress=progress,
                 )
                 return self._format_import_result(csv_import_result)
-            if fmt == "zip":
+            if fmt in {"zip", "sqlite_zip", "jsonl_zip"}:
                 zip_import_result = self.exchange_service.import_zip(
                     file_path=file_path,
                     actor_id=actor_id,
                     mode=import_mode,
+                    progress=progress,
                 )
                 return self._format_import_result(zip_import_result)
             if fmt == "form100_zip":
@@ -218,6 +283,7 @@ class ImportExportWizard(QWizard):
                     file_path=file_path,
                     actor_id=actor_id,
                     mode=import_mode,
+                    progress=progress,
                 )
                 return self._format_import_result(cast(Mapping[str, object], form100_import_result))
 
@@ -255,6 +321,22 @@ class ImportExportWizard(QWizard):
         return " | ".join(message_parts), errors > 0
 
 
+def _format_progress(event: ExchangeProgressEvent, table_labels: Mapping[str, str]) -> str:
+    table_rows = event["table_rows"]
+    parts = []
+    table = event["table"]
+    if table:
+        parts.append(f"{table_labels.get(table, table)}: {table_rows.get(table, 0)} строк")
+    parts.append(f"всего строк: {sum(table_rows.values())}")
+    done_mb = event["bytes_done"] / _BYTES_PER_MB
+    bytes_total = event["bytes_total"]
+    if bytes_total:
+        parts.append(f"{done_mb:.1f} из {bytes_total / _BYTES_PER_MB:.1f} МБ")
+    elif event["bytes_done"]:
+        parts.append(f"{done_mb:.1f} МБ")
+    return " · ".join(parts)
+
+
 def _to_int(value: object) -> int:
     if isinstance(value, bool):
         return int(value)
@@ -292,6 +374,8 @@ class DirectionPage(QWizardPage):
         self.format.addItem("CSV", "csv")
         self.format.addItem("PDF", "pdf")
         self.format.addItem("ZIP", "zip")
+        self.format.addItem("ZIP (снимок SQLite)", "sqlite_zip")
+        self.format.addItem("ZIP (JSON Lines)", "jsonl_zip")
         self.format.addItem("Form100 ZIP", "form100_zip")
         connect_combo_autowidth(self.format)
         self.format.currentIndexChanged.connect(self._sync_state)
@@ -352,6 +436,14 @@ class DirectionPage(QWizardPage):
             if is_import:
                 return "ZIP импортирует полный пакет обмена. Можно обновлять записи или только добавлять новые."
             return "ZIP экспортирует полный пакет обмена со служебным manifest и Excel-файлом."
+        if fmt == "sqlite_zip":
+            if is_import:
+                return "Снимок SQLite подключается к базе и сливается пакетно — быстрее Excel на больших объёмах."
+            return "ZIP со снимком SQLite: компактная копия таблиц обмена для быстрой загрузки в другую базу."
+        if fmt == "jsonl_zip":
+            if is_import:
+                return "JSON Lines читается построчно и записывается пакетами — подходит для очень больших выгрузок."
+            return "ZIP с файлом JSON Lines на каждую таблицу: машинный формат обмена, строки пишутся потоково."
         if fmt == "form100_zip":
             return "Form100 ZIP работает как архив специализированного обмена карточками Формы 100."
         return ""
@@ -449,6 +541,10 @@ class PreviewPage(QWizardPage):
         self.summary_label = QLabel("Проверьте параметры и файл перед запуском.")
         self.summary_label.setWordWrap(True)
         layout.addWidget(self.summary_label)
+        self.progress_label = QLabel()
+        self.progress_label.setWordWrap(True)
+        self.progress_label.setVisible(False)
+        layout.addWidget(self.progress_label)
         self.preview_table = QTableWidget(0, 0)
         self.preview_table.horizontalHeader().setStretchLastSection(True)
         self.preview_table.verticalHeader().setVisible(False)
@@ -27,7 +27,11 @@ from PySide6.QtWidgets import (
 )
 
 from app.application.dto.auth_dto import SessionContext
-from app.application.dto.lab_dto import LabSampleResponse
+from app.application.dto.lab_dto import (
+    LabSampleListFilters,
+    LabSampleListPage,
+    LabSampleResponse,
+)
 from app.application.services.lab_service import LabService
 from app.application.services.reference_service import ReferenceService
 from app.ui.lab.lab_sample_detail import LabSampleDetailDialog
@@ -734,22 +738,19 @@ class LabSamplesView(QWidget):
         style.polish(self._context_badge)
         self._context_badge.update()
 
-    def _update_kpis(self, samples: list[LabSampleResponse] | None) -> None:
-        if samples is None:
+    def _update_kpis(self, page: LabSampleListPage | None) -> None:
+        if page is None:
             for spec in LAB_KPI_SPECS:
                 widgets = self._kpi_widgets[spec.key]
                 widgets.value_label.setText("0")
                 widgets.detail_label.setText("Выберите пациента")
             return
 
-        positive_count = sum(1 for sample in samples if sample.growth_flag == 1)
-        negative_count = sum(1 for sample in samples if sample.growth_flag == 0)
-        pending_count = sum(1 for sample in samples if sample.growth_flag is None)
         values = {
-            "total": len(samples),
-            "positive": positive_count,
-            "negative": negative_count,
-            "pending": pending_count,
+            "total": page.total,
+            "positive": page.positive,
+            "negative": page.negative,
+            "pending": page.pending,
         }
         for spec in LAB_KPI_SPECS:
             widgets = self._kpi_widgets[spec.key]
@@ -862,15 +863,10 @@ class LabSamplesView(QWidget):
         self._load_microbe_map()
         self._update_filter_summary()
 
-        samples = self.lab_service.list_samples(self.patient_id, self.emr_case_id)
-        self._update_kpis(samples)
-        filtered_samples = sorted(
-            self._apply_filters(samples),
-            key=lambda sample: (sample.taken_at is None, sample.taken_at),
-            reverse=True,
-        )
+        page = self._load_page()
+        self._update_kpis(page)
 
-        if not samples:
+        if page.total == 0:
             self.count_label.setText("В текущем контексте 0 проб")
             self._add_empty_state(
                 "Проб пока нет",
@@ -881,8 +877,8 @@ class LabSamplesView(QWidget):
             self._sync_action_state()
             return
 
-        if not filtered_samples:
-            self.count_label.setText(f"Найдено 0 из {len(samples)}")
+        if page.filtered_total == 0:
+            self.count_label.setText(f"Найдено 0 из {page.total}")
             self._add_empty_state(
                 "Ничего не найдено",
                 "Попробуйте смягчить условия поиска или сбросить активные фильтры.",
@@ -892,8 +888,7 @@ class LabSamplesView(QWidget):
             self._sync_action_state()
             return
 
-        page_items, start, end = self._paginate(filtered_samples)
-        for sample in page_items:
+        for sample in page.items:
             item = QListWidgetItem()
             item.setData(Qt.ItemDataRole.UserRole, sample.id)
             card = self._build_sample_item(sample)
@@ -901,12 +896,38 @@ class LabSamplesView(QWidget):
             self.list_widget.addItem(item)
             self.list_widget.setItemWidget(item, card)
 
-        self.count_label.setText(self._list_summary_text(len(samples), len(filtered_samples), start, end))
-        self._update_paging(len(filtered_samples))
+        start = (self.page_index - 1) * self.page_size + 1
+        end = start + len(page.items) - 1
+        self.count_label.setText(self._list_summary_text(page.total, page.filtered_total, start, end))
+        self._update_paging(page.filtered_total)
         if self.list_widget.count() > 0:
             self.list_widget.setCurrentRow(0)
         self._sync_action_state()
 
+    def _load_page(self) -> LabSampleListPage:
+        assert self.patient_id is not None
+        self.page_index = max(1, self.page_index)
+        filters = self._current_filters()
+        page = self.lab_service.list_samples_page(
+            self.patient_id,
+            self.emr_case_id,
+            filters=filters,
+            limit=self.page_size,
+            offset=(self.page_index - 1) * self.page_size,
+        )
+        total_pages = max(1, (page.filtered_total + self.page_size - 1) // self.page_size)
+        if self.page_index > total_pages:
+            # Текущая страница исчезла (удаление, смена фильтра) — показываем последнюю.
+            self.page_index = total_pages
+            page = self.lab_service.list_samples_page(
+                self.patient_id,
+                self.emr_case_id,
+                filters=filters,
+                limit=self.page_size,
+                offset=(self.page_index - 1) * self.page_size,
+            )
+        return page
+
     def refresh_references(self) -> None:
         self.references_updated.emit()
 
@@ -1024,38 +1045,11 @@ class LabSamplesView(QWidget):
             return None
         return cast(date, qdate.toPython())
 
-    def _apply_filters(self, samples: list[LabSampleResponse]) -> list[LabSampleResponse]:
-        search = self.search_input.text().strip().lower()
-        growth = self.growth_filter.currentData()
-        material_id = self.material_filter.currentData()
-        date_from = self._date_value(self.date_from)
-        date_to = self._date_value(self.date_to)
-        filtered: list[LabSampleResponse] = []
-        for sample in samples:
-            if search and search not in (sample.lab_no or "").lower():
-                continue
-            if growth is not None and sample.growth_flag != growth:
-                continue
-            if material_id is not None and sample.material_type_id != material_id:
-                continue
-            taken = sample.taken_at.date() if sample.taken_at else None
-            if date_from and (taken is None or taken < date_from):
-                continue
-            if date_to and (taken is None or taken > date_to):
-                continue
-            filtered.append(sample)
-        return filtered
-
-    def _paginate(self, samples: list[LabSampleResponse]) -> tuple[list[LabSampleResponse], int, int]:
-        total = len(samples)
-        total_pages = max(1, (total + self.page_size - 1) // self.page_size)
-        if self.page_index > total_pages:
-            self.page_index = total_pages
-        if self.page_index < 1:
-            self.page_index = 1
-        start_index = (self.page_index - 1) * self.page_size
-        end_index = min(start_index + self.page_size, total)
-        page_items = samples[start_index:end_index]
-        start_label = start_index + 1 if total > 0 else 0
-        end_label = end_index if total > 0 else 0
-        return page_items, start_label, end_label
+    def _current_filters(self) -> LabSampleListFilters:
+        return LabSampleListFilters(
+            lab_no=self.search_input.text().strip() or None,
+            growth_flag=self.growth_filter.currentData(),
+            material_type_id=self.material_filter.currentData(),
+            taken_from=self._date_value(self.date_from),
+            taken_to=self._date_value(self.date_to),
+        )
@@ -458,6 +458,7 @@ class MainWindow(QMainWindow):
         self._exchange_view = ImportExportView(
             exchange_service=self.container.exchange_service,
             session=self.session,
+            on_data_changed=self._notify_data_changed,
         )
         self._form100_view = Form100ViewV2(
             form100_service=self.container.form100_v2_service,
@@ -642,8 +642,7 @@ class PatientEmkView(QWidget):
 
         self._set_status("Загрузка госпитализаций...", "info")
         try:
-            cases = self.emz_service.list_cases_by_patient(patient_id)
-            self._cases_cache = [(self.emz_service.get_current(case.id), case) for case in cases]
+            self._cases_cache = self.emz_service.list_case_details_by_patient(patient_id)
             self._apply_case_filters()
             self._set_status("")
         except _HANDLED_UI_ERRORS as exc:
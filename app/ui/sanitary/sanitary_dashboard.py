@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import date, datetime
+from datetime import date
 from typing import cast
 
 from PySide6.QtCore import QDate, QSignalBlocker, Qt, QTimer, Signal
@@ -54,7 +54,6 @@ class SanitaryKpiWidgets:
 class SanitaryDepartmentEntry:
     dep_id: int
     name: str
-    filtered_samples: list[SanitarySampleResponse]
     total_count: int
     positive_count: int
     pending_count: int
@@ -725,6 +724,12 @@ class SanitaryDashboard(QWidget):
         if from_date and to_date and from_date > to_date:
             from_date, to_date = to_date, from_date
 
+        overview = {
+            item.department_id: item
+            for item in self.sanitary_service.get_department_overview(
+                date_from=from_date, date_to=to_date, growth=growth_filter
+            )
+        }
         entries: list[SanitaryDepartmentEntry] = []
         for department in departments:
             dep_name = str(department.name)
@@ -732,26 +737,30 @@ class SanitaryDashboard(QWidget):
                 continue
 
             dep_id = cast(int, department.id)
-            samples = list(self.sanitary_service.list_samples_by_department(dep_id))
-            filtered_samples = [
-                sample
-                for sample in samples
-                if self._sample_matches_date_filter(sample, date_from=from_date, date_to=to_date)
-            ]
-            if not self._department_matches_growth_filter(filtered_samples, growth_filter):
+            item = overview.get(dep_id)
+            if item is None:
+                # Отделение без проб в периоде не может удовлетворить фильтру по результату.
+                if growth_filter is not None:
+                    continue
+                entries.append(
+                    SanitaryDepartmentEntry(
+                        dep_id=dep_id,
+                        name=dep_name,
+                        total_count=0,
+                        positive_count=0,
+                        pending_count=0,
+                        last_sample=None,
+                    )
+                )
                 continue
-
-            positive_count = sum(1 for sample in filtered_samples if sample.growth_flag == 1)
-            pending_count = sum(1 for sample in filtered_samples if sample.growth_flag is None)
             entries.append(
                 SanitaryDepartmentEntry(
                     dep_id=dep_id,
                     name=dep_name,
-                    filtered_samples=filtered_samples,
-                    total_count=len(filtered_samples),
-                    positive_count=positive_count,
-                    pending_count=pending_count,
-                    last_sample=self._find_last_sample(filtered_samples),
+                    total_count=item.total_count,
+                    positive_count=item.positive_count,
+                    pending_count=item.pending_count,
+                    last_sample=item.last_sample,
                 )
             )
 
@@ -768,43 +777,6 @@ class SanitaryDashboard(QWidget):
             return [], "filtered_out"
         return entries, None
 
-    def _sample_matches_date_filter(
-        self,
-        sample: SanitarySampleResponse,
-        *,
-        date_from: date | None,
-        date_to: date | None,
-    ) -> bool:
-        if date_from is None and date_to is None:
-            return True
-        if sample.taken_at is None:
-            return False
-        sample_date = sample.taken_at.date()
-        if date_from is not None and sample_date < date_from:
-            return False
-        return not (date_to is not None and sample_date > date_to)
-
-    def _department_matches_growth_filter(
-        self,
-        samples: list[SanitarySampleResponse],
-        growth_filter: int | None,
-    ) -> bool:
-        if growth_filter is None:
-            return True
-        if growth_filter == 1:
-            return any(sample.growth_flag == 1 for sample in samples)
-        if growth_filter == 0:
-            return any(sample.growth_flag == 0 for sample in samples)
-        if growth_filter == -1:
-            return any(sample.growth_flag is None for sample in samples)
-        return True
-
-    def _find_last_sample(self, samples: list[SanitarySampleResponse]) -> SanitarySampleResponse | None:
-        taken_samples = [sample for sample in samples if sample.taken_at is not None]
-        if not taken_samples:
-            return None
-        return max(taken_samples, key=lambda sample: cast(datetime, sample.taken_at))
-
     def _sample_taken_text(self, sample: SanitarySampleResponse | None) -> str:
         if sample is None or sample.taken_at is None:
             return "-"
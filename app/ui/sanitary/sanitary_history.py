@@ -28,7 +28,12 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from app.application.dto.sanitary_dto import SanitarySampleResultUpdate
+from app.application.dto.sanitary_dto import (
+    SanitarySampleListCursor,
+    SanitarySampleListFilters,
+    SanitarySampleListPage,
+    SanitarySampleResultUpdate,
+)
 from app.application.exceptions import AppError
 from app.application.services.reference_service import ReferenceService
 from app.application.services.sanitary_sample_payload_service import (
@@ -46,10 +51,7 @@ from app.ui.sanitary.history_view_helpers import (
     HistorySummary,
     build_sample_context_line,
     build_sample_details_line,
-    filter_and_sort_samples,
-    paginate_samples,
     resolve_micro_text,
-    summarize_history,
 )
 from app.ui.widgets.button_utils import compact_button
 from app.ui.widgets.datetime_inputs import create_optional_datetime_edit, optional_datetime_value
@@ -90,6 +92,8 @@ class SanitaryHistoryDialog(QDialog):
         self._last_empty_state: str | None = None
         self.page_index = 1
         self.page_size = 50
+        # Ключи начала страниц: _page_cursors[i] открывает страницу i + 1.
+        self._page_cursors: list[SanitarySampleListCursor | None] = [None]
         self.setWindowTitle(f"Санитарные пробы - {department_name}")
         parent_signal = getattr(parent, "references_updated", None)
         if parent_signal is not None and hasattr(parent_signal, "connect"):
@@ -351,37 +355,33 @@ class SanitaryHistoryDialog(QDialog):
     def refresh(self) -> None:
         self.list_widget.clear()
         self._load_microbe_map()
-        samples = list(self.sanitary_service.list_samples_by_department(self.department_id))
         search = self.search_input.text().strip().lower()
         growth = self.growth_filter.currentData()
         date_from = self._date_value(self.date_from)
         date_to = self._date_value(self.date_to)
-        filtered = filter_and_sort_samples(
-            samples,
-            search=search,
-            growth=growth,
-            date_from=date_from,
-            date_to=date_to,
+        filters = SanitarySampleListFilters(
+            lab_no=search or None,
+            growth_flag=growth,
+            taken_from=date_from,
+            taken_to=date_to,
         )
-        page_state = paginate_samples(
-            filtered,
-            page_index=self.page_index,
-            page_size=self.page_size,
+        page = self._load_page(filters)
+        shown = len(page.items)
+        last_taken_text = page.last_taken_at.strftime("%d.%m.%Y %H:%M") if page.last_taken_at else "-"
+        self._update_summary(
+            HistorySummary(total=page.filtered_total, positives=page.positive, last_taken_text=last_taken_text),
+            shown,
         )
-        self.page_index = page_state.page_index
-        summary = summarize_history(filtered)
-        shown = len(page_state.page_items)
-        self._update_summary(summary, shown)
         self._update_filter_summary(
             search=search,
             growth=growth,
             date_from=date_from,
             date_to=date_to,
         )
-        self.list_summary_label.setText(f"Найдено {summary.total} проб • показано {shown}")
+        self.list_summary_label.setText(f"Найдено {page.filtered_total} проб • показано {shown}")
 
-        if not page_state.page_items:
-            if not samples:
+        if not page.items:
+            if page.total == 0:
                 self._add_empty_item(
                     "no_data",
                     "Проб пока нет",
@@ -393,18 +393,41 @@ class SanitaryHistoryDialog(QDialog):
                     "По фильтрам ничего не найдено",
                     "Попробуйте ослабить условия отбора или нажать «Сбросить».",
                 )
-            self._update_paging(summary.total)
+            self._update_paging(page.filtered_total)
             return
 
         self._last_empty_state = None
-        for sample in page_state.page_items:
+        for sample in page.items:
             item = QListWidgetItem()
             item.setData(Qt.ItemDataRole.UserRole, sample.id)
             card = self._build_sample_item(sample)
             item.setSizeHint(card.sizeHint().expandedTo(card.minimumSizeHint()))
             self.list_widget.addItem(item)
             self.list_widget.setItemWidget(item, card)
-        self._update_paging(summary.total)
+        self._update_paging(page.filtered_total)
+
+    def _load_page(self, filters: SanitarySampleListFilters) -> SanitarySampleListPage:
+        self.page_index = min(max(1, self.page_index), len(self._page_cursors))
+        page = self.sanitary_service.list_samples_page(
+            self.department_id,
+            filters=filters,
+            limit=self.page_size,
+            after=self._page_cursors[self.page_index - 1],
+        )
+        if not page.items and self.page_index > 1:
+            # Страница опустела (пробы удалены или изменены) — начинаем с первой.
+            self._reset_paging()
+            page = self.sanitary_service.list_samples_page(
+                self.department_id, filters=filters, limit=self.page_size
+            )
+        del self._page_cursors[self.page_index :]
+        if page.next_cursor is not None:
+            self._page_cursors.append(page.next_cursor)
+        return page
+
+    def _reset_paging(self) -> None:
+        self.page_index = 1
+        self._page_cursors = [None]
 
     def _build_sample_item(self, sample: Any) -> QWidget:
         wrapper = QWidget()
@@ -492,7 +515,7 @@ class SanitaryHistoryDialog(QDialog):
         self.list_widget.setItemWidget(item, card)
 
     def _on_filter_changed(self) -> None:
-        self.page_index = 1
+        self._reset_paging()
         self.refresh()
 
     def _clear_filters(self) -> None:
@@ -500,7 +523,7 @@ class SanitaryHistoryDialog(QDialog):
         self.growth_filter.setCurrentIndex(0)
         self.date_from.setDate(self._date_empty)
         self.date_to.setDate(self._date_empty)
-        self.page_index = 1
+        self._reset_paging()
         self.refresh()
 
     def _on_page_size_changed(self) -> None:
@@ -508,7 +531,7 @@ class SanitaryHistoryDialog(QDialog):
             self.page_size = int(self.page_size_combo.currentText())
         except ValueError:
             self.page_size = 50
-        self.page_index = 1
+        self._reset_paging()
         self.refresh()
 
     def _prev_page(self) -> None:
@@ -517,8 +540,9 @@ class SanitaryHistoryDialog(QDialog):
             self.refresh()
 
     def _next_page(self) -> None:
-        self.page_index += 1
-        self.refresh()
+        if self.page_index < len(self._page_cursors):
+            self.page_index += 1
+            self.refresh()
 
     def _update_summary(self, summary: HistorySummary, shown: int) -> None:
         self._summary_total_value.setText(str(summary.total))
@@ -553,7 +577,7 @@ class SanitaryHistoryDialog(QDialog):
             self.page_index = total_pages
         self.page_label.setText(f"Стр. {self.page_index} / {total_pages}")
         self.prev_btn.setEnabled(self.page_index > 1)
-        self.next_btn.setEnabled(self.page_index < total_pages)
+        self.next_btn.setEnabled(self.page_index < len(self._page_cursors))
         if total == 0:
             self.page_label.setText("Стр. 1 / 1")
             self.prev_btn.setEnabled(False)
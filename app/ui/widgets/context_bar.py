@@ -461,7 +461,7 @@ class ContextBar(QWidget):
             self._completer_model.setStringList([])
             return
         try:
-            patients = self.patient_service.search_by_name(query, limit=10)
+            patients = self.patient_service.autocomplete(query, limit=10)
         except (LookupError, RuntimeError, ValueError) as exc:
             logging.getLogger(__name__).debug("Autocomplete lookup by patient name failed: %s", exc)
             self._completer_model.setStringList([])
@@ -5,13 +5,22 @@ from pathlib import Path
 from typing import cast
 
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, sessionmaker
 
-from app.application.dto.emz_dto import EmzCreateRequest, EmzUpdateRequest, EmzVersionPayload
+from app.application.dto.emz_dto import (
+    EmzAntibioticCourseDto,
+    EmzCreateRequest,
+    EmzDiagnosisDto,
+    EmzInterventionDto,
+    EmzIsmpDto,
+    EmzUpdateRequest,
+    EmzVersionPayload,
+)
 from app.application.exceptions import PermissionError as AppPermissionError
 from app.application.services.emz_service import EmzService
-from app.domain.constants import MilitaryCategory
+from app.domain.constants import IsmpType, MilitaryCategory
 from app.infrastructure.db import models_sqlalchemy as models
 from app.infrastructure.db.models_sqlalchemy import Base
 from app.infrastructure.db.repositories.user_repo import UserRepository
@@ -285,3 +294,63 @@ def test_update_case_meta_requires_actor_id(tmp_path: Path) -> None:
             department_id=None,
             actor_id=cast(int, None),
         )
+
+
+def test_list_case_details_by_patient_matches_get_current_with_fixed_queries(tmp_path: Path) -> None:
+    session_factory = make_session_factory(tmp_path / "emr_bulk_details.db")
+    actor_id = seed_admin(session_factory)
+    service = EmzService(session_factory=session_factory)
+
+    created = []
+    for index in range(3):
+        payload = EmzVersionPayload(
+            admission_date=datetime(2025, 12, 15 + index, 10, 0, tzinfo=UTC),
+            injury_date=datetime(2025, 12, 10, 9, 0, tzinfo=UTC),
+            severity="moderate",
+            diagnoses=[
+                EmzDiagnosisDto(kind="admission", icd10_code="S31.0", free_text=f"Ранение {index}"),
+                EmzDiagnosisDto(kind="complication", free_text="Сепсис"),
+            ],
+            interventions=[EmzInterventionDto(type="ПХО", notes=f"Вмешательство {index}")],
+            antibiotic_courses=[EmzAntibioticCourseDto(drug_name_free="Цефтриаксон", dose="1 г")],
+            ismp_cases=[EmzIsmpDto(ismp_type=IsmpType.SSI.value, start_date=date(2025, 12, 18))]
+            if index == 1
+            else [],
+        )
+        created.append(
+            service.create_emr(
+                EmzCreateRequest(
+                    patient_full_name="Петров Пётр",
+                    patient_dob=date(1991, 3, 3),
+                    patient_sex="M",
+                    patient_category=MilitaryCategory.PRIVATE.value,
+                    hospital_case_no=f"CASE-BULK-{index:03d}",
+                    department_id=None,
+                    payload=payload,
+                ),
+                actor_id=actor_id,
+            )
+        )
+    patient_id = service.get_current(created[0].id).patient_id
+
+    statements: list[str] = []
+
+    def _count(_conn, _cursor, statement, _params, _context, _executemany) -> None:
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", _count)
+    try:
+        details = service.list_case_details_by_patient(patient_id)
+    finally:
+        event.remove(Engine, "before_cursor_execute", _count)
+
+    assert len(statements) == 5
+    assert [resp.id for _detail, resp in details] == [
+        resp.id for resp in service.list_cases_by_patient(patient_id)
+    ]
+    for detail, resp in details:
+        assert detail == service.get_current(resp.id)
+        assert resp.version_no == 1
+    by_id = {detail.id: detail for detail, _resp in details}
+    assert [item.ismp_type for item in by_id[created[1].id].ismp_cases] == [IsmpType.SSI.value]
+    assert by_id[created[2].id].diagnoses[0].free_text == "Ранение 2"
@@ -195,10 +195,12 @@ def test_lab_sample_pdf_headers_match_csv_headers(tmp_path: Path, monkeypatch: A
     original_table = exchange_module.Table
 
     def capture_table(data: list[list[object]], *args: object, **kwargs: object) -> object:
-        captured_headers[:] = [
-            cast(str, cell.getPlainText()) if hasattr(cell, "getPlainText") else str(cell)
-            for cell in data[0]
-        ]
+        # Первой создаётся таблица шапки, дальше идут куски строк данных.
+        if not captured_headers:
+            captured_headers[:] = [
+                cast(str, cell.getPlainText()) if hasattr(cell, "getPlainText") else str(cell)
+                for cell in data[0]
+            ]
         return original_table(data, *args, **kwargs)
 
     monkeypatch.setattr(exchange_module, "Table", capture_table)
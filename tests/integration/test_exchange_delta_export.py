@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import zipfile
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from app.application.services.exchange_service import ExchangeService
+from app.infrastructure.db import models_sqlalchemy as models
+from app.infrastructure.security.sha256 import sha256_file
+from tests.integration.test_exchange_service_import_reports import make_session_factory, seed_actor
+
+
+def _add_patient(session_factory, full_name: str) -> int:
+    with session_factory() as session:
+        patient = models.Patient(
+            full_name=full_name,
+            dob=date(1990, 1, 1),
+            sex="M",
+            category="контроль",
+            military_unit="1 рота",
+            military_district="ЦВО",
+        )
+        session.add(patient)
+        session.flush()
+        return int(patient.id)
+
+
+def test_export_delta_packages_only_rows_changed_since_package(tmp_path: Path) -> None:
+    source = make_session_factory(tmp_path / "source.db")
+    actor_id = seed_actor(source)
+    service = ExchangeService(session_factory=source)
+    first_id = _add_patient(source, "Иванов Иван")
+    _add_patient(source, "Петров Пётр")
+    with source() as session:
+        session.add(models.Department(name="Хирургия"))
+
+    full = service.export_zip(tmp_path / "full.zip", exported_by="unit", actor_id=actor_id)
+    with source() as session:
+        base_package = session.query(models.DataExchangePackage).one()
+        patient = session.get(models.Patient, first_id)
+        assert patient is not None
+        patient.full_name = "Иванов Иван Иванович"
+    new_id = _add_patient(source, "Сидоров Сидор")
+
+    delta = service.export_delta(tmp_path / "delta.zip", since_package_id=int(base_package.id), actor_id=actor_id)
+
+    assert full["counts"]["patients"] == 2
+    assert delta["counts"]["patients"] == 2
+    assert delta["counts"]["departments"] == 0
+    assert delta["since_package_id"] == base_package.id
+    with zipfile.ZipFile(delta["path"]) as zf:
+        manifest = json.loads(zf.read("manifest.json"))
+    assert manifest["delta"]["since_change_seq"] == base_package.change_seq
+    assert manifest["delta"]["change_seq"] == delta["change_seq"]
+
+    empty = service.export_delta(tmp_path / "empty.zip", since_package_id=delta["package_id"], actor_id=actor_id)
+    assert sum(empty["counts"].values()) == 0
+
+    target = make_session_factory(tmp_path / "target.db")
+    target_actor_id = seed_actor(target)
+    target_service = ExchangeService(session_factory=target)
+    target_service.import_zip(full["path"], actor_id=target_actor_id)
+    first_run = target_service.import_zip(delta["path"], actor_id=target_actor_id)
+    second_run = target_service.import_zip(delta["path"], actor_id=target_actor_id)
+
+    assert (first_run["summary"]["added"], first_run["summary"]["updated"]) == (1, 1)
+    assert (second_run["summary"]["added"], second_run["summary"]["updated"]) == (0, 2)
+    assert second_run["error_count"] == 0
+    with target() as session:
+        names = {int(p.id): str(p.full_name) for p in session.query(models.Patient).all()}
+        formats = [p.package_format for p in session.query(models.DataExchangePackage).all()]
+    assert names[first_id] == "Иванов Иван Иванович"
+    assert names[new_id] == "Сидоров Сидор"
+    assert len(names) == 3
+    assert formats.count("zip+delta") == 2
+
+    with pytest.raises(ValueError, match="merge"):
+        target_service.import_zip(delta["path"], actor_id=target_actor_id, mode="append")
+
+
+def test_export_delta_carries_deleted_rows(tmp_path: Path) -> None:
+    source = make_session_factory(tmp_path / "source_deletes.db")
+    actor_id = seed_actor(source)
+    service = ExchangeService(session_factory=source)
+    kept_id = _add_patient(source, "Иванов Иван")
+    removed_id = _add_patient(source, "Петров Пётр")
+    full = service.export_zip(tmp_path / "full.zip", exported_by="unit", actor_id=actor_id)
+    # Строка, созданная и удалённая между выгрузками, на приёмнике отсутствует — её надгробие безвредно.
+    transient_id = _add_patient(source, "Сидоров Сидор")
+    with source() as session:
+        base_package = session.query(models.DataExchangePackage).one()
+        session.query(models.Patient).filter(models.Patient.id.in_([removed_id, transient_id])).delete()
+
+    delta = service.export_delta(tmp_path / "delta.zip", since_package_id=int(base_package.id), actor_id=actor_id)
+
+    assert delta["counts"]["patients"] == 0
+    assert delta["deleted"] == {"patients": 2}
+    with zipfile.ZipFile(delta["path"]) as zf:
+        manifest = json.loads(zf.read("manifest.json"))
+    assert manifest["delta"]["deleted"] == {"patients": [str(removed_id), str(transient_id)]}
+    next_delta = service.export_delta(tmp_path / "next.zip", since_package_id=delta["package_id"], actor_id=actor_id)
+    assert next_delta["deleted"] == {}
+
+    target = make_session_factory(tmp_path / "target_deletes.db")
+    target_actor_id = seed_actor(target)
+    target_service = ExchangeService(session_factory=target)
+    target_service.import_zip(full["path"], actor_id=target_actor_id)
+    first_run = target_service.import_zip(delta["path"], actor_id=target_actor_id)
+    second_run = target_service.import_zip(delta["path"], actor_id=target_actor_id)
+
+    assert first_run["deleted"] == {"patients": 1}
+    assert second_run["deleted"] == {"patients": 0}
+    with target() as session:
+        assert [int(p.id) for p in session.query(models.Patient).all()] == [kept_id]
+
+
+def test_export_delta_requires_tracked_export_package(tmp_path: Path) -> None:
+    session_factory = make_session_factory(tmp_path / "delta_base.db")
+    actor_id = seed_actor(session_factory)
+    service = ExchangeService(session_factory=session_factory)
+    with session_factory() as session:
+        legacy = models.DataExchangePackage(
+            direction="export",
+            package_format="zip+excel",
+            file_path="legacy.zip",
+            sha256="0" * 64,
+            created_by=actor_id,
+        )
+        session.add(legacy)
+        session.flush()
+        legacy_id = int(legacy.id)
+
+    with pytest.raises(ValueError, match="не найден"):
+        service.export_delta(tmp_path / "missing.zip", since_package_id=legacy_id + 1, actor_id=actor_id)
+    with pytest.raises(ValueError, match="полную выгрузку"):
+        service.export_delta(tmp_path / "legacy.zip", since_package_id=legacy_id, actor_id=actor_id)
+
+
+def test_zip_packages_report_archive_hash_and_manifest_last(tmp_path: Path) -> None:
+    session_factory = make_session_factory(tmp_path / "package_hash.db")
+    actor_id = seed_actor(session_factory)
+    service = ExchangeService(session_factory=session_factory)
+    _add_patient(session_factory, "Иванов Иван")
+
+    results = [
+        service.export_zip(tmp_path / "excel.zip", actor_id=actor_id),
+        service.export_jsonl(tmp_path / "jsonl.zip", actor_id=actor_id),
+        service.export_sqlite(tmp_path / "sqlite.zip", actor_id=actor_id),
+    ]
+
+    with session_factory() as session:
+        logged = {package.file_path: package.sha256 for package in session.query(models.DataExchangePackage).all()}
+    for result in results:
+        assert result["sha256"] == sha256_file(Path(result["path"]))
+        assert logged[result["path"]] == result["sha256"]
+        with zipfile.ZipFile(result["path"]) as zf:
+            assert zf.namelist()[-1] == "manifest.json"
+            manifest = json.loads(zf.read("manifest.json"))
+            for entry in manifest["files"]:
+                assert hashlib.sha256(zf.read(entry["name"])).hexdigest() == entry["sha256"]
@@ -8,10 +8,16 @@ from contextlib import AbstractContextManager, contextmanager
 from datetime import UTC, date, datetime
 from pathlib import Path
 
+import pytest
 from openpyxl import Workbook, load_workbook
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, sessionmaker
 
+from app.application.dto.exchange_dto import ExchangeProgressEvent
+from app.application.exceptions import OperationCancelledError
+from app.application.services import exchange_service
+from app.application.services.exchange_progress import ExchangeProgress
 from app.application.services.exchange_service import (
     _EXPORT_BATCH_SIZE,
     EXCEL_SHEET_TITLES,
@@ -88,6 +94,53 @@ def test_import_csv_returns_error_report_and_log(tmp_path: Path) -> None:
     assert str(patients[0].full_name) == "Иванов Иван"
 
 
+def test_import_csv_writes_batches_and_bisects_failed_rows(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(exchange_service, "_IMPORT_BATCH_SIZE", 4)
+    session_factory = make_session_factory(tmp_path / "exchange_csv_batches.db")
+    actor_id = seed_actor(session_factory)
+    service = ExchangeService(session_factory=session_factory)
+    with session_factory() as session:
+        session.add(models.Patient(id=1, full_name="Иванов Иван", sex="M", category="cat"))
+    csv_path = tmp_path / "emr_case.csv"
+    case_numbers = ["A-1", "A-2", "A-1", "A-3", "A-4", "A-2", "A-5"]
+    with csv_path.open("w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "patient_id", "hospital_case_no", "created_at"])
+        for case_id, case_no in enumerate(case_numbers, start=1):
+            writer.writerow([case_id, 1, case_no, "2026-01-01T10:00:00+00:00"])
+
+    statements: list[str] = []
+
+    def _count(_conn, _cursor, statement, _params, _context, _executemany) -> None:
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", _count)
+    try:
+        result = service.import_csv(csv_path, "emr_case", actor_id=actor_id, mode="append")
+    finally:
+        event.remove(Engine, "before_cursor_execute", _count)
+
+    assert result["count"] == 5
+    assert result["details"]["emr_case"]["added"] == 5
+    assert result["details"]["emr_case"]["skipped"] == 2
+    assert [(error["row"], error["error_code"]) for error in result["errors"]] == [
+        (4, "import_row_failed"),
+        (7, "import_row_failed"),
+    ]
+    # Точки сохранения ставятся на пакеты и их половины, а не на каждую строку.
+    assert sum(1 for statement in statements if statement.startswith("SAVEPOINT")) < 2 * len(case_numbers)
+    with session_factory() as session:
+        stored = sorted(int(case.id) for case in session.query(models.EmrCase).all())
+    assert stored == [1, 2, 4, 5, 7]
+
+    repeated = service.import_csv(csv_path, "emr_case", actor_id=actor_id, mode="append")
+
+    assert repeated["count"] == 0
+    assert repeated["details"]["emr_case"]["skipped"] == len(case_numbers)
+
+
 def test_import_excel_returns_error_report_and_log(tmp_path: Path) -> None:
     session_factory = make_session_factory(tmp_path / "exchange_excel_report.db")
     actor_id = seed_actor(session_factory)
@@ -122,6 +175,47 @@ def test_import_excel_returns_error_report_and_log(tmp_path: Path) -> None:
     assert str(patients[0].full_name) == "Сидоров Сидор"
 
 
+@pytest.mark.parametrize(("mode", "expected"), [("merge", (2, 1, 0)), ("append", (2, 0, 1))])
+def test_import_excel_upserts_in_batches_and_isolates_failed_rows(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    mode: str,
+    expected: tuple[int, int, int],
+) -> None:
+    monkeypatch.setattr(exchange_service, "_IMPORT_BATCH_SIZE", 2)
+    session_factory = make_session_factory(tmp_path / f"exchange_excel_bulk_{mode}.db")
+    actor_id = seed_actor(session_factory)
+    service = ExchangeService(session_factory=session_factory)
+    xlsx_path = tmp_path / "bulk.xlsx"
+    with session_factory() as session:
+        session.add(models.Patient(id=1, full_name="Старое имя", sex="M", category="cat"))
+
+    wb = Workbook()
+    ws = wb.active
+    assert ws is not None
+    ws.title = "patients"
+    ws.append(["id", "full_name", "sex", "category"])
+    ws.append([1, "Новое имя", "M", "cat"])
+    ws.append([2, "Петров Пётр", "M", "cat"])
+    ws.append([3, None, "M", "cat"])
+    ws.append([None, "Без идентификатора", "F", "cat"])
+    wb.save(xlsx_path)
+
+    result = service.import_excel(xlsx_path, actor_id=actor_id, mode=mode)
+
+    stats = result["details"]["patients"]
+    assert (stats["added"], stats["updated"], stats["skipped"]) == expected
+    assert stats["errors"] == 1
+    assert [(error["scope"], error["row"]) for error in result["errors"]] == [("patients", 4)]
+    with session_factory() as session:
+        names = {int(p.id): str(p.full_name) for p in session.query(models.Patient).all()}
+    assert names[1] == ("Новое имя" if mode == "merge" else "Старое имя")
+    assert names[2] == "Петров Пётр"
+    assert sorted(names.values()) == sorted(
+        ["Новое имя" if mode == "merge" else "Старое имя", "Петров Пётр", "Без идентификатора"]
+    )
+
+
 def test_import_zip_returns_nested_import_error_report(tmp_path: Path) -> None:
     session_factory = make_session_factory(tmp_path / "exchange_zip_report.db")
     actor_id = seed_actor(session_factory)
@@ -398,3 +492,219 @@ def test_export_excel_formats_columns_and_bool_values_for_medical_reading(tmp_pa
     assert headers is not None
     current_column_index = list(headers).index("Текущая версия") + 1
     assert version_sheet.cell(row=2, column=current_column_index).value == "Да"
+
+
+def test_export_excel_write_only_streams_rows_with_same_layout(tmp_path: Path) -> None:
+    session_factory = make_session_factory(tmp_path / "exchange_excel_write_only.db")
+    actor_id = seed_actor(session_factory)
+    service = ExchangeService(session_factory=session_factory)
+    total_patients = _EXPORT_BATCH_SIZE + 3
+    xlsx_path = tmp_path / "streamed_export.xlsx"
+
+    with session_factory() as session:
+        for index in range(total_patients):
+            session.add(
+                models.Patient(
+                    full_name=f"Очень длинное имя пациента для проверки ширины {index:04d}",
+                    dob=date(1990, 1, 1),
+                    sex="M",
+                    category="контроль",
+                    military_unit="1 рота",
+                    military_district="ЦВО",
+                )
+            )
+
+    result = service.export_excel(xlsx_path, exported_by="exchange_admin", actor_id=actor_id, write_only=True)
+
+    assert result["counts"]["patients"] == total_patients
+    workbook = load_workbook(xlsx_path)
+    assert workbook.sheetnames[0] == "meta"
+    assert workbook["meta"].sheet_state == "hidden"
+    assert workbook["meta"]["A1"].value == "schema_version"
+    assert workbook.active is not None
+    assert workbook.active.title != "meta"
+    patient_sheet = workbook[EXCEL_SHEET_TITLES["patients"]]
+    assert patient_sheet.max_row == total_patients + 1
+    assert patient_sheet["B1"].value == "ФИО"
+    assert patient_sheet.column_dimensions["B"].width is not None
+    assert patient_sheet.column_dimensions["B"].width > 13
+    assert patient_sheet["B2"].alignment.wrap_text is True
+    assert patient_sheet["B2"].alignment.vertical == "top"
+
+    with session_factory() as session:
+        session.query(models.Patient).delete()
+    imported = service.import_excel(xlsx_path, actor_id=actor_id, mode="merge")
+
+    assert imported["summary"]["errors"] == 0
+    with session_factory() as session:
+        assert session.query(models.Patient).count() == total_patients
+
+
+def test_export_json_streams_document_across_batches(tmp_path: Path) -> None:
+    session_factory = make_session_factory(tmp_path / "exchange_json_stream.db")
+    actor_id = seed_actor(session_factory)
+    service = ExchangeService(session_factory=session_factory)
+    with session_factory() as session:
+        session.add(models.Department(name="Хирургия"))
+        for index in range(_EXPORT_BATCH_SIZE + 3):
+            session.add(
+                models.Patient(
+                    full_name=f"Пациент {index:04d}",
+                    dob=date(1990, 1, 1),
+                    sex="M",
+                    category="контроль",
+                )
+            )
+
+    result = service.export_json(tmp_path / "exchange.json", exported_by="unit", actor_id=actor_id)
+
+    payload = json.loads(Path(result["path"]).read_text(encoding="utf-8"))
+    assert payload["schema_version"] == "1.0"
+    assert payload["exported_by"] == "unit"
+    assert list(payload["data"]) == list(exchange_service.TABLE_MODELS)
+    assert {name: len(rows) for name, rows in payload["data"].items()} == result["counts"]
+    assert [row["full_name"] for row in payload["data"]["patients"]] == [
+        f"Пациент {index:04d}" for index in range(_EXPORT_BATCH_SIZE + 3)
+    ]
+
+
+def test_jsonl_package_round_trip_streams_tables_and_reports_bad_lines(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(exchange_service, "_IMPORT_BATCH_SIZE", 2)
+    source = make_session_factory(tmp_path / "jsonl_source.db")
+    actor_id = seed_actor(source)
+    service = ExchangeService(session_factory=source)
+    with source() as session:
+        session.add(models.Department(name="Хирургия"))
+        for index in range(5):
+            session.add(
+                models.Patient(
+                    full_name=f"Пациент {index}",
+                    dob=date(1990, 1, 1),
+                    sex="M",
+                    category="контроль",
+                )
+            )
+
+    exported = service.export_jsonl(tmp_path / "exchange.zip", exported_by="unit", actor_id=actor_id)
+
+    assert exported["counts"]["patients"] == 5
+    with zipfile.ZipFile(exported["path"]) as zf:
+        names = zf.namelist()
+        patient_lines = zf.read("patients.jsonl").decode("utf-8").splitlines()
+    assert names[-1] == "manifest.json"
+    assert "departments.jsonl" in names
+    assert [json.loads(line)["full_name"] for line in patient_lines] == [f"Пациент {index}" for index in range(5)]
+
+    target = make_session_factory(tmp_path / "jsonl_target.db")
+    target_actor_id = seed_actor(target)
+    target_service = ExchangeService(session_factory=target)
+    first = target_service.import_zip(exported["path"], actor_id=target_actor_id)
+    second = target_service.import_zip(exported["path"], actor_id=target_actor_id)
+
+    assert first["details"]["patients"] == {"rows": 5, "added": 5, "updated": 0, "skipped": 0, "errors": 0}
+    assert second["details"]["patients"] == {"rows": 5, "added": 0, "updated": 5, "skipped": 0, "errors": 0}
+    with target() as session:
+        assert session.query(models.Patient).count() == 5
+        formats = {package.package_format for package in session.query(models.DataExchangePackage).all()}
+    assert formats == {"zip+jsonl"}
+
+    broken_dir = tmp_path / "broken"
+    broken_dir.mkdir()
+    (broken_dir / "patients.jsonl").write_text(
+        json.dumps({"id": 10, "full_name": "Новый", "sex": "M", "category": "контроль"}, ensure_ascii=False)
+        + "\n{not json\n[1, 2]\n",
+        encoding="utf-8",
+    )
+    with zipfile.ZipFile(tmp_path / "broken.zip", "w") as zf:
+        zf.write(broken_dir / "patients.jsonl", arcname="patients.jsonl")
+        zf.writestr(
+            "manifest.json",
+            json.dumps(
+                {
+                    "schema_version": "1.0",
+                    "files": [{"name": "patients.jsonl", "sha256": sha256_file(broken_dir / "patients.jsonl")}],
+                }
+            ),
+        )
+    broken = target_service.import_zip(tmp_path / "broken.zip", actor_id=target_actor_id)
+
+    assert broken["details"]["patients"] == {"rows": 3, "added": 1, "updated": 0, "skipped": 0, "errors": 2}
+    assert [error["row"] for error in broken["errors"]] == [2, 3]
+
+
+def test_export_pdf_lays_out_rows_in_chunks_with_page_header(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(exchange_service, "_PDF_ROWS_PER_TABLE", 50)
+    session_factory = make_session_factory(tmp_path / "exchange_pdf_chunks.db")
+    actor_id = seed_actor(session_factory)
+    service = ExchangeService(session_factory=session_factory)
+    with session_factory() as session:
+        for index in range(230):
+            session.add(models.Patient(full_name=f"Пациент {index:03d}", sex="M", category="контроль"))
+    table_sizes: list[int] = []
+    original_table = exchange_service.Table
+
+    def capture_table(data: list[list[object]], *args: object, **kwargs: object) -> object:
+        table_sizes.append(len(data))
+        return original_table(data, *args, **kwargs)
+
+    monkeypatch.setattr(exchange_service, "Table", capture_table)
+
+    first = service.export_pdf(tmp_path / "first.pdf", "patients", actor_id=actor_id)
+    second = service.export_pdf(tmp_path / "second.pdf", "patients", actor_id=actor_id)
+
+    assert first["count"] == 230
+    assert table_sizes[:6] == [1, 50, 50, 50, 50, 30]
+    pdf_bytes = Path(first["path"]).read_bytes()
+    assert pdf_bytes.count(b"/Type /Page\n") > 1
+    assert pdf_bytes == Path(second["path"]).read_bytes()
+
+
+def _cancel_after(rows: int) -> ExchangeProgress:
+    def _on_progress(event: ExchangeProgressEvent) -> None:
+        if sum(event["table_rows"].values()) >= rows:
+            progress.cancel()
+
+    progress = ExchangeProgress(_on_progress, min_interval=0)
+    return progress
+
+
+def test_exchange_progress_reports_rows_and_bytes_and_cancel_rolls_back(tmp_path: Path) -> None:
+    source = make_session_factory(tmp_path / "progress_source.db")
+    actor_id = seed_actor(source)
+    service = ExchangeService(session_factory=source)
+    with source() as session:
+        for index in range(1200):
+            session.add(models.Patient(full_name=f"Пациент {index:04d}", sex="M", category="контроль"))
+
+    events: list[ExchangeProgressEvent] = []
+    exported = service.export_zip(tmp_path / "full.zip", actor_id=actor_id, progress=ExchangeProgress(events.append))
+    assert events[-1]["table_rows"]["patients"] == 1200
+    assert events[-1]["bytes_done"] == Path(exported["path"]).stat().st_size
+    with pytest.raises(OperationCancelledError):
+        service.export_zip(tmp_path / "cancelled.zip", actor_id=actor_id, progress=_cancel_after(200))
+    assert not (tmp_path / "cancelled.zip").exists()
+    service.export_csv(tmp_path / "patients.csv", "patients", actor_id=actor_id)
+
+    target = make_session_factory(tmp_path / "progress_target.db")
+    target_actor_id = seed_actor(target)
+    target_service = ExchangeService(session_factory=target)
+    with pytest.raises(OperationCancelledError):
+        target_service.import_zip(exported["path"], actor_id=target_actor_id, progress=_cancel_after(500))
+    with pytest.raises(OperationCancelledError):
+        target_service.import_csv(
+            tmp_path / "patients.csv", "patients", actor_id=target_actor_id, progress=_cancel_after(500)
+        )
+    with target() as session:
+        assert session.query(models.Patient).count() == 0
+        assert session.query(models.DataExchangePackage).count() == 0
+
+    events.clear()
+    target_service.import_zip(exported["path"], actor_id=target_actor_id, progress=ExchangeProgress(events.append))
+    assert events[-1]["table_rows"]["patients"] == 1200
+    assert events[-1]["bytes_done"] == events[-1]["bytes_total"]
+    with target() as session:
+        assert session.query(models.Patient).count() == 1200
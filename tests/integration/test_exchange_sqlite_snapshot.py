@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import zipfile
+from datetime import UTC, date, datetime
+from pathlib import Path
+
+import pytest
+
+from app.application.services.exchange_service import ExchangeService
+from app.infrastructure.db import models_sqlalchemy as models
+from tests.integration.test_exchange_service_import_reports import make_session_factory, seed_actor
+
+
+def _seed_source(session_factory) -> None:
+    with session_factory() as session:
+        session.add(models.Department(id=1, name="Хирургия"))
+        session.add(
+            models.Patient(
+                id=1,
+                full_name="Иванов Иван",
+                dob=date(1990, 1, 1),
+                sex="M",
+                category="контроль",
+            )
+        )
+        session.add(models.Patient(id=2, full_name="Петров Пётр", sex="M", category="контроль"))
+        session.flush()
+        session.add(
+            models.EmrCase(
+                id=1,
+                patient_id=1,
+                hospital_case_no="A-1",
+                department_id=1,
+                created_at=datetime(2026, 1, 1, 10, 0, tzinfo=UTC),
+            )
+        )
+        session.add(models.EmrCase(id=2, patient_id=2, hospital_case_no="B-1", department_id=1))
+
+
+def test_sqlite_snapshot_package_round_trip_is_idempotent(tmp_path: Path) -> None:
+    source = make_session_factory(tmp_path / "source.db")
+    actor_id = seed_actor(source)
+    _seed_source(source)
+    service = ExchangeService(session_factory=source)
+
+    exported = service.export_sqlite(tmp_path / "snapshot.zip", exported_by="unit", actor_id=actor_id)
+
+    assert exported["counts"]["patients"] == 2
+    assert exported["counts"]["emr_case"] == 2
+    with zipfile.ZipFile(exported["path"]) as zf:
+        assert sorted(zf.namelist()) == ["manifest.json", "snapshot.sqlite3"]
+
+    target = make_session_factory(tmp_path / "target.db")
+    target_actor_id = seed_actor(target)
+    target_service = ExchangeService(session_factory=target)
+    with target() as session:
+        session.add(models.Patient(id=2, full_name="Старое имя", sex="M", category="контроль"))
+
+    first = target_service.import_zip(exported["path"], actor_id=target_actor_id)
+    second = target_service.import_zip(exported["path"], actor_id=target_actor_id)
+    appended = target_service.import_zip(exported["path"], actor_id=target_actor_id, mode="append")
+
+    assert first["details"]["patients"] == {"rows": 2, "added": 1, "updated": 1, "skipped": 0, "errors": 0}
+    assert second["details"]["patients"] == {"rows": 2, "added": 0, "updated": 2, "skipped": 0, "errors": 0}
+    assert appended["details"]["emr_case"]["skipped"] == 2
+    assert first["error_count"] == 0
+    with target() as session:
+        names = {int(p.id): str(p.full_name) for p in session.query(models.Patient).all()}
+        case = session.get(models.EmrCase, 1)
+        formats = {p.package_format for p in session.query(models.DataExchangePackage).all()}
+        assert case is not None
+        assert case.created_at.replace(tzinfo=UTC) == datetime(2026, 1, 1, 10, 0, tzinfo=UTC)
+    assert names == {1: "Иванов Иван", 2: "Петров Пётр"}
+    assert formats == {"zip+sqlite"}
+
+
+def test_sqlite_snapshot_import_isolates_rows_that_violate_constraints(tmp_path: Path) -> None:
+    source = make_session_factory(tmp_path / "source.db")
+    actor_id = seed_actor(source)
+    _seed_source(source)
+    exported = ExchangeService(session_factory=source).export_sqlite(tmp_path / "snapshot.zip", actor_id=actor_id)
+
+    target = make_session_factory(tmp_path / "target.db")
+    target_actor_id = seed_actor(target)
+    with target() as session:
+        session.add(models.Patient(id=1, full_name="Иванов Иван", sex="M", category="контроль"))
+        session.flush()
+        session.add(models.EmrCase(id=99, patient_id=1, hospital_case_no="A-1"))
+
+    result = ExchangeService(session_factory=target).import_zip(exported["path"], actor_id=target_actor_id)
+
+    assert result["details"]["emr_case"] == {"rows": 2, "added": 1, "updated": 0, "skipped": 0, "errors": 1}
+    assert [(error["scope"], error["row"]) for error in result["errors"]] == [("emr_case", 1)]
+    with target() as session:
+        assert sorted(int(case.id) for case in session.query(models.EmrCase).all()) == [2, 99]
+
+
+def test_sqlite_snapshot_import_rejects_corrupted_snapshot(tmp_path: Path) -> None:
+    session_factory = make_session_factory(tmp_path / "source.db")
+    actor_id = seed_actor(session_factory)
+    service = ExchangeService(session_factory=session_factory)
+    broken = tmp_path / "broken.zip"
+    with zipfile.ZipFile(broken, "w") as zf:
+        zf.writestr("snapshot.sqlite3", b"not a database")
+        zf.writestr(
+            "manifest.json",
+            json.dumps(
+                {
+                    "schema_version": "1.0",
+                    "files": [{"name": "snapshot.sqlite3", "sha256": hashlib.sha256(b"not a database").hexdigest()}],
+                }
+            ),
+        )
+
+    with pytest.raises(ValueError, match="снимка SQLite"):
+        service.import_zip(broken, actor_id=actor_id)
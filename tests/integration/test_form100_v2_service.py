@@ -18,6 +18,7 @@ from app.application.dto.form100_v2_dto import (
     Form100SignV2Request,
     Form100UpdateV2Request,
     Form100V2Filters,
+    Form100V2ListCursor,
 )
 from app.application.services import (
     form100_service_v2 as form100_service_module,
@@ -28,6 +29,7 @@ from app.application.services.form100_service_v2 import Form100ServiceV2
 from app.application.services.reporting_service import ReportingService
 from app.domain.rules.form100_rules_v2 import _TISSUE_TYPES
 from app.infrastructure.db import models_sqlalchemy as models
+from app.infrastructure.db.fts_manager import FtsManager
 from app.infrastructure.db.models_sqlalchemy import Base
 from app.infrastructure.db.repositories.user_repo import UserRepository
 
@@ -311,3 +313,35 @@ def test_form100_v2_list_cards_filters_by_patient(tmp_path: Path) -> None:
 
     assert [row.id for row in rows] == [card_1.id]
 
+
+
+def test_form100_v2_list_cards_keyset_pages_and_fts_query(tmp_path: Path) -> None:
+    session_factory = make_session_factory(tmp_path / "form100_v2_keyset.db")
+    _admin_id, operator_id = seed_users(session_factory)
+    assert FtsManager(session_factory=session_factory).ensure_all() is True
+    service = Form100ServiceV2(session_factory=session_factory)
+
+    created_ids = []
+    for idx in range(5):
+        req = make_create_request().model_copy(
+            update={"main_full_name": f"Петров Пётр {idx}", "main_id_tag": f"T{idx:05d}"}
+        )
+        created_ids.append(service.create_card(req, actor_id=operator_id).id)
+
+    seen: list[str] = []
+    cursor: Form100V2ListCursor | None = None
+    while True:
+        page = service.list_cards(limit=2, after=cursor)
+        seen.extend(row.id for row in page)
+        if len(page) < 2:
+            break
+        cursor = Form100V2ListCursor(updated_at=page[-1].updated_at, id=page[-1].id)
+
+    assert len(seen) == len(set(seen)) == 5
+    assert set(seen) == set(created_ids)
+    assert seen == [row.id for row in service.list_cards(limit=10)]
+
+    found = service.list_cards(filters=Form100V2Filters(query="етров Пётр 3"), limit=10)
+    assert [row.id for row in found] == [created_ids[3]]
+    by_tag = service.list_cards(filters=Form100V2Filters(query="t00004"), limit=10)
+    assert [row.id for row in by_tag] == [created_ids[4]]
@@ -12,7 +12,11 @@ import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
 
+from app.application.dto.exchange_dto import ExchangeProgressEvent
 from app.application.dto.form100_v2_dto import Form100CreateV2Request, Form100DataV2Dto
+from app.application.exceptions import OperationCancelledError
+from app.application.services import form100_service_v2
+from app.application.services.exchange_progress import ExchangeProgress
 from app.application.services.form100_service_v2 import Form100ServiceV2
 from app.infrastructure.db.models_sqlalchemy import Base
 from app.infrastructure.db.repositories.user_repo import UserRepository
@@ -122,3 +126,114 @@ def test_form100_v2_import_allows_system_actor_when_explicit(tmp_path: Path) ->
     assert result["summary"]["added"] == 1
     restored = service.get_card(created.id)
     assert restored.id == created.id
+
+
+def test_form100_v2_import_streams_pdfs_and_rolls_back_on_pdf_hash_mismatch(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    artifact_dir = tmp_path / "artifacts"
+    monkeypatch.setattr(form100_service_v2, "FORM100_V2_ARTIFACT_DIR", artifact_dir)
+    session_factory = make_session_factory(tmp_path / "form100_v2_pdf_stream.db")
+    admin_id = seed_admin(session_factory)
+    service = Form100ServiceV2(session_factory=session_factory)
+    created = service.create_card(make_create_request(), actor_id=admin_id)
+    zip_path = tmp_path / "form100_v2_pdf_stream.zip"
+    service.export_package_zip(file_path=zip_path, actor_id=admin_id, card_id=created.id, exported_by="admin")
+    service.delete_card(created.id, actor_id=admin_id)
+
+    tampered_zip = tmp_path / "form100_v2_pdf_tampered.zip"
+    with zipfile.ZipFile(zip_path, "r") as src, zipfile.ZipFile(tampered_zip, "w") as dst:
+        for name in src.namelist():
+            payload = src.read(name)
+            dst.writestr(name, payload + b"%tampered" if name.endswith(".pdf") else payload)
+
+    with pytest.raises(ValueError, match="Hash mismatch"):
+        service.import_package_zip(file_path=tampered_zip, actor_id=admin_id, mode="merge")
+    assert not list(artifact_dir.rglob("*.pdf"))
+    with pytest.raises(ValueError):
+        service.get_card(created.id)
+
+    result = service.import_package_zip(file_path=zip_path, actor_id=admin_id, mode="merge")
+
+    assert result["summary"]["added"] == 1
+    stored = list(artifact_dir.rglob("*.pdf"))
+    assert len(stored) == 1
+    with zipfile.ZipFile(zip_path, "r") as zf:
+        assert stored[0].read_bytes() == zf.read(f"form100/{created.id}.pdf")
+
+
+def test_form100_v2_package_reports_progress_and_cancel_removes_stored_pdfs(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    artifact_dir = tmp_path / "artifacts"
+    monkeypatch.setattr(form100_service_v2, "FORM100_V2_ARTIFACT_DIR", artifact_dir)
+    session_factory = make_session_factory(tmp_path / "form100_v2_progress.db")
+    admin_id = seed_admin(session_factory)
+    service = Form100ServiceV2(session_factory=session_factory)
+    card_ids = [service.create_card(make_create_request(), actor_id=admin_id).id for _ in range(3)]
+    zip_path = tmp_path / "form100_v2_progress.zip"
+    events: list[ExchangeProgressEvent] = []
+    service.export_package_zip(file_path=zip_path, actor_id=admin_id, progress=ExchangeProgress(events.append))
+    assert events[-1]["table_rows"] == {"form100": 3}
+    assert events[-1]["bytes_done"] == events[-1]["bytes_total"]
+    for card_id in card_ids:
+        service.delete_card(card_id, actor_id=admin_id)
+
+    def _cancel_on_last_card(event: ExchangeProgressEvent) -> None:
+        if event["table_rows"].get("form100") == 3:
+            progress.cancel()
+
+    progress = ExchangeProgress(_cancel_on_last_card, min_interval=0)
+    with pytest.raises(OperationCancelledError):
+        service.import_package_zip(file_path=zip_path, actor_id=admin_id, progress=progress)
+
+    # Два PDF уже были сохранены до отмены — они удалены вместе с откатом транзакции.
+    assert not list(artifact_dir.rglob("*.pdf"))
+    for card_id in card_ids:
+        with pytest.raises(ValueError):
+            service.get_card(card_id)
+
+
+def test_form100_v2_package_pdfs_rendered_in_process_pool_match_serial_export(tmp_path: Path) -> None:
+    session_factory = make_session_factory(tmp_path / "form100_v2_pool.db")
+    admin_id = seed_admin(session_factory)
+    service = Form100ServiceV2(session_factory=session_factory)
+    for _ in range(3):
+        service.create_card(make_create_request(), actor_id=admin_id)
+
+    packages = {}
+    for workers in (1, 2):
+        zip_path = tmp_path / f"form100_v2_workers_{workers}.zip"
+        service.export_package_zip(file_path=zip_path, actor_id=admin_id, workers=workers)
+        with zipfile.ZipFile(zip_path, "r") as zf:
+            assert zf.namelist()[-2:] == ["form100.json", "manifest.json"]
+            pdfs = [(name, zf.read(name)) for name in zf.namelist() if name.endswith(".pdf")]
+            cards = json.loads(zf.read("form100.json"))["cards"]
+        packages[workers] = (pdfs, cards)
+
+    # PDF идут в архив в порядке карточек, а их байты не зависят от процесса.
+    assert packages[2] == packages[1]
+    assert len(packages[1][0]) == 3
+
+
+def test_form100_v2_import_verifies_pdfs_of_skipped_cards(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(form100_service_v2, "FORM100_V2_ARTIFACT_DIR", tmp_path / "artifacts")
+    session_factory = make_session_factory(tmp_path / "form100_v2_skipped_pdf.db")
+    admin_id = seed_admin(session_factory)
+    service = Form100ServiceV2(session_factory=session_factory)
+    created = service.create_card(make_create_request(), actor_id=admin_id)
+    zip_path = tmp_path / "form100_v2_skipped_pdf.zip"
+    service.export_package_zip(file_path=zip_path, actor_id=admin_id, card_id=created.id, exported_by="admin")
+
+    tampered_zip = tmp_path / "form100_v2_skipped_pdf_tampered.zip"
+    with zipfile.ZipFile(zip_path, "r") as src, zipfile.ZipFile(tampered_zip, "w") as dst:
+        for name in src.namelist():
+            payload = src.read(name)
+            dst.writestr(name, payload + b"%tampered" if name.endswith(".pdf") else payload)
+
+    # Карточка уже есть и в режиме append пропускается, но её PDF всё равно сверяется с manifest.
+    with pytest.raises(ValueError, match="Hash mismatch"):
+        service.import_package_zip(file_path=tampered_zip, actor_id=admin_id, mode="append")
+
+    result = service.import_package_zip(file_path=zip_path, actor_id=admin_id, mode="append")
+    assert result["summary"]["skipped"] == 1
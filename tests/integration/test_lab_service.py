@@ -1,15 +1,30 @@
+import json
 from collections.abc import Callable, Iterator
 from contextlib import AbstractContextManager, contextmanager
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime, timedelta
 from pathlib import Path
 from typing import cast
 
-from sqlalchemy import create_engine
+import pytest
+from sqlalchemy import create_engine, func, select
 from sqlalchemy.orm import Session, sessionmaker
 
-from app.application.dto.lab_dto import LabSampleCreateRequest, LabSampleResultUpdate
+from app.application.dto.lab_dto import (
+    LabSampleCreateRequest,
+    LabSampleListFilters,
+    LabSampleResultUpdate,
+)
 from app.application.services.lab_service import LabService
-from app.infrastructure.db.models_sqlalchemy import Base, RefMaterialType, User
+from app.infrastructure.db.models_sqlalchemy import (
+    AuditLog,
+    Base,
+    LabMicrobeIsolation,
+    LabNumberSequence,
+    LabSample,
+    RefMaterialType,
+    User,
+)
+from app.infrastructure.db.repositories.lab_repo import LabRepository
 
 
 def make_session_factory(db_path: Path) -> Callable[[], AbstractContextManager[Session]]:
@@ -77,3 +92,144 @@ def test_lab_sample_autonumber(tmp_path: Path) -> None:
     )
     resp_update = service.update_result(resp1.id, upd, actor_id=actor_id)
     assert resp_update.growth_flag == 1
+
+
+def test_list_samples_page_filters_and_pages_in_db(tmp_path: Path) -> None:
+    session_factory = make_session_factory(tmp_path / "lab_page.db")
+    material_type_id = seed_material(session_factory)
+    actor_id = seed_actor(session_factory)
+    service = LabService(session_factory=session_factory)
+
+    created = [
+        service.create_sample(
+            LabSampleCreateRequest(
+                patient_id=1,
+                material_type_id=material_type_id,
+                taken_at=datetime(2025, 12, day, 10, 0, 0, tzinfo=UTC) if day else None,
+            ),
+            actor_id=actor_id,
+        )
+        for day in (10, 11, 12, 13, 0)
+    ]
+    service.create_sample(
+        LabSampleCreateRequest(patient_id=2, material_type_id=material_type_id),
+        actor_id=actor_id,
+    )
+    service.update_result(created[1].id, LabSampleResultUpdate(growth_flag=1), actor_id=actor_id)
+    service.update_result(created[2].id, LabSampleResultUpdate(growth_flag=0), actor_id=actor_id)
+    with session_factory() as session:
+        session.add_all(
+            [
+                LabMicrobeIsolation(lab_sample_id=created[1].id, microorganism_free="First"),
+                LabMicrobeIsolation(lab_sample_id=created[1].id, microorganism_free="Second"),
+            ]
+        )
+
+    page = service.list_samples_page(1, limit=2)
+    assert (page.total, page.positive, page.negative, page.pending) == (5, 1, 1, 3)
+    assert page.filtered_total == 5
+    # Пробы без даты взятия идут первыми, затем по убыванию даты.
+    assert [item.id for item in page.items] == [created[4].id, created[3].id]
+
+    last = service.list_samples_page(1, limit=2, offset=4)
+    assert [item.id for item in last.items] == [created[0].id]
+
+    positive = service.list_samples_page(1, filters=LabSampleListFilters(growth_flag=1))
+    assert positive.filtered_total == 1
+    assert positive.items[0].microorganism_free == "First"
+
+    ranged = service.list_samples_page(
+        1,
+        filters=LabSampleListFilters(taken_from=date(2025, 12, 11), taken_to=date(2025, 12, 12)),
+    )
+    assert [item.id for item in ranged.items] == [created[2].id, created[1].id]
+
+    by_number = service.list_samples_page(
+        1, filters=LabSampleListFilters(lab_no=created[3].lab_no[4:12])
+    )
+    assert [item.id for item in by_number.items] == [created[3].id]
+
+    assert [item.id for item in service.list_samples(1)] == [item.id for item in reversed(created)]
+
+
+def test_reserve_lab_numbers_allocates_contiguous_blocks_per_day_and_material(tmp_path: Path) -> None:
+    session_factory = make_session_factory(tmp_path / "lab_numbers.db")
+    material_type_id = seed_material(session_factory)
+    repo = LabRepository()
+    day = date(2025, 12, 15)
+
+    with session_factory() as session:
+        assert repo.next_lab_number(session, day, material_type_id) == 1
+        assert repo.reserve_lab_numbers(session, day, material_type_id, 5) == range(2, 7)
+    with session_factory() as session:
+        assert repo.next_lab_number(session, day, material_type_id) == 7
+        assert repo.reserve_lab_numbers(session, date(2025, 12, 16), material_type_id, 3) == range(1, 4)
+        count = session.execute(select(func.count(LabNumberSequence.id))).scalar_one()
+        assert count == 2
+
+    with session_factory() as session, pytest.raises(ValueError):
+        repo.reserve_lab_numbers(session, day, material_type_id, 0)
+
+
+def test_create_samples_bulk_allocates_blocks_and_writes_one_audit_event(tmp_path: Path) -> None:
+    session_factory = make_session_factory(tmp_path / "lab_bulk.db")
+    blood_id = seed_material(session_factory)
+    with session_factory() as session:
+        swab = RefMaterialType(code="SWB", name="Мазок")
+        session.add(swab)
+        session.flush()
+        swab_id = cast(int, swab.id)
+    actor_id = seed_actor(session_factory)
+    service = LabService(session_factory=session_factory)
+    day1 = datetime(2025, 12, 15, 10, 0, tzinfo=UTC)
+    day2 = datetime(2025, 12, 16, 10, 0, tzinfo=UTC)
+
+    single = service.create_sample(
+        LabSampleCreateRequest(patient_id=1, material_type_id=blood_id, taken_at=day1),
+        actor_id=actor_id,
+    )
+    assert single.lab_no == "BLD-20251215-0001"
+
+    requests = [
+        LabSampleCreateRequest(
+            patient_id=index,
+            material_type_id=swab_id if index % 3 == 0 else blood_id,
+            taken_at=day2 if index % 2 else day1,
+            material_location=f"Бокс {index}",
+        )
+        for index in range(1, 501)
+    ]
+    created = service.create_samples_bulk(requests, actor_id=actor_id)
+
+    assert len(created) == 500
+    assert len({item.id for item in created}) == 500
+    assert created[0].lab_no == "BLD-20251216-0001"
+    assert created[1].lab_no == "BLD-20251215-0002"
+    assert created[2].lab_no == "SWB-20251216-0001"
+    assert all(item.material_location == f"Бокс {index}" for index, item in enumerate(created, 1))
+    assert created[0].qc_due_at == day2 + timedelta(hours=2)
+    assert created[2].qc_due_at == day2 + timedelta(hours=6)
+
+    with session_factory() as session:
+        samples = {
+            sample.id: sample.lab_no for sample in session.execute(select(LabSample)).scalars()
+        }
+        assert all(samples[item.id] == item.lab_no for item in created)
+        events = list(
+            session.execute(
+                select(AuditLog).where(AuditLog.action == "create_lab_samples_bulk")
+            ).scalars()
+        )
+        assert len(events) == 1
+        assert json.loads(cast(str, events[0].payload_json))["count"] == 500
+
+    with pytest.raises(ValueError, match="Тип материала"):
+        service.create_samples_bulk(
+            [
+                LabSampleCreateRequest(patient_id=1, material_type_id=blood_id, taken_at=day1),
+                LabSampleCreateRequest(patient_id=1, material_type_id=9999, taken_at=day1),
+            ],
+            actor_id=actor_id,
+        )
+    with session_factory() as session:
+        assert session.execute(select(func.count(LabSample.id))).scalar_one() == 501
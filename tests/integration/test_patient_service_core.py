@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import csv
 from collections.abc import Callable, Iterator
 from contextlib import AbstractContextManager, contextmanager
 from datetime import date
@@ -9,6 +10,7 @@ from sqlalchemy import create_engine, text
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.application.dto.patient_dto import PatientCreateRequest
+from app.application.services.exchange_service import ExchangeService
 from app.application.services.patient_service import PatientService
 from app.domain.constants import MilitaryCategory
 from app.infrastructure.db.fts_manager import FtsManager
@@ -174,3 +176,104 @@ def test_list_for_picker_returns_patients_sorted_by_name_then_id(tmp_path: Path)
 
     assert [row.id for row in rows] == [created_early.id, created_late.id]
     assert [row.full_name for row in rows] == ["Алексей Борисов", "Борис Андреев"]
+
+
+def test_name_index_follows_patient_writes(tmp_path: Path) -> None:
+    db_path = tmp_path / "patient_name_index.db"
+    service, actor_id = _make_service(db_path)
+    first = service.create_or_get(
+        PatientCreateRequest(
+            full_name="Семёнов Олег",
+            dob=date(1985, 6, 7),
+            sex="M",
+            category=MilitaryCategory.CIVILIAN_STAFF.value,
+        ),
+        actor_id=actor_id,
+    )
+    assert [row.id for row in service.autocomplete("семенов 1985")] == [first.id]
+    assert service.name_index.is_loaded is True
+
+    second = service.create_or_get(
+        PatientCreateRequest(
+            full_name="Семёнова Ольга",
+            sex="F",
+            category=MilitaryCategory.CIVILIAN_STAFF.value,
+        ),
+        actor_id=actor_id,
+    )
+    assert [row.id for row in service.autocomplete("Семенов")] == [first.id, second.id]
+
+    service.update_details(
+        first.id,
+        actor_id=actor_id,
+        full_name="Громов Олег",
+        dob=date(1985, 6, 7),
+        sex="M",
+        category=None,
+        military_unit=None,
+        military_district=None,
+    )
+    assert [row.id for row in service.autocomplete("громов")] == [first.id]
+    assert [row.id for row in service.list_for_picker()] == [first.id, second.id]
+
+    service.delete_patient(second.id, actor_id=actor_id)
+    assert [row.id for row in service.list_for_picker()] == [first.id]
+
+    # Подстрока внутри слова индексом не покрывается — работает запасной поиск в БД.
+    assert [row.id for row in service.autocomplete("ромов")] == [first.id]
+
+
+def test_exchange_import_resets_name_index(tmp_path: Path) -> None:
+    db_path = tmp_path / "patient_name_index_import.db"
+    session_factory = make_session_factory(db_path)
+    fts_manager = FtsManager(session_factory=session_factory)
+    assert fts_manager.ensure_all() is True
+    service = PatientService(session_factory=session_factory, fts_manager=fts_manager)
+    actor_id = _seed_actor(session_factory)
+    first = service.create_or_get(
+        PatientCreateRequest(
+            full_name="Семёнов Олег",
+            sex="M",
+            category=MilitaryCategory.CIVILIAN_STAFF.value,
+        ),
+        actor_id=actor_id,
+    )
+    assert [row.id for row in service.autocomplete("Семенов")] == [first.id]
+
+    csv_path = tmp_path / "patients.csv"
+    with csv_path.open("w", encoding="utf-8-sig", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["id", "full_name", "dob", "sex", "category", "military_unit", "military_district"])
+        writer.writerow([100, "Семёнова Ольга", "", "F", MilitaryCategory.CIVILIAN_STAFF.value, "", ""])
+    exchange = ExchangeService(session_factory=session_factory, patient_service=service)
+    exchange.import_csv(csv_path, "patients", actor_id=actor_id)
+
+    assert service.name_index.is_loaded is False
+    assert [row.full_name for row in service.autocomplete("Семенов")] == ["Семёнов Олег", "Семёнова Ольга"]
+
+
+def test_search_by_name_keeps_bm25_ranking_when_index_has_hits(tmp_path: Path) -> None:
+    service, actor_id = _make_service(tmp_path / "patient_search_ranking.db")
+    by_unit = service.create_or_get(
+        PatientCreateRequest(
+            full_name="Абрамов Пётр",
+            sex="M",
+            category=MilitaryCategory.CIVILIAN_STAFF.value,
+            military_unit="Ивановский гарнизон",
+        ),
+        actor_id=actor_id,
+    )
+    by_name = service.create_or_get(
+        PatientCreateRequest(
+            full_name="Иванов Сергей",
+            sex="M",
+            category=MilitaryCategory.CIVILIAN_STAFF.value,
+        ),
+        actor_id=actor_id,
+    )
+
+    # Индекс ФИО находит только совпадение по имени и отдаёт его в порядке пикера.
+    assert [row.id for row in service.autocomplete("иванов")] == [by_name.id]
+    assert service.name_index.is_loaded is True
+    # Поиск идёт через patients_fts: совпадение по ФИО весит больше, чем по части.
+    assert [row.id for row in service.search_by_name("иванов")] == [by_name.id, by_unit.id]
@@ -1,15 +1,28 @@
 from collections.abc import Callable, Iterator
 from contextlib import AbstractContextManager, contextmanager
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime
 from pathlib import Path
 from typing import cast
 
-from sqlalchemy import create_engine
+import pytest
+from sqlalchemy import create_engine, select
 from sqlalchemy.orm import Session, sessionmaker
 
-from app.application.dto.sanitary_dto import SanitarySampleCreateRequest, SanitarySampleResultUpdate
+from app.application.dto.sanitary_dto import (
+    SanitarySampleCreateRequest,
+    SanitarySampleListFilters,
+    SanitarySampleResultUpdate,
+)
 from app.application.services.sanitary_service import SanitaryService
-from app.infrastructure.db.models_sqlalchemy import Base, Department, User
+from app.infrastructure.db.models_sqlalchemy import (
+    AuditLog,
+    Base,
+    Department,
+    RefAntibiotic,
+    RefMicroorganism,
+    User,
+)
+from app.infrastructure.db.repositories.sanitary_repo import SanitaryRepository
 
 
 def make_session_factory(db_path: Path) -> Callable[[], AbstractContextManager[Session]]:
@@ -71,3 +84,225 @@ def test_sanitary_sample(tmp_path: Path) -> None:
     )
     resp2 = service.update_result(resp.id, upd, actor_id=actor_id)
     assert resp2.growth_flag == 0
+
+
+def test_department_overview_groups_counts_and_last_sample(tmp_path: Path) -> None:
+    session_factory = make_session_factory(tmp_path / "san_overview.db")
+    dep_id = seed_department(session_factory)
+    actor_id = seed_actor(session_factory)
+    with session_factory() as session:
+        other = Department(name="Терапия")
+        session.add(other)
+        session.flush()
+        other_id = cast(int, other.id)
+    service = SanitaryService(session_factory=session_factory)
+
+    def _create(department_id: int, day: int, hour: int, growth_flag: int | None) -> int:
+        sample = service.create_sample(
+            SanitarySampleCreateRequest(
+                department_id=department_id,
+                sampling_point="Стол",
+                taken_at=datetime(2026, 4, day, hour, 0, tzinfo=UTC),
+            ),
+            actor_id=actor_id,
+        )
+        if growth_flag is not None:
+            service.update_result(
+                sample.id,
+                SanitarySampleResultUpdate(
+                    growth_flag=growth_flag,
+                    microorganism_free="S. aureus" if growth_flag == 1 else None,
+                ),
+                actor_id=actor_id,
+            )
+        return sample.id
+
+    _create(dep_id, 10, 9, 0)
+    last_id = _create(dep_id, 12, 9, 1)
+    _create(dep_id, 11, 9, None)
+    _create(other_id, 5, 9, 0)
+
+    overview = {item.department_id: item for item in service.get_department_overview()}
+    assert set(overview) == {dep_id, other_id}
+    surgery = overview[dep_id]
+    assert (surgery.total_count, surgery.positive_count, surgery.negative_count) == (3, 1, 1)
+    assert surgery.pending_count == 1
+    assert surgery.last_sample is not None
+    assert surgery.last_sample.id == last_id
+    assert surgery.last_sample.microorganism_free == "S. aureus"
+
+    positive_only = service.get_department_overview(growth=1)
+    assert [item.department_id for item in positive_only] == [dep_id]
+    pending_only = service.get_department_overview(growth=-1)
+    assert [item.department_id for item in pending_only] == [dep_id]
+
+    ranged = service.get_department_overview(date_from=date(2026, 4, 10), date_to=date(2026, 4, 11))
+    assert [item.department_id for item in ranged] == [dep_id]
+    assert ranged[0].total_count == 2
+    assert ranged[0].positive_count == 0
+    assert ranged[0].last_sample is not None
+    assert ranged[0].last_sample.taken_at is not None
+    assert ranged[0].last_sample.taken_at.day == 11
+
+
+def test_list_samples_page_filters_and_keyset_pages_in_db(tmp_path: Path) -> None:
+    session_factory = make_session_factory(tmp_path / "san_page.db")
+    dep_id = seed_department(session_factory)
+    actor_id = seed_actor(session_factory)
+    with session_factory() as session:
+        micro = RefMicroorganism(code="STA", name="Staphylococcus aureus")
+        session.add(micro)
+        session.flush()
+        micro_id = cast(int, micro.id)
+    service = SanitaryService(session_factory=session_factory)
+
+    created = []
+    for index in range(7):
+        sample = service.create_sample(
+            SanitarySampleCreateRequest(
+                department_id=dep_id,
+                sampling_point="Раковина" if index % 2 else "Стол",
+                # Две пробы с одинаковым временем проверяют разрешение по id.
+                taken_at=datetime(2026, 4, 10 + min(index, 5), 9, 0, tzinfo=UTC) if index else None,
+            ),
+            actor_id=actor_id,
+        )
+        created.append(sample)
+    service.update_result(
+        created[3].id,
+        SanitarySampleResultUpdate(growth_flag=1, microorganism_id=micro_id),
+        actor_id=actor_id,
+    )
+
+    seen: list[int] = []
+    cursor = None
+    while True:
+        page = service.list_samples_page(dep_id, limit=3, after=cursor)
+        assert page.filtered_total == page.total == 7
+        seen.extend(item.id for item in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert seen == [created[0].id, created[6].id, created[5].id, created[4].id, created[3].id,
+                    created[2].id, created[1].id]
+
+    by_point = service.list_samples_page(
+        dep_id, filters=SanitarySampleListFilters(sampling_point="Раков"), limit=10
+    )
+    assert {item.id for item in by_point.items} == {created[1].id, created[3].id, created[5].id}
+    assert by_point.total == 7
+
+    by_micro = service.list_samples_page(
+        dep_id,
+        filters=SanitarySampleListFilters(microorganism_id=micro_id, growth_flag=1),
+        limit=10,
+    )
+    assert [item.id for item in by_micro.items] == [created[3].id]
+    assert by_micro.items[0].microorganism_id == micro_id
+    assert by_micro.positive == 1
+
+    ranged = service.list_samples_page(
+        dep_id,
+        filters=SanitarySampleListFilters(taken_from=date(2026, 4, 12), taken_to=date(2026, 4, 14)),
+        limit=10,
+    )
+    assert [item.id for item in ranged.items] == [created[4].id, created[3].id, created[2].id]
+    assert ranged.last_taken_at is not None
+    assert ranged.last_taken_at.day == 14
+
+
+def test_sanitary_lab_numbers_reserve_blocks_atomically(tmp_path: Path) -> None:
+    session_factory = make_session_factory(tmp_path / "san_numbers.db")
+    repo = SanitaryRepository()
+    taken_at = datetime(2026, 4, 10, 9, 0, tzinfo=UTC)
+
+    with session_factory() as session:
+        assert repo.reserve_lab_numbers(session, taken_at, 4) == range(1, 5)
+        assert repo.next_lab_number(session, taken_at.replace(hour=18)) == 5
+        assert repo.next_lab_number(session, datetime(2026, 4, 11, tzinfo=UTC)) == 1
+
+
+def test_sampling_round_and_bulk_results(tmp_path: Path) -> None:
+    session_factory = make_session_factory(tmp_path / "san_round.db")
+    dep_id = seed_department(session_factory)
+    actor_id = seed_actor(session_factory)
+    with session_factory() as session:
+        other = Department(name="Терапия")
+        antibiotic = RefAntibiotic(code="AMK", name="Amikacin")
+        session.add_all([other, antibiotic])
+        session.flush()
+        other_id = cast(int, other.id)
+        antibiotic_id = cast(int, antibiotic.id)
+    service = SanitaryService(session_factory=session_factory)
+    taken_at = datetime(2026, 4, 10, 9, 0, tzinfo=UTC)
+
+    single = service.create_sample(
+        SanitarySampleCreateRequest(department_id=dep_id, sampling_point="Стол", taken_at=taken_at),
+        actor_id=actor_id,
+    )
+    round_samples = service.create_sampling_round(
+        [
+            SanitarySampleCreateRequest(
+                department_id=dep_id if index % 2 else other_id,
+                sampling_point=f"Точка {index}",
+                room=f"{100 + index}",
+                taken_at=taken_at,
+            )
+            for index in range(40)
+        ],
+        actor_id=actor_id,
+    )
+    assert single.lab_no == "SAN-20260410-0001"
+    assert [item.lab_no for item in round_samples] == [
+        f"SAN-20260410-{number:04d}" for number in range(2, 42)
+    ]
+    assert round_samples[5].sampling_point == "Точка 5"
+
+    with pytest.raises(ValueError, match="несколько раз"):
+        service.update_results_bulk(
+            [(single.id, SanitarySampleResultUpdate()), (single.id, SanitarySampleResultUpdate())],
+            actor_id=actor_id,
+        )
+    with pytest.raises(ValueError, match="Проба не найдена"):
+        service.update_results_bulk([(999999, SanitarySampleResultUpdate())], actor_id=actor_id)
+
+    service.update_result(
+        round_samples[0].id,
+        SanitarySampleResultUpdate(growth_flag=1, microorganism_free="Старый"),
+        actor_id=actor_id,
+    )
+    updated = service.update_results_bulk(
+        [
+            (
+                round_samples[0].id,
+                SanitarySampleResultUpdate(
+                    growth_flag=1,
+                    microorganism_free="S. aureus",
+                    susceptibility=[{"antibiotic_id": antibiotic_id, "ris": "R"}],
+                    phages=[{"phage_free": "Стафилококковый", "lysis_diameter_mm": 12}],
+                ),
+            ),
+            (round_samples[1].id, SanitarySampleResultUpdate(growth_flag=0)),
+        ],
+        actor_id=actor_id,
+    )
+    assert [item.id for item in updated] == [round_samples[0].id, round_samples[1].id]
+    assert updated[0].growth_flag == 1
+    assert updated[0].microorganism_free == "S. aureus"
+    assert updated[1].growth_flag == 0
+    assert updated[1].microorganism_free is None
+
+    detail = service.get_detail(round_samples[0].id)
+    assert [cast(str, item.microorganism_free) for item in detail["isolation"]] == ["S. aureus"]
+    assert [cast(str, item.ris) for item in detail["susceptibility"]] == ["R"]
+    assert [cast(int, item.lysis_diameter_mm) for item in detail["phages"]] == [12]
+
+    with session_factory() as session:
+        actions = [
+            cast(str, event.action)
+            for event in session.execute(
+                select(AuditLog).where(AuditLog.action.like("%sanitary_r%"))
+            ).scalars()
+        ]
+    assert actions.count("create_sanitary_round") == 1
+    assert actions.count("update_sanitary_results_bulk") == 1
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import io
+
+import pytest
+
+from app.application.dto.exchange_dto import ExchangeProgressEvent
+from app.application.exceptions import OperationCancelledError
+from app.application.services.exchange_progress import ExchangeProgress
+
+
+def test_exchange_progress_counts_rows_per_table_and_bytes_read() -> None:
+    events: list[ExchangeProgressEvent] = []
+    progress = ExchangeProgress(events.append, min_interval=3600)
+    progress.set_bytes_total(10)
+
+    assert list(progress.track_rows("patients", range(5), step=2)) == [0, 1, 2, 3, 4]
+    assert list(progress.track_rows("departments", ["a"])) == ["a"]
+    assert progress.reader(io.BytesIO(b"0123456789")).read() == b"0123456789"
+    progress.finish()
+
+    # Долгий интервал: события только при смене таблицы и в finish.
+    assert [event["table"] for event in events] == ["patients", "departments", "departments"]
+    assert events[-1] == {
+        "table": "departments",
+        "table_rows": {"patients": 5, "departments": 1},
+        "bytes_done": 10,
+        "bytes_total": 10,
+    }
+
+
+def test_exchange_progress_cancel_stops_at_next_row_batch() -> None:
+    progress = ExchangeProgress()
+    seen: list[int] = []
+
+    with pytest.raises(OperationCancelledError):
+        for value in progress.track_rows("patients", range(100), step=10):
+            seen.append(value)
+            if value == 14:
+                progress.cancel()
+
+    assert progress.is_cancelled
+    assert seen == list(range(20))
+    # Счёт байтов отмену не проверяет — его вызывают и изнутри записи архива.
+    progress.add_bytes(1)
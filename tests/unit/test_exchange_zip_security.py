@@ -5,7 +5,7 @@ from pathlib import Path
 
 import pytest
 
-from app.application.services.exchange_service import _safe_extract_zip
+from app.application.services.exchange_service import _zip_members
 
 
 def _make_zip(zip_path: Path, files: dict[str, str]) -> None:
@@ -14,17 +14,15 @@ def _make_zip(zip_path: Path, files: dict[str, str]) -> None:
             zf.writestr(name, content)
 
 
-def test_safe_extract_zip_allows_regular_paths(tmp_path: Path) -> None:
+def test_zip_members_maps_regular_paths(tmp_path: Path) -> None:
     archive = tmp_path / "ok.zip"
-    out_dir = tmp_path / "out"
-    _make_zip(archive, {"manifest.json": "{}", "data/export.xlsx": "xlsx"})
+    _make_zip(archive, {"manifest.json": "{}", "data\\export.xlsx": "xlsx"})
 
     with zipfile.ZipFile(archive, "r") as zf:
-        extracted = _safe_extract_zip(zf, out_dir)
+        members = _zip_members(zf)
 
-    assert (out_dir / "manifest.json").exists()
-    assert (out_dir / "data" / "export.xlsx").exists()
-    assert len(extracted) == 2
+    assert sorted(members) == ["data/export.xlsx", "manifest.json"]
+    assert members["data/export.xlsx"].filename == "data\\export.xlsx"
 
 
 @pytest.mark.parametrize(
@@ -37,13 +35,12 @@ def test_safe_extract_zip_allows_regular_paths(tmp_path: Path) -> None:
         "C:/evil.txt",
     ],
 )
-def test_safe_extract_zip_rejects_traversal_and_absolute_paths(tmp_path: Path, member_name: str) -> None:
+def test_zip_members_rejects_traversal_and_absolute_paths(tmp_path: Path, member_name: str) -> None:
     archive = tmp_path / "bad.zip"
-    out_dir = tmp_path / "out"
     _make_zip(archive, {member_name: "bad"})
 
     with zipfile.ZipFile(archive, "r") as zf, pytest.raises(ValueError) as exc_info:
-        _safe_extract_zip(zf, out_dir)
+        _zip_members(zf)
 
     message = str(exc_info.value)
     assert "evil.txt" in message or "abs" in message
@@ -4,7 +4,11 @@ from datetime import UTC, datetime
 from typing import Any, cast
 
 from app.application.dto.auth_dto import SessionContext
-from app.application.dto.form100_v2_dto import Form100CardV2ListItemDto, Form100V2Filters
+from app.application.dto.form100_v2_dto import (
+    Form100CardV2ListItemDto,
+    Form100V2Filters,
+    Form100V2ListCursor,
+)
 from app.ui.form100_v2 import form100_list_panel as list_panel_module
 from app.ui.form100_v2.form100_list_panel import Form100ListPanel
 
@@ -12,13 +16,22 @@ from app.ui.form100_v2.form100_list_panel import Form100ListPanel
 class _ServiceStub:
     def __init__(self) -> None:
         self.calls: list[Form100V2Filters] = []
+        self.cursors: list[Form100V2ListCursor | None] = []
         self.rows: list[Form100CardV2ListItemDto] = []
         self.export_pdf_calls: list[tuple[str, str, int]] = []
 
-    def list_cards(self, filters: Form100V2Filters, limit: int = 100) -> list[Form100CardV2ListItemDto]:
-        del limit
+    def list_cards(
+        self,
+        filters: Form100V2Filters,
+        limit: int = 100,
+        after: Form100V2ListCursor | None = None,
+    ) -> list[Form100CardV2ListItemDto]:
         self.calls.append(filters)
-        return self.rows
+        self.cursors.append(after)
+        start = 0
+        if after is not None:
+            start = next(i for i, row in enumerate(self.rows) if row.id == after.id) + 1
+        return self.rows[start : start + limit]
 
     def export_pdf(self, card_id: str, file_path: str, actor_id: int) -> dict[str, object]:
         self.export_pdf_calls.append((card_id, file_path, actor_id))
@@ -86,3 +99,43 @@ def test_list_panel_exports_selected_card_pdf(qapp, monkeypatch) -> None:
         assert messages[-1][0] == "Форма 100"
     finally:
         panel.close()
+
+
+def test_list_panel_fetches_next_page_on_scroll(qapp) -> None:
+    service = _ServiceStub()
+    now = datetime.now(tz=UTC)
+    total = list_panel_module._PAGE_SIZE + 5
+    service.rows = [
+        Form100CardV2ListItemDto(
+            id=f"F100-{idx:04d}",
+            status="DRAFT",
+            version=1,
+            main_full_name=f"Пациент {idx}",
+            birth_date=None,
+            main_unit=None,
+            main_id_tag=None,
+            main_diagnosis=None,
+            updated_at=now,
+            is_archived=False,
+        )
+        for idx in range(total)
+    ]
+    panel = Form100ListPanel(
+        form100_service=cast(Any, service),
+        session=SessionContext(user_id=1, login="admin", role="admin"),
+        patient_id=42,
+    )
+    try:
+        panel.show()
+        qapp.processEvents()
+        scrollbar = panel._table.verticalScrollBar()
+        scrollbar.setValue(scrollbar.maximum())
+        qapp.processEvents()
+
+        assert service.cursors[0] is None
+        assert service.cursors[1] is not None
+        assert service.cursors[1].id == f"F100-{list_panel_module._PAGE_SIZE - 1:04d}"
+        assert panel._table.rowCount() == total
+        assert panel._has_more is False
+    finally:
+        panel.close()
@@ -3,13 +3,27 @@ from __future__ import annotations
 import sqlite3
 from collections.abc import Callable, Iterator
 from contextlib import AbstractContextManager, contextmanager
+from datetime import date
 from pathlib import Path
 
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import Session, sessionmaker
 
-from app.infrastructure.db.fts_manager import FtsManager
-from app.infrastructure.db.models_sqlalchemy import Base
+from app.infrastructure.db.fts_manager import FtsManager, rebuild_rowid_keyed_fts
+from app.infrastructure.db.models_sqlalchemy import (
+    Base,
+    Department,
+    EmrCase,
+    Form100V2,
+    LabSample,
+    Patient,
+    RefMaterialType,
+    SanitarySample,
+)
+from app.infrastructure.db.repositories.emz_repo import EmzRepository
+from app.infrastructure.db.repositories.lab_repo import LabRepository
+from app.infrastructure.db.repositories.patient_repo import PatientRepository
+from app.infrastructure.db.repositories.sanitary_repo import SanitaryRepository
 
 
 def make_session_factory(db_path: Path) -> Callable[[], AbstractContextManager[Session]]:
@@ -92,3 +106,149 @@ def test_fts_manager_restores_patients_fts_after_manual_drop(tmp_path: Path) ->
 
     assert "patients_fts" in tables
     assert {"patients_ai", "patients_ad", "patients_au"}.issubset(triggers)
+
+
+def test_fts_manager_creates_trigram_number_indexes(tmp_path: Path) -> None:
+    db_path = tmp_path / "fts_trigram.db"
+    session_factory = make_session_factory(db_path)
+    manager = FtsManager(session_factory=session_factory)
+    assert manager.ensure_all() is True
+
+    tables = _sqlite_tables(db_path)
+    triggers = _sqlite_triggers(db_path)
+    assert {"lab_sample_fts", "sanitary_sample_fts", "emr_case_fts", "form100_fts"}.issubset(tables)
+    assert {"lab_sample_ai", "lab_sample_ad", "lab_sample_au"}.issubset(triggers)
+    assert {"sanitary_sample_ai", "sanitary_sample_ad", "sanitary_sample_au"}.issubset(triggers)
+    assert {"emr_case_ai", "emr_case_ad", "emr_case_au"}.issubset(triggers)
+    assert {"form100_ai", "form100_ad", "form100_au"}.issubset(triggers)
+
+
+def test_trigram_indexes_serve_substring_lookups(tmp_path: Path) -> None:
+    db_path = tmp_path / "fts_trigram_lookup.db"
+    session_factory = make_session_factory(db_path)
+    with session_factory() as session:
+        patient = Patient(full_name="Петров Пётр")
+        material = RefMaterialType(code="BLD", name="Кровь")
+        department = Department(name="Хирургия")
+        session.add_all([patient, material, department])
+        session.flush()
+        case = EmrCase(patient_id=patient.id, hospital_case_no="ИБ-2025/0457")
+        session.add(case)
+        session.add(
+            LabSample(
+                patient_id=patient.id,
+                lab_no="BLD-20250101-0001",
+                barcode="4600012345",
+                material_type_id=material.id,
+            )
+        )
+        session.add(
+            SanitarySample(
+                department_id=department.id,
+                sampling_point="Стол",
+                lab_no="SAN-20250101-0001",
+                barcode="7700099",
+            )
+        )
+
+    # Индексы создаются поверх уже существующих данных и заполняются через rebuild.
+    manager = FtsManager(session_factory=session_factory)
+    assert manager.ensure_all() is True
+
+    lab_repo = LabRepository()
+    san_repo = SanitaryRepository()
+    emz_repo = EmzRepository()
+    with session_factory() as session:
+        assert [s.lab_no for s in lab_repo.search_by_number(session, "0101-00")] == [
+            "BLD-20250101-0001"
+        ]
+        assert [s.lab_no for s in lab_repo.search_by_number(session, "2345")] == ["BLD-20250101-0001"]
+        assert [s.lab_no for s in san_repo.search_by_number(session, "san-2025")] == [
+            "SAN-20250101-0001"
+        ]
+        assert [c.hospital_case_no for c in emz_repo.search_cases_by_case_no(session, "0457")] == [
+            "ИБ-2025/0457"
+        ]
+        # Короткие запросы не покрываются триграммами и идут через LIKE.
+        assert len(lab_repo.search_by_number(session, "BL")) == 1
+
+        sample = session.query(LabSample).one()
+        sample.barcode = "9990001"
+        session.flush()
+        assert lab_repo.search_by_number(session, "2345") == []
+        assert len(lab_repo.search_by_number(session, "9990001")) == 1
+
+        session.delete(sample)
+        session.flush()
+        assert lab_repo.search_by_number(session, "0101-00") == []
+
+
+def test_patients_fts_resolves_compound_queries_with_one_match(tmp_path: Path) -> None:
+    db_path = tmp_path / "fts_patients_compound.db"
+    session_factory = make_session_factory(db_path)
+    with session_factory() as session:
+        # Старая схема patients_fts (только ФИО) должна быть пересоздана и заполнена заново.
+        session.execute(text("DROP TABLE IF EXISTS patients_fts"))
+        session.execute(
+            text("CREATE VIRTUAL TABLE patients_fts USING fts5(full_name, patient_id UNINDEXED)")
+        )
+        session.add_all(
+            [
+                Patient(full_name="Иванов Иван", dob=date(1985, 3, 1), military_unit="в/ч 12345"),
+                Patient(full_name="Иванов Пётр", dob=date(1990, 1, 2), military_district="ЗВО"),
+            ]
+        )
+    manager = FtsManager(session_factory=session_factory)
+    assert manager.ensure_all() is True
+    repo = PatientRepository()
+
+    with session_factory() as session:
+        session.add(Patient(full_name="Семёнов Олег", dob=date(1985, 7, 7)))
+        session.flush()
+
+        def names(query: str) -> list[str]:
+            return [str(p.full_name) for p in repo.search_by_name(session, query)]
+
+        assert names("Иванов 1985") == ["Иванов Иван"]
+        assert names("иванов 02.01.1990") == ["Иванов Пётр"]
+        assert names("12345") == ["Иванов Иван"]
+        assert names("зво") == ["Иванов Пётр"]
+        assert names("семенов") == ["Семёнов Олег"]
+        assert sorted(names("1985")) == ["Иванов Иван", "Семёнов Олег"]
+
+        # Совпадение в ФИО весит больше, чем в округе.
+        session.add(Patient(full_name="Петров Сергей", military_district="Зверево"))
+        session.add(Patient(full_name="Зверев Антон Павлович", military_unit="в/ч 54321"))
+        session.flush()
+        assert names("звер") == ["Зверев Антон Павлович", "Петров Сергей"]
+
+
+def test_rebuild_rowid_keyed_fts_resyncs_form100_index_after_rowid_renumbering(tmp_path: Path) -> None:
+    db_path = tmp_path / "fts_form100_rowid.db"
+    session_factory = make_session_factory(db_path)
+    with session_factory() as session:
+        session.add_all(
+            [
+                Form100V2(id="card-1", created_by="admin", updated_by="admin", main_full_name="Иванов Иван"),
+                Form100V2(id="card-2", created_by="admin", updated_by="admin", main_full_name="Петров Пётр"),
+            ]
+        )
+    assert FtsManager(session_factory=session_factory).ensure_all() is True
+
+    lookup = (
+        "SELECT form100.id FROM form100_fts JOIN form100 ON form100.rowid = form100_fts.rowid "
+        "WHERE form100_fts MATCH 'Петров'"
+    )
+    con = sqlite3.connect(str(db_path))
+    try:
+        # Так же, как VACUUM, меняем неявные rowid в обход триггеров индекса.
+        con.execute("UPDATE form100 SET rowid = rowid + 100")
+        con.commit()
+        assert con.execute(lookup).fetchall() == []
+
+        rebuild_rowid_keyed_fts(con)
+        con.commit()
+        assert con.execute(lookup).fetchall() == [("card-2",)]
+        con.execute("INSERT INTO form100_fts(form100_fts) VALUES('integrity-check')")
+    finally:
+        con.close()
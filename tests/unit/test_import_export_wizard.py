@@ -11,7 +11,7 @@ from app.application.dto.auth_dto import SessionContext
 from app.application.services.exchange_service import ExchangeService
 from app.ui.import_export import import_export_view as import_export_view_module
 from app.ui.import_export.import_export_view import ImportExportView
-from app.ui.import_export.import_export_wizard import ImportExportWizard
+from app.ui.import_export.import_export_wizard import ImportExportWizard, _format_progress
 
 
 class _ExchangeServiceStub:
@@ -136,3 +136,17 @@ def test_import_export_view_shows_localized_direction_labels() -> None:
         direction_values.append(item.text())
 
     assert sorted(direction_values) == ["Импорт", "Неизвестно", "Экспорт"]
+
+
+def test_format_progress_shows_current_table_rows_and_megabytes() -> None:
+    text = _format_progress(
+        {
+            "table": "patients",
+            "table_rows": {"departments": 3, "patients": 120},
+            "bytes_done": 1024 * 1024,
+            "bytes_total": 4 * 1024 * 1024,
+        },
+        {"patients": "Пациенты"},
+    )
+
+    assert text == "Пациенты: 120 строк · всего строк: 123 · 1.0 из 4.0 МБ"
@@ -7,7 +7,11 @@ from typing import Any, cast
 
 from PySide6.QtWidgets import QBoxLayout, QLabel, QScrollArea, QWidget
 
-from app.application.dto.lab_dto import LabSampleResponse
+from app.application.dto.lab_dto import (
+    LabSampleListFilters,
+    LabSampleListPage,
+    LabSampleResponse,
+)
 from app.ui.lab.lab_samples_view import LabSamplesView
 
 
@@ -27,9 +31,32 @@ class _LabServiceStub:
         self._samples = samples
         self.calls: list[tuple[int, int | None]] = []
 
-    def list_samples(self, patient_id: int, emr_case_id: int | None) -> list[LabSampleResponse]:
+    def list_samples_page(
+        self,
+        patient_id: int,
+        emr_case_id: int | None,
+        *,
+        filters: LabSampleListFilters | None = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> LabSampleListPage:
         self.calls.append((patient_id, emr_case_id))
-        return list(self._samples)
+        filtered = [
+            sample
+            for sample in self._samples
+            if filters is None
+            or not filters.lab_no
+            or filters.lab_no.lower() in sample.lab_no.lower()
+        ]
+        filtered.sort(key=lambda sample: (sample.taken_at is None, sample.taken_at), reverse=True)
+        return LabSampleListPage(
+            items=filtered[offset : offset + limit],
+            filtered_total=len(filtered),
+            total=len(self._samples),
+            positive=sum(1 for sample in self._samples if sample.growth_flag == 1),
+            negative=sum(1 for sample in self._samples if sample.growth_flag == 0),
+            pending=sum(1 for sample in self._samples if sample.growth_flag is None),
+        )
 
 
 def _reference_service_stub() -> Any:
@@ -5,6 +5,8 @@ from typing import Any, cast
 
 from PySide6.QtWidgets import QBoxLayout, QWidget
 
+from app.application.dto.lab_dto import LabSampleListPage
+from app.application.dto.sanitary_dto import SanitarySampleListPage
 from app.ui.lab.lab_samples_view import LabSamplesView
 from app.ui.sanitary.sanitary_dashboard import SanitaryDashboard
 from app.ui.sanitary.sanitary_history import SanitaryHistoryDialog
@@ -27,7 +29,11 @@ def test_lab_samples_view_uses_responsive_actions(monkeypatch, qapp) -> None:
         list_material_types=list,
         list_microorganisms=list,
     )
-    lab = SimpleNamespace(list_samples=lambda _pid, _case: [])
+    lab = SimpleNamespace(
+        list_samples_page=lambda _pid, _case, **_kwargs: LabSampleListPage(
+            items=[], filtered_total=0, total=0
+        )
+    )
     view = LabSamplesView(lab_service=cast(Any, lab), reference_service=cast(Any, ref))
     view.show()
     qapp.processEvents()
@@ -47,7 +53,10 @@ def test_sanitary_views_use_responsive_actions(qapp) -> None:
         list_microorganisms=list,
     )
     sanitary = SimpleNamespace(
-        list_samples_by_department=lambda _dep_id: [],
+        list_samples_page=lambda _dep_id, **_kwargs: SanitarySampleListPage(
+            items=[], filtered_total=0, total=0
+        ),
+        get_department_overview=lambda **_kwargs: [],
     )
 
     dashboard = SanitaryDashboard(sanitary_service=cast(Any, sanitary), reference_service=cast(Any, ref))
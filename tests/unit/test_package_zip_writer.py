@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import hashlib
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from app.infrastructure.export.package_zip import PackageZipWriter
+from app.infrastructure.security.sha256 import sha256_file
+
+
+def test_package_zip_writer_hashes_members_and_archive_in_one_pass(tmp_path: Path) -> None:
+    source = tmp_path / "snapshot.bin"
+    source.write_bytes(b"x" * 3_000_000)
+    archive = tmp_path / "package.zip"
+
+    with PackageZipWriter(archive) as writer:
+        with writer.open_member("data.jsonl") as stream:
+            stream.write(b'{"id": 1}\n')
+            stream.write(b'{"id": 2}\n')
+        writer.add_file(source)
+        writer.add_bytes("manifest.json", b"{}")
+
+    assert writer.sha256 == sha256_file(archive)
+    assert [member.name for member in writer.members] == ["data.jsonl", "snapshot.bin", "manifest.json"]
+    with zipfile.ZipFile(archive) as zf:
+        assert zf.namelist() == ["data.jsonl", "snapshot.bin", "manifest.json"]
+        for member in writer.members:
+            payload = zf.read(member.name)
+            assert member.sha256 == hashlib.sha256(payload).hexdigest()
+            assert member.size == len(payload)
+
+
+def test_package_zip_writer_removes_partial_archive_on_error(tmp_path: Path) -> None:
+    archive = tmp_path / "package.zip"
+
+    with pytest.raises(RuntimeError), PackageZipWriter(archive) as writer:
+        writer.add_bytes("export.xlsx", b"data")
+        raise RuntimeError("boom")
+
+    assert not archive.exists()
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from datetime import date
+
+from app.application.dto.patient_dto import PatientResponse
+from app.application.services.patient_name_index import PatientNameIndex, normalize_tokens
+
+
+def _patient(
+    patient_id: int,
+    full_name: str,
+    dob: date | None = None,
+    category: str | None = None,
+) -> PatientResponse:
+    return PatientResponse(id=patient_id, full_name=full_name, dob=dob, sex="M", category=category)
+
+
+def _loaded_index(*patients: PatientResponse) -> PatientNameIndex:
+    index = PatientNameIndex()
+    assert index.load(patients, generation=index.generation) is True
+    return index
+
+
+def test_normalize_tokens_casefolds_and_maps_yo() -> None:
+    assert normalize_tokens("Семёнов  Пётр-Иванович") == ["семенов", "петр", "иванович"]
+    assert normalize_tokens(None) == []
+
+
+def test_search_matches_word_prefixes_dob_and_category() -> None:
+    index = _loaded_index(
+        _patient(1, "Иванов Иван", date(1985, 3, 1), "рядовой"),
+        _patient(2, "Иванова Анна", date(1990, 7, 2), "офицер"),
+        _patient(3, "Петров Пётр", date(1985, 5, 5), "рядовой"),
+    )
+
+    assert [p.id for p in index.search("иван")] == [1, 2]
+    assert [p.id for p in index.search("Иванов 1985")] == [1]
+    assert [p.id for p in index.search("петр")] == [3]
+    assert [p.id for p in index.search("рядов")] == [1, 3]
+    assert [p.id for p in index.search("02.07.1990")] == [2]
+    assert index.search("ванов") == []
+    assert [p.id for p in index.search("иван", limit=1)] == [1]
+
+
+def test_upsert_and_remove_keep_index_in_sync() -> None:
+    index = _loaded_index(_patient(2, "Борис Андреев"), _patient(1, "Алексей Борисов"))
+    assert [p.id for p in index.list_all()] == [1, 2]
+
+    index.upsert(_patient(1, "Яков Борисов"))
+    index.upsert(_patient(3, "Виктор Громов"))
+    assert [p.id for p in index.list_all()] == [2, 3, 1]
+    assert index.search("алекс") == []
+    assert [p.id for p in index.search("яков")] == [1]
+
+    index.remove(2)
+    assert [p.id for p in index.list_all(limit=1)] == [3]
+    assert [p.id for p in index.search("борис")] == [1]
+
+
+def test_load_rejects_snapshot_older_than_concurrent_write() -> None:
+    index = PatientNameIndex()
+    generation = index.generation
+    index.upsert(_patient(5, "Новый Пациент"))
+
+    assert index.load([_patient(1, "Старый Снимок")], generation=generation) is False
+    assert index.is_loaded is False
+
+    index.invalidate()
+    assert index.load([_patient(1, "Старый Снимок")], generation=index.generation) is True
+    assert [p.id for p in index.list_all()] == [1]
@@ -1,14 +1,14 @@
 from __future__ import annotations
 
 # mypy: disable-error-code=var-annotated
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime
 from types import SimpleNamespace
 from typing import Any, cast
 
 from PySide6.QtCore import QDate, QDateTime, QTime
 from PySide6.QtWidgets import QBoxLayout, QLabel, QScrollArea
 
-from app.application.dto.sanitary_dto import SanitarySampleResponse
+from app.application.dto.sanitary_dto import SanitaryDepartmentOverview, SanitarySampleResponse
 from app.ui.sanitary.sanitary_dashboard import SanitaryDashboard
 from app.ui.sanitary.sanitary_history import SanitarySampleDetailDialog
 from app.ui.widgets.datetime_inputs import DEFAULT_EMPTY_DATETIME
@@ -23,6 +23,43 @@ class _SanitaryServiceStub:
         self.calls.append(department_id)
         return list(self._samples_by_department.get(department_id, []))
 
+    def get_department_overview(
+        self,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        growth: int | None = None,
+    ) -> list[SanitaryDepartmentOverview]:
+        result: list[SanitaryDepartmentOverview] = []
+        for department_id, samples in self._samples_by_department.items():
+            if date_from is not None or date_to is not None:
+                samples = [
+                    sample
+                    for sample in samples
+                    if sample.taken_at is not None
+                    and (date_from is None or sample.taken_at.date() >= date_from)
+                    and (date_to is None or sample.taken_at.date() <= date_to)
+                ]
+            if not samples:
+                continue
+            flags = [sample.growth_flag for sample in samples]
+            wanted = None if growth == -1 else growth
+            if growth is not None and wanted not in flags:
+                continue
+            taken = [sample for sample in samples if sample.taken_at is not None]
+            result.append(
+                SanitaryDepartmentOverview(
+                    department_id=department_id,
+                    total_count=len(samples),
+                    positive_count=flags.count(1),
+                    negative_count=flags.count(0),
+                    pending_count=flags.count(None),
+                    last_sample=max(taken, key=lambda sample: cast(datetime, sample.taken_at))
+                    if taken
+                    else None,
+                )
+            )
+        return result
+
 
 def _reference_service_stub(*, departments: list[SimpleNamespace] | None = None) -> Any:
     return SimpleNamespace(
@@ -1,25 +1,50 @@
 from __future__ import annotations
 
 # mypy: disable-error-code=var-annotated
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime
+from itertools import pairwise
 from types import SimpleNamespace
 from typing import Any, cast
 
 from PySide6.QtCore import QDate
 from PySide6.QtWidgets import QBoxLayout, QLabel
 
-from app.application.dto.sanitary_dto import SanitarySampleResponse
+from app.application.dto.sanitary_dto import (
+    SanitarySampleListCursor,
+    SanitarySampleListFilters,
+    SanitarySampleListPage,
+    SanitarySampleResponse,
+)
 from app.ui.sanitary.sanitary_history import SanitaryHistoryDialog
 
 
 class _SanitaryServiceStub:
-    def __init__(self, samples_by_department: dict[int, list[SanitarySampleResponse]]) -> None:
-        self._samples_by_department = samples_by_department
-        self.calls: list[int] = []
-
-    def list_samples_by_department(self, department_id: int) -> list[SanitarySampleResponse]:
-        self.calls.append(department_id)
-        return list(self._samples_by_department.get(department_id, []))
+    """Отдаёт заранее собранные страницы: без фильтров — ``pages``, с фильтрами — ``filtered_pages``."""
+
+    def __init__(
+        self,
+        pages: list[SanitarySampleListPage],
+        *,
+        filtered_pages: list[SanitarySampleListPage] | None = None,
+    ) -> None:
+        self._pages = pages
+        self._filtered_pages = filtered_pages if filtered_pages is not None else pages
+        self.calls: list[tuple[SanitarySampleListFilters, int, SanitarySampleListCursor | None]] = []
+
+    def list_samples_page(
+        self,
+        department_id: int,
+        *,
+        filters: SanitarySampleListFilters | None = None,
+        limit: int = 50,
+        after: SanitarySampleListCursor | None = None,
+    ) -> SanitarySampleListPage:
+        filters = filters or SanitarySampleListFilters()
+        self.calls.append((filters, limit, after))
+        pages = self._pages if filters == SanitarySampleListFilters() else self._filtered_pages
+        if after is None:
+            return pages[0]
+        return next(page for previous, page in pairwise(pages) if previous.next_cursor == after)
 
 
 def _reference_service_stub() -> Any:
@@ -62,21 +87,45 @@ def _make_sample(
     )
 
 
+def _page(
+    items: list[SanitarySampleResponse],
+    *,
+    total: int | None = None,
+    filtered_total: int | None = None,
+    positive: int = 0,
+    last_taken_at: datetime | None = None,
+    next_cursor: SanitarySampleListCursor | None = None,
+) -> SanitarySampleListPage:
+    filtered_total = len(items) if filtered_total is None else filtered_total
+    return SanitarySampleListPage(
+        items=items,
+        filtered_total=filtered_total,
+        total=filtered_total if total is None else total,
+        positive=positive,
+        last_taken_at=last_taken_at,
+        next_cursor=next_cursor,
+    )
+
+
 def test_sanitary_history_dialog_uses_responsive_filter_and_header_layouts(qapp) -> None:
     dialog = SanitaryHistoryDialog(
         sanitary_service=cast(
             Any,
             _SanitaryServiceStub(
-                {
-                    1: [
-                        _make_sample(
-                            1,
-                            lab_no="SAN-0001",
-                            growth_flag=1,
-                            taken_at=_dt(2026, 4, 20, 8, 30),
-                        )
-                    ]
-                }
+                [
+                    _page(
+                        [
+                            _make_sample(
+                                1,
+                                lab_no="SAN-0001",
+                                growth_flag=1,
+                                taken_at=_dt(2026, 4, 20, 8, 30),
+                            )
+                        ],
+                        positive=1,
+                        last_taken_at=_dt(2026, 4, 20, 8, 30),
+                    )
+                ]
             ),
         ),
         reference_service=cast(Any, _reference_service_stub()),
@@ -109,34 +158,38 @@ def test_sanitary_history_dialog_updates_summary_header_and_cards(qapp) -> None:
         sanitary_service=cast(
             Any,
             _SanitaryServiceStub(
-                {
-                    1: [
-                        _make_sample(
-                            1,
-                            lab_no="SAN-0001",
-                            growth_flag=1,
-                            taken_at=_dt(2026, 4, 20, 8, 30),
-                            sampling_point="Раковина",
-                            room="Палата 1",
-                            microorganism_id=7,
-                        ),
-                        _make_sample(
-                            2,
-                            lab_no="SAN-0002",
-                            growth_flag=0,
-                            taken_at=_dt(2026, 4, 21, 9, 45),
-                            medium="Агар",
-                        ),
-                        _make_sample(
-                            3,
-                            lab_no="SAN-0003",
-                            growth_flag=None,
-                            taken_at=_dt(2026, 4, 21, 11, 15),
-                            sampling_point="Стол",
-                            room="Процедурная",
-                        ),
-                    ]
-                }
+                [
+                    _page(
+                        [
+                            _make_sample(
+                                3,
+                                lab_no="SAN-0003",
+                                growth_flag=None,
+                                taken_at=_dt(2026, 4, 21, 11, 15),
+                                sampling_point="Стол",
+                                room="Процедурная",
+                            ),
+                            _make_sample(
+                                2,
+                                lab_no="SAN-0002",
+                                growth_flag=0,
+                                taken_at=_dt(2026, 4, 21, 9, 45),
+                                medium="Агар",
+                            ),
+                            _make_sample(
+                                1,
+                                lab_no="SAN-0001",
+                                growth_flag=1,
+                                taken_at=_dt(2026, 4, 20, 8, 30),
+                                sampling_point="Раковина",
+                                room="Палата 1",
+                                microorganism_id=7,
+                            ),
+                        ],
+                        positive=1,
+                        last_taken_at=_dt(2026, 4, 21, 11, 15),
+                    )
+                ]
             ),
         ),
         reference_service=cast(Any, _reference_service_stub()),
@@ -175,10 +228,19 @@ def test_sanitary_history_dialog_updates_filter_summary_and_resets_page(qapp) ->
             growth_flag=1 if index % 2 else 0,
             taken_at=_dt(2026, 4, 20 + (index % 3), 8, 30),
         )
-        for index in range(1, 56)
+        for index in range(55, 0, -1)
     ]
+    cursors = [SanitarySampleListCursor(taken_at=samples[end - 1].taken_at, id=samples[end - 1].id) for end in (20, 40)]
+    service = _SanitaryServiceStub(
+        [
+            _page(samples[0:20], filtered_total=55, next_cursor=cursors[0]),
+            _page(samples[20:40], filtered_total=55, next_cursor=cursors[1]),
+            _page(samples[40:], filtered_total=55),
+        ],
+        filtered_pages=[_page(samples[-1:], total=55)],
+    )
     dialog = SanitaryHistoryDialog(
-        sanitary_service=cast(Any, _SanitaryServiceStub({1: samples})),
+        sanitary_service=cast(Any, service),
         reference_service=cast(Any, _reference_service_stub()),
         department_id=1,
         department_name="ОРИТ",
@@ -196,6 +258,7 @@ def test_sanitary_history_dialog_updates_filter_summary_and_resets_page(qapp) ->
     qapp.processEvents()
     assert dialog.page_index == 2
     assert dialog.page_label.text() == "Стр. 2 / 3"
+    assert service.calls[-1][1:] == (20, cursors[0])
 
     dialog.search_input.setText("san-0001")
     dialog.growth_filter.setCurrentIndex(1)
@@ -204,6 +267,16 @@ def test_sanitary_history_dialog_updates_filter_summary_and_resets_page(qapp) ->
     qapp.processEvents()
 
     assert dialog.page_index == 1
+    assert service.calls[-1] == (
+        SanitarySampleListFilters(
+            lab_no="san-0001",
+            growth_flag=1,
+            taken_from=date(2026, 4, 20),
+            taken_to=date(2026, 4, 22),
+        ),
+        20,
+        None,
+    )
     assert "Номер: san-0001" in dialog.filter_summary_label.text()
     assert "Рост: Положительные" in dialog.filter_summary_label.text()
     assert "20.04.2026" in dialog.filter_summary_label.text()
@@ -222,7 +295,7 @@ def test_sanitary_history_dialog_updates_filter_summary_and_resets_page(qapp) ->
 
 def test_sanitary_history_dialog_distinguishes_no_data_and_filtered_empty_states(qapp) -> None:
     no_data_dialog = SanitaryHistoryDialog(
-        sanitary_service=cast(Any, _SanitaryServiceStub({1: []})),
+        sanitary_service=cast(Any, _SanitaryServiceStub([_page([])])),
         reference_service=cast(Any, _reference_service_stub()),
         department_id=1,
         department_name="ОРИТ",
@@ -240,16 +313,21 @@ def test_sanitary_history_dialog_distinguishes_no_data_and_filtered_empty_states
         sanitary_service=cast(
             Any,
             _SanitaryServiceStub(
-                {
-                    1: [
-                        _make_sample(
-                            1,
-                            lab_no="SAN-0001",
-                            growth_flag=1,
-                            taken_at=_dt(2026, 4, 20, 8, 30),
-                        )
-                    ]
-                }
+                [
+                    _page(
+                        [
+                            _make_sample(
+                                1,
+                                lab_no="SAN-0001",
+                                growth_flag=1,
+                                taken_at=_dt(2026, 4, 20, 8, 30),
+                            )
+                        ],
+                        positive=1,
+                        last_taken_at=_dt(2026, 4, 20, 8, 30),
+                    )
+                ],
+                filtered_pages=[_page([], total=1)],
             ),
         ),
         reference_service=cast(Any, _reference_service_stub()),
@@ -291,16 +369,20 @@ def test_sanitary_history_dialog_opens_detail_on_double_click(monkeypatch, qapp)
         sanitary_service=cast(
             Any,
             _SanitaryServiceStub(
-                {
-                    1: [
-                        _make_sample(
-                            1,
-                            lab_no="SAN-0001",
-                            growth_flag=1,
-                            taken_at=_dt(2026, 4, 20, 8, 30),
-                        )
-                    ]
-                }
+                [
+                    _page(
+                        [
+                            _make_sample(
+                                1,
+                                lab_no="SAN-0001",
+                                growth_flag=1,
+                                taken_at=_dt(2026, 4, 20, 8, 30),
+                            )
+                        ],
+                        positive=1,
+                        last_taken_at=_dt(2026, 4, 20, 8, 30),
+                    )
+                ]
             ),
         ),
         reference_service=cast(Any, _reference_service_stub()),
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+
+import pytest
+
+from app.infrastructure.security import sha256 as sha256_module
+from app.infrastructure.security.sha256 import (
+    copy_file_with_sha256,
+    sha256_file,
+    sha256_file_cached,
+)
+
+
+@pytest.mark.parametrize("mmap_min_size", [1, 1 << 40])
+def test_sha256_file_matches_hashlib_for_mmap_and_buffered_reads(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, mmap_min_size: int
+) -> None:
+    monkeypatch.setattr(sha256_module, "_MMAP_MIN_SIZE", mmap_min_size)
+    payload = os.urandom(3 * 1024 * 1024 + 17)
+    path = tmp_path / "artifact.bin"
+    path.write_bytes(payload)
+
+    assert sha256_file(path) == hashlib.sha256(payload).hexdigest()
+
+
+def test_sha256_file_cached_rereads_only_changed_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    reads: list[Path] = []
+    original = sha256_module.sha256_file
+
+    def counting_sha256_file(path: Path, chunk_size: int = 1024) -> str:
+        reads.append(path)
+        return original(path, chunk_size)
+
+    monkeypatch.setattr(sha256_module, "sha256_file", counting_sha256_file)
+    path = tmp_path / "report.pdf"
+    path.write_bytes(b"first")
+
+    first = sha256_file_cached(path)
+    again = sha256_file_cached(path)
+    path.write_bytes(b"second version")
+    changed = sha256_file_cached(path)
+
+    assert first == again == hashlib.sha256(b"first").hexdigest()
+    assert changed == hashlib.sha256(b"second version").hexdigest()
+    assert reads == [path, path]
+
+
+def test_copy_file_with_sha256_remembers_hash_of_copy(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    source = tmp_path / "source.xlsx"
+    source.write_bytes(b"workbook")
+    target = tmp_path / "artifact.xlsx"
+
+    digest = copy_file_with_sha256(source, target)
+    monkeypatch.setattr(sha256_module, "sha256_file", lambda *_args: pytest.fail("copy must not be re-read"))
+
+    assert target.read_bytes() == b"workbook"
+    assert target.stat().st_mtime_ns == source.stat().st_mtime_ns
+    assert sha256_file_cached(target) == digest == hashlib.sha256(b"workbook").hexdigest()
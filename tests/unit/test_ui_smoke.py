@@ -6,6 +6,7 @@ from typing import Any, cast
 
 from app.application.dto.analytics_dto import AnalyticsSearchRequest
 from app.application.dto.auth_dto import SessionContext
+from app.application.dto.sanitary_dto import SanitarySampleListPage
 from app.container import Container
 from app.ui.analytics.analytics_view_v2 import AnalyticsViewV2
 from app.ui.emz.emz_form import EmzForm
@@ -109,8 +110,8 @@ class _AnalyticsServiceStub:
 
 
 class _SanitaryServiceStub:
-    def list_samples_by_department(self, _department_id: int) -> list[SimpleNamespace]:
-        return []
+    def list_samples_page(self, _department_id: int, **_kwargs: Any) -> SanitarySampleListPage:
+        return SanitarySampleListPage(items=[], filtered_total=0, total=0)
 
 
 def _session_context() -> SessionContext: